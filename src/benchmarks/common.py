@@ -0,0 +1,44 @@
+import json
+import platform
+import time
+
+
+def time_per_call(fn, number=1000, repeat=5):
+    """
+    Times a callable and returns the best average time per call.
+
+    Args:
+        fn (callable): The function to time, called without arguments.
+        number (int): Number of calls per timing run.
+        repeat (int): Number of timing runs; the fastest one is reported.
+
+    Returns:
+        float: Seconds per call of the fastest run.
+    """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def write_json(results, path):
+    """
+    Writes benchmark results, together with basic machine information, as JSON.
+
+    Args:
+        results (list): List of result dictionaries.
+        path (str): Output file path.
+    """
+
+    payload = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
@@ -0,0 +1,55 @@
+import argparse
+from src.benchmarks.common import time_per_call, write_json
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+from src.envs.stock.controller import Controller
+
+
+def run(num_steps_options=(10, 100, 1000), render=True, number=2000):
+    """
+    Compares rebuilding the Controller on every reset (the previous env.reset path) with Controller.reset.
+
+    Args:
+        num_steps_options (tuple): Episode lengths to benchmark.
+        render (bool): Whether the controller owns a StockGraph, as with the env defaults.
+        number (int): Number of resets per timing run.
+
+    Returns:
+        list: One result dictionary per episode length.
+    """
+
+    results = []
+    for num_steps in num_steps_options:
+        params = UpAndToTheRightEnv.default_params.copy()
+        params.update(num_steps=num_steps, render=render)
+        controller = Controller(**params)
+
+        rebuild = time_per_call(lambda: Controller(**params), number=number)
+        reuse = time_per_call(controller.reset, number=number)
+        results.append({
+            'benchmark': 'reset',
+            'num_steps': num_steps,
+            'render': render,
+            'rebuild_us': rebuild * 1e6,
+            'reset_us': reuse * 1e6,
+            'speedup': rebuild / reuse,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Controller reset cost")
+    parser.add_argument('--no-render', action='store_true', help="Benchmark without a StockGraph")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(render=not args.no_render)
+    for result in results:
+        print(f"num_steps={result['num_steps']:>5}  rebuild={result['rebuild_us']:8.2f}us  "
+              f"reset={result['reset_us']:8.2f}us  speedup={result['speedup']:.1f}x")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import itertools
+from src.benchmarks.common import time_per_call, write_json
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+from src.envs.stock.controller import Controller
+from src.envs.stock.trader import Trader
+
+REWARD_TYPES = ('FinalOnly', 'UnrealizedPnLDelta', 'LogReturn', 'Sharpe', 'DrawdownPenalized')
+
+
+def run(reward_types=REWARD_TYPES, num_steps=1000, number=20000):
+    """
+    Measures the cost of Controller.step for every reward type while units are being opened and closed,
+    and the cost of the reward computation alone.
+
+    Args:
+        reward_types (tuple): Reward types to benchmark.
+        num_steps (int): Episode length; the controller is reset whenever an episode ends.
+        number (int): Number of steps per timing run.
+
+    Returns:
+        list: One result dictionary per reward type.
+    """
+
+    # Build up a stack of long units, close them all, then do the same on the short side
+    actions = [Trader.BUY] * 20 + [Trader.SELL_ALL] + [Trader.SELL] * 20 + [Trader.BUY_ALL]
+
+    results = []
+    for reward_type in reward_types:
+        params = UpAndToTheRightEnv.default_params.copy()
+        params.update(reward_type=reward_type, num_steps=num_steps, render=False, precompute_prices=True)
+        controller = Controller(**params)
+        action_cycle = itertools.cycle(actions)
+
+        def step():
+            _, _, done, truncated, _ = controller.step(next(action_cycle))
+            if done or truncated:
+                controller.reset()
+
+        step_time = time_per_call(step, number=number)
+        reward_time = time_per_call(controller.get_reward, number=number)
+        results.append({
+            'benchmark': 'reward',
+            'reward_type': reward_type,
+            'num_steps': num_steps,
+            'step_us': step_time * 1e6,
+            'reward_us': reward_time * 1e6,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-step cost of each reward type")
+    parser.add_argument('--num-steps', type=int, default=1000, help="Episode length")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(num_steps=args.num_steps)
+    for result in results:
+        print(f"{result['reward_type']:>20}  step={result['step_us']:7.2f}us  reward={result['reward_us']:6.2f}us")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from src.benchmarks.common import write_json
+
+# Runs in a fresh interpreter so that nothing is already imported or cached in sys.modules
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src.envs.gym_up_and_to_the_right
+imported = time.perf_counter()
+import gymnasium as gym
+env = gym.make('UpAndToTheRight', render={render})
+env.reset(seed=0)
+made = time.perf_counter()
+print(json.dumps({{
+    'import_s': imported - start,
+    'first_make_s': made - imported,
+    'pygame_imported': 'pygame' in sys.modules,
+    'sklearn_imported': 'sklearn' in sys.modules,
+}}))
+"""
+
+
+def run(repeat=5, render=False):
+    """
+    Measures `import src.envs.gym_up_and_to_the_right` and the first `gym.make` in fresh processes.
+
+    Args:
+        repeat (int): Number of fresh interpreters to start; the median is reported.
+        render (bool): Value of the env's render flag, True being the env default.
+
+    Returns:
+        dict: Median import and first make times, and which optional dependencies were imported.
+    """
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT.format(render=render)], cwd=repo_root,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        'benchmark': 'startup',
+        'render': render,
+        'import_ms': statistics.median(sample['import_s'] for sample in samples) * 1e3,
+        'first_make_ms': statistics.median(sample['first_make_s'] for sample in samples) * 1e3,
+        'pygame_imported': samples[-1]['pygame_imported'],
+        'sklearn_imported': samples[-1]['sklearn_imported'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless import and first gym.make time")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of fresh interpreters to start")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = [run(args.repeat, render=False), run(args.repeat, render=True)]
+    for result in results:
+        print(f"render={result['render']!s:>5}  import={result['import_ms']:7.1f}ms  "
+              f"first make={result['first_make_ms']:7.1f}ms  pygame imported={result['pygame_imported']}  "
+              f"sklearn imported={result['sklearn_imported']}")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
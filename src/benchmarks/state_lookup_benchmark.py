@@ -0,0 +1,67 @@
+import argparse
+import itertools
+import numpy as np
+from src.benchmarks.common import time_per_call, write_json
+from src.envs.stock.permutation_table import MAX_TABLE_WINDOW
+from src.envs.stock.rank_window import RankWindow
+
+SCALINGS = (('ranks', False, False), ('scaled', True, False), ('offset_scaled', True, True))
+
+
+def run(windows=tuple(range(2, MAX_TABLE_WINDOW + 1)), number=20000):
+    """
+    Measures RankWindow.push followed by RankWindow.get_state into a buffer, with the general path and with
+    the permutation table, to find where the table pays off.
+
+    Args:
+        windows (tuple): Window sizes to benchmark, at most MAX_TABLE_WINDOW.
+        number (int): Number of calls per timing run.
+
+    Returns:
+        list: One result dictionary per window size and scaling.
+    """
+
+    prices = np.random.default_rng(0).normal(100, 5, size=1000).tolist()
+
+    results = []
+    for window, (scaling, scale, offset_scaling) in itertools.product(windows, SCALINGS):
+        times = {}
+        for lookup in (False, True):
+            rank_window = RankWindow(window, scale=scale, offset_scaling=offset_scaling, lookup=lookup)
+            out = np.empty(window, dtype=rank_window.dtype)
+            price_cycle = itertools.cycle(prices)
+
+            def call():
+                rank_window.push(next(price_cycle))
+                rank_window.get_state(out)
+
+            times[lookup] = time_per_call(call, number=number)
+
+        results.append({
+            'benchmark': 'state_lookup',
+            'window': window,
+            'scaling': scaling,
+            'general_us': times[False] * 1e6,
+            'lookup_us': times[True] * 1e6,
+            'speedup': times[False] / times[True],
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the permutation table against the general rank state")
+    parser.add_argument('--number', type=int, default=20000, help="Calls per timing run")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(number=args.number)
+    for result in results:
+        print(f"window={result['window']}  {result['scaling']:>13}  general={result['general_us']:5.2f}us  "
+              f"lookup={result['lookup_us']:5.2f}us  speedup={result['speedup']:4.2f}x")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
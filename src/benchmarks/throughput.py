@@ -0,0 +1,201 @@
+import argparse
+import itertools
+import time
+import gymnasium as gym
+import numpy as np
+from src.benchmarks.common import time_per_call, write_json
+from src.envs import gym_up_and_to_the_right
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+from src.envs.stock.controller import Controller
+from src.envs.stock.trader import Trader
+
+# Valid action cycles: open a few units, hold, then close them, on both sides
+SINGLE_UNIT_ACTIONS = [Trader.BUY, Trader.HOLD, Trader.SELL, Trader.SELL, Trader.HOLD, Trader.BUY]
+MULTIPLE_UNIT_ACTIONS = [Trader.BUY, Trader.BUY, Trader.HOLD, Trader.SELL_ALL,
+                         Trader.SELL, Trader.SELL, Trader.HOLD, Trader.BUY_ALL]
+
+
+def _result(benchmark, seconds_per_call, **params):
+    """
+    Builds a result dictionary from the time per call.
+    """
+
+    return {'benchmark': benchmark, **params, 'us_per_call': seconds_per_call * 1e6,
+            'calls_per_sec': 1 / seconds_per_call}
+
+
+def _controller(**overrides):
+    """
+    Creates a headless Controller from the env default parameters.
+    """
+
+    params = UpAndToTheRightEnv.default_params.copy()
+    params.update(render=False, **overrides)
+    return Controller(**params)
+
+
+def bench_trader_action(multiple_units, number):
+    """
+    Times Trader.step followed by Trader.action.
+    """
+
+    trader = Trader(multiple_units)
+    actions = itertools.cycle(MULTIPLE_UNIT_ACTIONS if multiple_units else SINGLE_UNIT_ACTIONS)
+    prices = itertools.cycle(np.random.default_rng(0).uniform(90, 110, 1000).tolist())
+
+    def call():
+        trader.step(next(prices))
+        trader.action(next(actions))
+        if trader.current_step >= 100000:
+            trader.reset()
+
+    return _result('trader_action', time_per_call(call, number=number), multiple_units=multiple_units)
+
+
+def bench_controller_step(num_prev_obvs, num_steps, multiple_units, number):
+    """
+    Times Controller.step, resetting whenever an episode ends.
+    """
+
+    controller = _controller(num_prev_obvs=num_prev_obvs, num_steps=num_steps, multiple_units=multiple_units)
+    actions = itertools.cycle(MULTIPLE_UNIT_ACTIONS if multiple_units else SINGLE_UNIT_ACTIONS)
+
+    def call():
+        _, _, done, truncated, _ = controller.step(next(actions))
+        if done or truncated:
+            controller.reset()
+
+    return _result('controller_step', time_per_call(call, number=number), num_prev_obvs=num_prev_obvs,
+                   num_steps=num_steps, multiple_units=multiple_units)
+
+
+def bench_controller_step_n(k, num_steps, number):
+    """
+    Times Controller.step_n with a frame skip of k, per underlying step.
+    """
+
+    controller = _controller(num_steps=num_steps)
+    actions = itertools.cycle(MULTIPLE_UNIT_ACTIONS)
+
+    def call():
+        _, _, done, truncated, _ = controller.step_n(next(actions), k)
+        if done or truncated:
+            controller.reset()
+
+    return _result('controller_step_n', time_per_call(call, number=max(number // k, 1)) / k, k=k,
+                   num_steps=num_steps)
+
+
+def bench_controller_get_state(num_prev_obvs, scale, offset_scaling, number):
+    """
+    Times Controller.get_state on a full window.
+    """
+
+    controller = _controller(num_prev_obvs=num_prev_obvs, scale=scale, offset_scaling=offset_scaling)
+    for _ in range(num_prev_obvs):
+        controller.get_next_price()
+
+    return _result('controller_get_state', time_per_call(controller.get_state, number=number),
+                   num_prev_obvs=num_prev_obvs, scale=scale, offset_scaling=offset_scaling)
+
+
+def bench_env_reset(num_steps, number):
+    """
+    Times UpAndToTheRightEnv.reset.
+    """
+
+    env = UpAndToTheRightEnv(render=False, num_steps=num_steps)
+    result = _result('env_reset', time_per_call(env.reset, number=number), num_steps=num_steps)
+    env.close()
+    return result
+
+
+def bench_random_episodes(num_prev_obvs, num_steps, multiple_units, total_steps, repeat=3):
+    """
+    Runs a random agent through gym.make('UpAndToTheRight'), like src/agents/test.py, and times every step
+    including resets.
+    """
+
+    env = gym.make('UpAndToTheRight', render=False, num_prev_obvs=num_prev_obvs, num_steps=num_steps,
+                   multiple_units=multiple_units)
+    env.action_space.seed(0)
+    env.reset(seed=0)
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(total_steps):
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+            if terminated or truncated:
+                env.reset()
+        best = min(best, (time.perf_counter() - start) / total_steps)
+    env.close()
+
+    return _result('random_episodes', best, num_prev_obvs=num_prev_obvs, num_steps=num_steps,
+                   multiple_units=multiple_units)
+
+
+def run(num_prev_obvs_options=(5, 20, 100), num_steps_options=(100, 1000), multiple_units_options=(False, True),
+        frame_skip_options=(1, 4, 16), number=5000):
+    """
+    Runs every throughput benchmark across the given settings.
+
+    Args:
+        num_prev_obvs_options (tuple): Observation window sizes.
+        num_steps_options (tuple): Episode lengths.
+        multiple_units_options (tuple): multiple_units settings.
+        frame_skip_options (tuple): Values of k for Controller.step_n.
+        number (int): Number of calls per timing run.
+
+    Returns:
+        list: One result dictionary per benchmark and setting.
+    """
+
+    results = []
+    for multiple_units in multiple_units_options:
+        results.append(bench_trader_action(multiple_units, number))
+
+    for num_prev_obvs, num_steps, multiple_units in itertools.product(num_prev_obvs_options, num_steps_options,
+                                                                      multiple_units_options):
+        results.append(bench_controller_step(num_prev_obvs, num_steps, multiple_units, number))
+
+    for k, num_steps in itertools.product(frame_skip_options, num_steps_options):
+        results.append(bench_controller_step_n(k, num_steps, number))
+
+    for num_prev_obvs in num_prev_obvs_options:
+        for scale, offset_scaling in ((False, False), (True, False), (True, True)):
+            results.append(bench_controller_get_state(num_prev_obvs, scale, offset_scaling, number))
+
+    for num_steps in num_steps_options:
+        results.append(bench_env_reset(num_steps, number))
+
+    for num_prev_obvs, num_steps, multiple_units in itertools.product(num_prev_obvs_options, num_steps_options,
+                                                                      multiple_units_options):
+        results.append(bench_random_episodes(num_prev_obvs, num_steps, multiple_units, total_steps=number))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput of the environment stack")
+    parser.add_argument('--quick', action='store_true', help="Fewer settings and calls, for a smoke run")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    if args.quick:
+        results = run(num_prev_obvs_options=(5,), num_steps_options=(100,), frame_skip_options=(1, 4), number=500)
+    else:
+        results = run()
+
+    for result in results:
+        params = '  '.join(f"{key}={value}" for key, value in result.items()
+                           if key not in ('benchmark', 'us_per_call', 'calls_per_sec'))
+        print(f"{result['benchmark']:>22}  {result['us_per_call']:9.2f}us  {result['calls_per_sec']:12,.0f}/s  "
+              f"{params}")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import itertools
+import gymnasium as gym
+from src.benchmarks.common import time_per_call, write_json
+from src.benchmarks.throughput import MULTIPLE_UNIT_ACTIONS
+from src.envs import gym_up_and_to_the_right
+from src.envs.fast import make_fast
+
+CONSTRUCTORS = ('gym_make', 'make_fast', 'controller')
+
+
+def _make_env(constructor, **params):
+    """
+    Creates the environment through one of CONSTRUCTORS.
+    """
+
+    if constructor == 'gym_make':
+        return gym.make('UpAndToTheRight', **params)
+    env = make_fast('UpAndToTheRight', **params)
+    return env if constructor == 'make_fast' else env.controller
+
+
+def run(state_types=('PaddedBasic', 'Basic'), num_steps=1000, number=20000):
+    """
+    Measures the per-step cost of the environment created by gym.make, which adds the PassiveEnvChecker and
+    OrderEnforcing wrappers, against make_fast and against stepping the Controller directly. The same state
+    type is used for every constructor, so the differences are the wrapper layers.
+
+    Args:
+        state_types (tuple): State types to benchmark.
+        num_steps (int): Episode length; the environment is reset whenever an episode ends.
+        number (int): Number of steps per timing run.
+
+    Returns:
+        list: One result dictionary per state type and constructor, with the per-step overhead over make_fast.
+    """
+
+    results = []
+    for state_type in state_types:
+        times = {}
+        for constructor in CONSTRUCTORS:
+            env = _make_env(constructor, render=False, state_type=state_type, num_steps=num_steps)
+            env.reset()
+            actions = itertools.cycle(MULTIPLE_UNIT_ACTIONS)
+
+            def step():
+                _, _, terminated, truncated, _ = env.step(next(actions))
+                if terminated or truncated:
+                    env.reset()
+
+            times[constructor] = time_per_call(step, number=number)
+            env.close()
+
+        for constructor in CONSTRUCTORS:
+            results.append({
+                'benchmark': 'wrapper_overhead',
+                'state_type': state_type,
+                'constructor': constructor,
+                'step_us': times[constructor] * 1e6,
+                'overhead_us': (times[constructor] - times['make_fast']) * 1e6,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-step overhead of gym.make's wrappers")
+    parser.add_argument('--num-steps', type=int, default=1000, help="Episode length")
+    parser.add_argument('--json', help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(num_steps=args.num_steps)
+    for result in results:
+        print(f"{result['state_type']:>12}  {result['constructor']:>10}  step={result['step_us']:6.2f}us  "
+              f"overhead={result['overhead_us']:+6.2f}us")
+
+    if args.json:
+        write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
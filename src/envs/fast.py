@@ -0,0 +1,37 @@
+import dataclasses
+import gymnasium as gym
+from src.envs import gym_up_and_to_the_right
+
+# Parameters whose defaults differ from the registered environments: a headless env whose observations always
+# have the shape of its observation space
+FAST_DEFAULTS = {
+    'render': False,
+    'state_type': 'PaddedBasic',
+}
+
+
+def make_fast(env_id='UpAndToTheRight', **overrides):
+    """
+    Creates a registered environment without gymnasium's wrappers, for training loops where the per-step
+    overhead matters.
+
+    gym.make wraps every environment in PassiveEnvChecker, which validates the first reset and step, and
+    OrderEnforcing, which checks that reset is called before step; both add a layer of Python calls to every
+    step. make_fast returns the bare environment instead, with env.spec set as usual. It also defaults to no
+    rendering and to the fixed-shape 'PaddedBasic' state, so observations match the observation space without
+    the checker: the 'Basic' state is shorter than num_prev_obvs at the start of an episode. Both can be
+    overridden.
+
+    The environment must be reset before it is stepped, since nothing enforces it.
+
+    Args:
+        env_id (str): ID of a registered environment, such as 'UpAndToTheRight' or 'MeanReversion'. Their
+            packages must be imported first, except for 'UpAndToTheRight'.
+        **overrides: Environment parameters, passed on to the environment like with gym.make.
+
+    Returns:
+        gym.Env: The unwrapped environment.
+    """
+
+    spec = dataclasses.replace(gym.spec(env_id), order_enforce=False, disable_env_checker=True)
+    return gym.make(spec, **{**FAST_DEFAULTS, **overrides})
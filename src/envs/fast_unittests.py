@@ -0,0 +1,55 @@
+import unittest
+import warnings
+import numpy as np
+import gymnasium as gym
+from src.envs import gym_mean_reversion
+from src.envs.fast import make_fast
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class TestMakeFast(unittest.TestCase):
+
+    def _assert_conformant_episode(self, env):
+        obs, _ = env.reset(seed=0)
+        self.assertTrue(env.observation_space.contains(obs))
+        terminated = truncated = False
+        while not (terminated or truncated):
+            obs, _, terminated, truncated, _ = env.step(2)
+            self.assertTrue(env.observation_space.contains(obs))
+        self.assertTrue(terminated)
+
+    def test_returns_bare_env(self):
+        env = make_fast(num_steps=20)
+        self.assertIsInstance(env, UpAndToTheRightEnv)
+        self.assertEqual(env.spec.id, 'UpAndToTheRight')
+        self.assertFalse(env.controller.render_graph)
+        self._assert_conformant_episode(env)
+
+    def test_overrides(self):
+        env = make_fast('MeanReversion', state_type='Features', num_steps=20, volatility=1.0)
+        self.assertIsInstance(env, UpAndToTheRightEnv)
+        self.assertEqual(env.controller.state_type, 'Features')
+        self._assert_conformant_episode(env)
+
+    def test_registered_fast_variant(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            env = gym.make('UpAndToTheRightFast', num_steps=20, scale=True)
+            self.assertIsInstance(env, UpAndToTheRightEnv)
+            self._assert_conformant_episode(env)
+
+    def test_matches_gym_make(self):
+        fast = make_fast(num_steps=20)
+        wrapped = gym.make('UpAndToTheRight', render=False, state_type='PaddedBasic', num_steps=20)
+        for env in (fast, wrapped):
+            env.reset(seed=3)
+        for action in [0, 2, 4, 1, 2, 3] * 3:
+            fast_obs, fast_reward, *_ = fast.step(action)
+            obs, reward, *_ = wrapped.step(action)
+            np.testing.assert_array_equal(fast_obs['ranks'], obs['ranks'])
+            np.testing.assert_array_equal(fast_obs['mask'], obs['mask'])
+            self.assertEqual(fast_reward, reward)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import glob
+import os
+import gymnasium as gym
+import numpy as np
+
+
+class FrameRecorder:
+    """
+    The FrameRecorder class streams rendered frames to disk in fixed-size, compressed .npz chunks, so that
+    only one chunk of frames is ever held in memory regardless of episode length.
+
+    Episode e is written as `<prefix>_<e>_<chunk>.npz` files in `directory`, each holding a `frames` array of
+    shape (num_frames, height, width, 3). Use `load_episode` to read an episode back.
+    """
+
+    def __init__(self, directory, chunk_size=64, prefix='episode'):
+        """
+        Initializes the FrameRecorder object.
+
+        Args:
+            directory (str): Directory the chunks are written to. Created if missing.
+            chunk_size (int): Number of frames per chunk file.
+            prefix (str): File name prefix of the chunks.
+        """
+
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+
+        self.episode = None
+        self._buffer = None
+        self._num_buffered = 0
+        self._num_chunks = 0
+
+    def start_episode(self, episode):
+        """
+        Starts recording a new episode, flushing any frames of the previous one.
+
+        Args:
+            episode (int): Episode number used in the chunk file names.
+        """
+
+        self.end_episode()
+        self.episode = episode
+        self._num_chunks = 0
+
+    def add_frame(self, frame):
+        """
+        Adds a frame to the current episode, writing a chunk to disk whenever the buffer is full.
+
+        Args:
+            frame (np.ndarray): uint8 RGB frame of shape (height, width, 3).
+        """
+
+        if self.episode is None:
+            raise ValueError("start_episode must be called before adding frames")
+
+        if self._buffer is None or self._buffer.shape[1:] != frame.shape:
+            self._flush()
+            self._buffer = np.empty((self.chunk_size,) + frame.shape, dtype=np.uint8)
+
+        self._buffer[self._num_buffered] = frame
+        self._num_buffered += 1
+        if self._num_buffered == self.chunk_size:
+            self._flush()
+
+    def end_episode(self):
+        """
+        Writes the remaining frames of the current episode.
+        """
+
+        if self.episode is not None:
+            self._flush()
+        self.episode = None
+
+    def _flush(self):
+        """
+        Writes the buffered frames as one compressed chunk.
+        """
+
+        if not self._num_buffered:
+            return
+
+        path = os.path.join(self.directory, f"{self.prefix}_{self.episode:06d}_{self._num_chunks:06d}.npz")
+        np.savez_compressed(path, frames=self._buffer[:self._num_buffered])
+        self._num_buffered = 0
+        self._num_chunks += 1
+
+    @staticmethod
+    def load_episode(directory, episode, prefix='episode'):
+        """
+        Yields the frame chunks of a recorded episode in order.
+
+        Args:
+            directory (str): Directory the chunks were written to.
+            episode (int): Episode number.
+            prefix (str): File name prefix of the chunks.
+
+        Yields:
+            np.ndarray: Frames of one chunk, of shape (num_frames, height, width, 3).
+        """
+
+        for path in sorted(glob.glob(os.path.join(directory, f"{prefix}_{episode:06d}_*.npz"))):
+            with np.load(path) as chunk:
+                yield chunk['frames']
+
+
+class RecordEpisodeFrames(gym.Wrapper):
+    """
+    Records every Nth episode of an environment with the 'rgb_array' render mode through a FrameRecorder.
+    Episodes that are not recorded are not rendered at all.
+    """
+
+    def __init__(self, env, directory, every_n_episodes=1, chunk_size=64):
+        """
+        Initializes the wrapper.
+
+        Args:
+            env (gym.Env): Environment created with render_mode='rgb_array'.
+            directory (str): Directory the chunks are written to.
+            every_n_episodes (int): Record episodes 0, N, 2N, ...
+            chunk_size (int): Number of frames per chunk file.
+        """
+
+        super().__init__(env)
+        if env.render_mode != 'rgb_array':
+            raise ValueError("RecordEpisodeFrames requires render_mode='rgb_array'")
+
+        self.recorder = FrameRecorder(directory, chunk_size=chunk_size)
+        self.every_n_episodes = every_n_episodes
+        self.episode = -1
+        self.recording = False
+
+    def reset(self, **kwargs):
+        obs, info = self.env.reset(**kwargs)
+
+        self.episode += 1
+        self.recording = self.episode % self.every_n_episodes == 0
+        if self.recording:
+            self.recorder.start_episode(self.episode)
+            self.recorder.add_frame(self.env.render())
+        else:
+            self.recorder.end_episode()
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+
+        if self.recording:
+            self.recorder.add_frame(self.env.render())
+            if terminated or truncated:
+                self.recorder.end_episode()
+                self.recording = False
+        return obs, reward, terminated, truncated, info
+
+    def close(self):
+        self.recorder.end_episode()
+        super().close()
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+import numpy as np
+from src.envs.frame_recorder import FrameRecorder, RecordEpisodeFrames
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class TestFrameRecorder(unittest.TestCase):
+
+    def test_chunks_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = FrameRecorder(directory, chunk_size=4)
+            frames = np.random.default_rng(0).integers(0, 255, size=(10, 6, 8, 3), dtype=np.uint8)
+
+            recorder.start_episode(0)
+            for frame in frames:
+                recorder.add_frame(frame)
+            recorder.end_episode()
+
+            chunks = list(FrameRecorder.load_episode(directory, 0))
+            self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+            np.testing.assert_array_equal(np.concatenate(chunks), frames)
+
+    def test_add_frame_requires_episode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                FrameRecorder(directory).add_frame(np.zeros((2, 2, 3), dtype=np.uint8))
+
+
+class TestRecordEpisodeFrames(unittest.TestCase):
+
+    def test_rgb_array_render(self):
+        env = UpAndToTheRightEnv(render_mode='rgb_array', num_steps=5, graph_width=160, graph_height=120)
+        env.reset(seed=0)
+        env.step(0)
+        env.step(2)
+        frame = env.render()
+
+        self.assertEqual(frame.shape, (120, 160, 3))
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertGreater(frame.max(), 0)
+        env.close()
+
+    def test_records_every_nth_episode(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = UpAndToTheRightEnv(render_mode='rgb_array', num_steps=5, graph_width=160, graph_height=120)
+            env = RecordEpisodeFrames(env, directory, every_n_episodes=2, chunk_size=4)
+
+            for _ in range(3):
+                env.reset()
+                done = False
+                while not done:
+                    _, _, terminated, truncated, _ = env.step(2)
+                    done = terminated or truncated
+            env.close()
+
+            # Reset frame plus one frame per step
+            self.assertEqual(sum(len(chunk) for chunk in FrameRecorder.load_episode(directory, 0)), 6)
+            self.assertEqual(list(FrameRecorder.load_episode(directory, 1)), [])
+            self.assertEqual(sum(len(chunk) for chunk in FrameRecorder.load_episode(directory, 2)), 6)
+
+            # Each episode starts from a blank graph, not from the previous episode's drawing
+            first = np.concatenate(list(FrameRecorder.load_episode(directory, 0)))
+            third = np.concatenate(list(FrameRecorder.load_episode(directory, 2)))
+            self.assertFalse(np.array_equal(third[0], first[-1]))
+            self.assertFalse(np.array_equal(third[1], first[-1]))
+            np.testing.assert_array_equal(third[0], third[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
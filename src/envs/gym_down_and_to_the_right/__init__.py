@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='DownAndToTheRight',
+    entry_point='src.envs.gym_down_and_to_the_right.down_and_to_the_right_env:DownAndToTheRightEnv',
+    vector_entry_point='src.envs.gym_down_and_to_the_right.down_and_to_the_right_vector_env:DownAndToTheRightVectorEnv',
+)
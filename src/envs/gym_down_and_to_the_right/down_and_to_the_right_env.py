@@ -0,0 +1,16 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class DownAndToTheRightEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices trend down linearly with uniform noise.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "Linear",
+        'slope': -1.0,
+        'starting_price': 200,
+    }
@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_down_and_to_the_right.down_and_to_the_right_env import DownAndToTheRightEnv
+
+
+class DownAndToTheRightVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of DownAndToTheRightEnv.
+    """
+
+    default_params = DownAndToTheRightEnv.default_params
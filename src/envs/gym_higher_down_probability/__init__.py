@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='HigherDownProbability',
+    entry_point='src.envs.gym_higher_down_probability.higher_down_probability_env:HigherDownProbabilityEnv',
+    vector_entry_point='src.envs.gym_higher_down_probability.higher_down_probability_vector_env:HigherDownProbabilityVectorEnv',
+)
@@ -0,0 +1,16 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class HigherDownProbabilityEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices move up or down by a fixed step, with down steps more likely.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "BiasedRandomWalk",
+        'up_probability': 0.4,
+        'step_size': 0.5,
+    }
@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_higher_down_probability.higher_down_probability_env import HigherDownProbabilityEnv
+
+
+class HigherDownProbabilityVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of HigherDownProbabilityEnv.
+    """
+
+    default_params = HigherDownProbabilityEnv.default_params
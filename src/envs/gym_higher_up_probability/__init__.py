@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='HigherUpProbability',
+    entry_point='src.envs.gym_higher_up_probability.higher_up_probability_env:HigherUpProbabilityEnv',
+    vector_entry_point='src.envs.gym_higher_up_probability.higher_up_probability_vector_env:HigherUpProbabilityVectorEnv',
+)
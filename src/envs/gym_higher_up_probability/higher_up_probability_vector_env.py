@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_higher_up_probability.higher_up_probability_env import HigherUpProbabilityEnv
+
+
+class HigherUpProbabilityVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of HigherUpProbabilityEnv.
+    """
+
+    default_params = HigherUpProbabilityEnv.default_params
@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='MeanReversion',
+    entry_point='src.envs.gym_mean_reversion.mean_reversion_env:MeanReversionEnv',
+    vector_entry_point='src.envs.gym_mean_reversion.mean_reversion_vector_env:MeanReversionVectorEnv',
+)
@@ -0,0 +1,17 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class MeanReversionEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices follow an Ornstein-Uhlenbeck process around a fixed mean.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "MeanReversion",
+        'mean': 100,
+        'reversion_rate': 0.1,
+        'volatility': 2.0,
+    }
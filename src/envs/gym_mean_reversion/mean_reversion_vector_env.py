@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_mean_reversion.mean_reversion_env import MeanReversionEnv
+
+
+class MeanReversionVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of MeanReversionEnv.
+    """
+
+    default_params = MeanReversionEnv.default_params
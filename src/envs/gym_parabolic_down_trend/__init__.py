@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='ParabolicDownTrend',
+    entry_point='src.envs.gym_parabolic_down_trend.parabolic_down_trend_env:ParabolicDownTrendEnv',
+    vector_entry_point='src.envs.gym_parabolic_down_trend.parabolic_down_trend_vector_env:ParabolicDownTrendVectorEnv',
+)
@@ -0,0 +1,16 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class ParabolicDownTrendEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices follow an accelerating, parabolic down trend.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "Quadratic",
+        'slope': 0.0,
+        'curvature': -0.005,
+    }
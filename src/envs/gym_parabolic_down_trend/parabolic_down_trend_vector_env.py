@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_parabolic_down_trend.parabolic_down_trend_env import ParabolicDownTrendEnv
+
+
+class ParabolicDownTrendVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of ParabolicDownTrendEnv.
+    """
+
+    default_params = ParabolicDownTrendEnv.default_params
@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='ParabolicUpTrend',
+    entry_point='src.envs.gym_parabolic_up_trend.parabolic_up_trend_env:ParabolicUpTrendEnv',
+    vector_entry_point='src.envs.gym_parabolic_up_trend.parabolic_up_trend_vector_env:ParabolicUpTrendVectorEnv',
+)
@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_parabolic_up_trend.parabolic_up_trend_env import ParabolicUpTrendEnv
+
+
+class ParabolicUpTrendVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of ParabolicUpTrendEnv.
+    """
+
+    default_params = ParabolicUpTrendEnv.default_params
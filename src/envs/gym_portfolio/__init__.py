@@ -0,0 +1,6 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='Portfolio',
+    entry_point='src.envs.gym_portfolio.portfolio_env:PortfolioEnv',
+)
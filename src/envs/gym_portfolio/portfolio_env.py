@@ -0,0 +1,155 @@
+# Uses OpenAI Gymnasium
+
+import gymnasium as gym
+import numpy as np
+from src.envs.stock.price_movement.registry import make_price_generator
+from src.envs.stock.vector_state import VectorRankWindow
+from src.envs.stock.vector_trader import VectorTrader
+from typing import Optional
+
+
+class PortfolioEnv(gym.Env):
+    """
+    Trading environment over a portfolio of num_assets instruments that are traded at the same time. Each step
+    takes one action per instrument (a MultiDiscrete action space), and every instrument follows the rules of a
+    single Trader.
+
+    Prices are drawn for a whole episode at once as a (num_assets, num_steps + 1) array, and positions and PnL are
+    held by a VectorTrader with one lane per instrument, so validity checks and PnL updates are array operations
+    whose cost grows with the array width rather than with one Trader object per instrument.
+
+    Observations are the 'Basic' rank state of every instrument, an array of shape (num_assets, num_prev_obvs)
+    padded with zeros after the available ranks. An invalid action on any instrument truncates the episode with
+    a reward of -100, as in UpAndToTheRightEnv.
+    """
+
+    metadata = {'render_modes': []}
+
+    default_params = {
+        'num_assets': 4,
+        'state_type': "Basic",
+        'reward_type': "FinalOnly",
+        'price_movement_type': "Linear",
+        'num_prev_obvs': 5,
+        'offset_scaling': 1.0,
+        'scale': False,
+        'slope': 1.0,
+        'noise': 0.1,
+        'starting_price': 100,
+        'asset_starting_prices': None,
+        'num_steps': 100,
+        'multiple_units': True,
+    }
+
+    def __init__(self, render_mode: Optional[str] = None, **overrides):
+        self.init_params = self.default_params.copy()
+        self.init_params.update(overrides)
+
+        if self.init_params['state_type'] != 'Basic':
+            raise ValueError(f"State type ({self.init_params['state_type']}) not yet implemented")
+        self.reward_type = self.init_params['reward_type']
+        if self.reward_type not in ('FinalOnly', 'UnrealizedPnLDelta'):
+            raise ValueError(f"Reward type ({self.reward_type}) not yet implemented")
+
+        self.render_mode = render_mode
+        self.num_assets = self.init_params['num_assets']
+        self.num_steps = self.init_params['num_steps']
+        self.num_prev_obvs = self.init_params['num_prev_obvs']
+
+        starting_prices = self.init_params['asset_starting_prices']
+        if starting_prices is None:
+            starting_prices = self.init_params['starting_price']
+        self.starting_prices = np.broadcast_to(np.asarray(starting_prices, dtype=np.float64), (self.num_assets,))
+
+        generator_params = {key: value for key, value in self.init_params.items() if key != 'price_movement_type'}
+        self.price_generator = make_price_generator(self.init_params['price_movement_type'], **generator_params)
+        self.prices = np.zeros((self.num_assets, self.num_steps + 1), dtype=np.float64)
+
+        self.trader = VectorTrader(self.num_assets, self.init_params['multiple_units'])
+        self.window = VectorRankWindow(self.num_assets, self.num_prev_obvs, scale=self.init_params['scale'],
+                                       offset_scaling=self.init_params['offset_scaling'],
+                                       min_offset=self.init_params.get('min_offset', 0.01))
+        self.step_count = 0
+        self._prev_equity_pct = 0.0
+
+        self.action_space = gym.spaces.MultiDiscrete([5] * self.num_assets)
+        if self.init_params['scale']:
+            self.observation_space = gym.spaces.Box(low=0, high=1, shape=(self.num_assets, self.num_prev_obvs),
+                                                    dtype=np.float32)
+        else:
+            self.observation_space = gym.spaces.Box(low=0, high=self.num_prev_obvs,
+                                                    shape=(self.num_assets, self.num_prev_obvs), dtype=int)
+
+        self._start_episode()
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        super().reset(seed=seed)
+        self.price_generator.reset(seed=seed)
+        self._start_episode()
+        return self.window.get_state(), self._get_info()
+
+    def step(self, action):
+        actions = np.asarray(action)
+
+        if not self.trader.is_valid_action(actions).all():
+            return self.window.get_state(), -100, False, True, self._get_info()
+
+        self.trader.action(actions)
+
+        self.step_count += 1
+        done = self.step_count >= self.num_steps
+        if done:
+            self.trader.close_all_positions()
+
+        new_prices = self.prices[:, self.step_count]
+        self.trader.step(new_prices)
+        self.window.push(new_prices)
+
+        return self.window.get_state(), self._get_reward(done), done, False, self._get_info()
+
+    def _get_reward(self, is_complete):
+        """
+        Calculates the reward of the whole portfolio, summed over the instruments.
+
+        'FinalOnly' pays the total PnL% once, at the end of the episode. 'UnrealizedPnLDelta' pays the change in
+        total realized plus unrealized PnL% every step.
+
+        Args:
+            is_complete (bool): Flag indicating if the episode is complete.
+
+        Returns:
+            float: The calculated reward.
+        """
+
+        if self.reward_type == 'FinalOnly':
+            return float(self.trader.pnl_pct.sum()) if is_complete else 0
+
+        equity_pct = float(self.trader.equity_pct().sum())
+        delta = equity_pct - self._prev_equity_pct
+        self._prev_equity_pct = equity_pct
+        return delta
+
+    def _get_info(self):
+        """
+        Builds the info dictionary: the (num_assets, 5) boolean 'action_mask' and the signed 'position' of every
+        instrument.
+
+        Returns:
+            dict: The info dictionary.
+        """
+
+        return {'action_mask': self.trader.action_masks(), 'position': self.trader.num_long - self.trader.num_short}
+
+    def _start_episode(self):
+        """
+        Draws the price paths of a new episode and clears the positions.
+        """
+
+        self.price_generator.generate_paths(self.num_assets, self.num_steps + 1, starting_price=self.starting_prices,
+                                            out=self.prices)
+        self.trader.reset()
+        self.trader.step(self.prices[:, 0])
+        self.window.reset()
+        self.window.push(self.prices[:, 0])
+        self.step_count = 0
+        self._prev_equity_pct = 0.0
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+import gymnasium as gym
+from src.envs import gym_portfolio
+from src.envs.gym_portfolio.portfolio_env import PortfolioEnv
+from src.envs.stock.evaluation import evaluate_action_sequences
+from src.envs.stock.trader import Trader
+
+
+class TestPortfolioEnv(unittest.TestCase):
+
+    params = {
+        'num_assets': 3,
+        'num_prev_obvs': 5,
+        'num_steps': 20,
+        'multiple_units': True,
+    }
+
+    def test_spaces(self):
+        env = PortfolioEnv(**self.params)
+        obs, info = env.reset(seed=0)
+
+        self.assertEqual(env.action_space, gym.spaces.MultiDiscrete([5, 5, 5]))
+        self.assertEqual(obs.shape, (3, 5))
+        self.assertTrue(env.observation_space.contains(obs))
+        self.assertEqual(info['action_mask'].shape, (3, 5))
+
+    def test_asset_starting_prices(self):
+        env = PortfolioEnv(asset_starting_prices=[10, 100, 1000], **self.params)
+        env.reset(seed=0)
+        np.testing.assert_array_equal(env.prices[:, 0], [10, 100, 1000])
+
+    def test_final_reward_matches_single_asset_evaluation(self):
+        env = PortfolioEnv(**self.params)
+        env.reset(seed=0)
+        prices = env.prices.copy()
+
+        # Every instrument buys a unit, holds it and sells everything at the end
+        actions = np.full((3, 20), Trader.HOLD)
+        actions[:, 0] = Trader.BUY
+        actions[1, 5] = Trader.BUY
+        actions[2, 10] = Trader.SELL_ALL
+
+        total_reward = 0.0
+        for step in range(20):
+            _, reward, terminated, truncated, _ = env.step(actions[:, step])
+            total_reward += reward
+            self.assertFalse(truncated)
+        self.assertTrue(terminated)
+
+        expected = evaluate_action_sequences(actions, prices, multiple_units=True)
+        self.assertTrue(expected.valid.all())
+        np.testing.assert_allclose(env.trader.pnl_pct, expected.pnl_pct)
+        self.assertAlmostEqual(total_reward, expected.pnl_pct.sum())
+
+    def test_dense_reward_sums_to_final_reward(self):
+        env = PortfolioEnv(reward_type='UnrealizedPnLDelta', price_movement_type='RandomWalk', volatility=0.02,
+                           **self.params)
+        _, info = env.reset(seed=1)
+
+        rng = np.random.default_rng(0)
+        total_reward, terminated = 0.0, False
+        while not terminated:
+            actions = [rng.choice(np.flatnonzero(mask)) for mask in info['action_mask']]
+            _, reward, terminated, truncated, info = env.step(actions)
+            self.assertFalse(truncated)
+            total_reward += reward
+
+        self.assertAlmostEqual(total_reward, env.trader.pnl_pct.sum())
+
+    def test_invalid_action_truncates(self):
+        env = PortfolioEnv(**self.params)
+        env.reset(seed=0)
+
+        _, reward, terminated, truncated, _ = env.step([Trader.HOLD, Trader.BUY_ALL, Trader.HOLD])
+        self.assertEqual(reward, -100)
+        self.assertFalse(terminated)
+        self.assertTrue(truncated)
+        np.testing.assert_array_equal(env.trader.num_long, 0)
+
+    def test_gym_make(self):
+        env = gym.make('Portfolio', num_assets=2, num_steps=10)
+        obs, _ = env.reset(seed=0)
+        self.assertEqual(obs.shape, (2, 5))
+        for _ in range(10):
+            obs, reward, terminated, truncated, _ = env.step(np.full(2, Trader.HOLD))
+        self.assertTrue(terminated)
+        env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='Random',
+    entry_point='src.envs.gym_random.random_env:RandomEnv',
+    vector_entry_point='src.envs.gym_random.random_vector_env:RandomVectorEnv',
+)
@@ -0,0 +1,16 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class RandomEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices follow a driftless geometric random walk.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "RandomWalk",
+        'volatility': 0.01,
+        'drift': 0.0,
+    }
@@ -0,0 +1,12 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_random.random_env import RandomEnv
+
+
+class RandomVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of RandomEnv.
+    """
+
+    default_params = RandomEnv.default_params
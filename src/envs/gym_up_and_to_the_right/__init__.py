@@ -3,4 +3,16 @@ from gymnasium.envs.registration import register
 register(
     id='UpAndToTheRight',
     entry_point='src.envs.gym_up_and_to_the_right.up_and_to_the_right_env:UpAndToTheRightEnv',
+    vector_entry_point='src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env:UpAndToTheRightVectorEnv',
+)
+
+# Bare, headless variant with fixed-shape observations; gym.make returns it without the env checker and
+# order enforcing wrappers (see src.envs.fast.make_fast for the same on any registered env)
+register(
+    id='UpAndToTheRightFast',
+    entry_point='src.envs.gym_up_and_to_the_right.up_and_to_the_right_env:UpAndToTheRightEnv',
+    vector_entry_point='src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env:UpAndToTheRightVectorEnv',
+    kwargs={'render': False, 'state_type': 'PaddedBasic'},
+    order_enforce=False,
+    disable_env_checker=True,
 )
@@ -5,7 +5,7 @@ from src.envs.stock.controller import Controller
 from typing import Optional
 
 class UpAndToTheRightEnv(gym.Env):
-    metadata = {'render_modes': ['human']}
+    metadata = {'render_modes': ['human', 'rgb_array'], 'render_fps': 30}
 
     default_params = {
         'state_type': "Basic",
@@ -18,6 +18,7 @@ class UpAndToTheRightEnv(gym.Env):
         'noise': 0.1,
         'starting_price': 100,
         'num_steps': 100,
+        'precompute_prices': True,
         'multiple_units': True,
         'render': True,
         'graph_width': 800,
@@ -35,13 +36,20 @@ class UpAndToTheRightEnv(gym.Env):
             self.init_params['render_mode'] = render_mode
 
         self.controller = Controller(**self.init_params)
+        # Each step applies the action followed by frame_skip - 1 HOLDs, see Controller.step_n
+        self.frame_skip = self.init_params.get('frame_skip', 1)
         self.render_mode = render_mode
         self.action_space = gym.spaces.Discrete(5)
         self.observation_space = self.controller.get_observation_space()
         self.state = self.controller.get_state()
 
     def step(self, action):
-        self.state, reward, done, truncated, info = self.controller.step(action)
+        if self.frame_skip > 1:
+            self.state, reward, done, truncated, info = self.controller.step_n(action, self.frame_skip)
+        else:
+            self.state, reward, done, truncated, info = self.controller.step(action)
+        # The controller's mask is a read-only view of a shared table; hand out an independent array
+        info['action_mask'] = info['action_mask'].copy()
         if self.render_mode == "human":
             self.render()
         # print("State: ", self.state, "Reward: ", reward, "Done: ", done, "Truncated: ", truncated, "Info: ", info)
@@ -49,13 +57,36 @@ class UpAndToTheRightEnv(gym.Env):
 
     def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
         super().reset(seed=seed)
-        self.controller = Controller(**self.init_params)
+        self.controller.reset(seed=seed)
         self.state = self.controller.get_state()
-        return self.state, {}
+        return self.state, {'action_mask': self.controller.trader.action_mask.copy()}
+
+    def snapshot(self):
+        """
+        Captures the state of the environment, see Controller.snapshot.
+
+        Returns:
+            ControllerSnapshot: The captured state, to pass to restore.
+        """
+        return self.controller.snapshot()
+
+    def restore(self, snapshot):
+        """
+        Returns the environment to a captured state, see Controller.restore.
+
+        Args:
+            snapshot (ControllerSnapshot): State captured by snapshot.
+
+        Returns:
+            The observation of the restored state.
+        """
+        self.controller.restore(snapshot)
+        self.state = self.controller.get_state()
+        return self.state
 
     def render(self):
-        if self.render_mode == "human":
-            self.controller.render()
+        if self.render_mode in ("human", "rgb_array"):
+            return self.controller.render()
         else:
             gym.logger.warn(
                 "You are calling render method without specifying any render mode. " 
@@ -64,8 +95,7 @@ class UpAndToTheRightEnv(gym.Env):
         """
         Closes the environment, including any associated resources like the Pygame window.
         """
-        if self.controller.render_graph:
-            self.controller.graph.close_window()
+        self.controller.close()
 
 
 
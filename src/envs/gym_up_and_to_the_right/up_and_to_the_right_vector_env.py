@@ -0,0 +1,166 @@
+# Uses OpenAI Gymnasium
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+from src.envs.stock.price_movement.registry import make_price_generator
+from src.envs.stock.vector_state import VectorRankWindow
+from src.envs.stock.vector_trader import VectorTrader
+from typing import Optional
+
+
+class UpAndToTheRightVectorEnv(VectorEnv):
+    """
+    Natively vectorized version of UpAndToTheRightEnv. Prices, positions, PnL and observations of all
+    sub-environments are held in NumPy arrays of shape (num_envs, ...), so a single step advances every
+    sub-environment with array operations. Price paths are drawn for a whole episode at once when a
+    sub-environment resets. Sub-environments that finish (or are truncated by an invalid
+    action) are reset on the following step, matching gymnasium's next-step autoreset mode.
+
+    Observations are the 'Basic' rank state, padded with zeros after the available ranks while fewer than
+    num_prev_obvs prices have been seen, so that they can be stacked into a single array. With the 'PaddedBasic'
+    state they are a dict of those 'ranks' and the 0/1 'mask' of the entries that hold a rank. They are written
+    into preallocated buffers every step; with copy=False those buffers themselves are returned, and are
+    overwritten by the next step.
+    """
+
+    metadata = {'render_modes': [], 'autoreset_mode': AutoresetMode.NEXT_STEP}
+
+    default_params = UpAndToTheRightEnv.default_params
+
+    def __init__(self, num_envs: int = 1, render_mode: Optional[str] = None, copy: bool = True, **overrides):
+        self.init_params = self.default_params.copy()
+        self.init_params.update(overrides)
+
+        self.state_type = self.init_params['state_type']
+        if self.state_type not in ('Basic', 'PaddedBasic'):
+            raise ValueError(f"State type ({self.init_params['state_type']}) not yet implemented")
+        if self.init_params['reward_type'] != 'FinalOnly':
+            raise ValueError(f"Reward type ({self.init_params['reward_type']}) not yet implemented")
+        if self.init_params.get('frame_skip', 1) != 1:
+            raise ValueError("frame_skip is not yet implemented for the vector environment")
+
+        self.num_envs = num_envs
+        self.render_mode = render_mode
+        self.num_steps = self.init_params['num_steps']
+        self.num_prev_obvs = self.init_params['num_prev_obvs']
+        self.scale = self.init_params['scale']
+
+        generator_params = {key: value for key, value in self.init_params.items() if key != 'price_movement_type'}
+        self.price_generator = make_price_generator(self.init_params['price_movement_type'], **generator_params)
+        self.prices = np.zeros((num_envs, self.num_steps + 1), dtype=np.float64)
+        self._env_indices = np.arange(num_envs)
+        self._all_envs = np.ones(num_envs, dtype=bool)
+
+        self.trader = VectorTrader(num_envs, self.init_params['multiple_units'])
+        self.window = VectorRankWindow(num_envs, self.num_prev_obvs, scale=self.scale,
+                                       offset_scaling=self.init_params['offset_scaling'],
+                                       min_offset=self.init_params.get('min_offset', 0.01))
+        self.step_count = np.zeros(num_envs, dtype=np.int64)
+        self._autoreset = np.zeros(num_envs, dtype=bool)
+
+        self.single_action_space = gym.spaces.Discrete(5)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        if self.scale:
+            rank_space = gym.spaces.Box(low=0, high=1, shape=(self.num_prev_obvs,), dtype=np.float32)
+        else:
+            rank_space = gym.spaces.Box(low=0, high=self.num_prev_obvs, shape=(self.num_prev_obvs,), dtype=int)
+        if self.state_type == 'PaddedBasic':
+            self.single_observation_space = gym.spaces.Dict({
+                'ranks': rank_space,
+                'mask': gym.spaces.MultiBinary(self.num_prev_obvs),
+            })
+        else:
+            self.single_observation_space = rank_space
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.copy = copy
+        if self.state_type == 'PaddedBasic':
+            self._observations = {key: np.zeros(space.shape, dtype=space.dtype)
+                                  for key, space in self.observation_space.items()}
+        else:
+            self._observations = np.zeros(self.observation_space.shape, dtype=self.observation_space.dtype)
+
+        self._reset_envs(np.ones(num_envs, dtype=bool))
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None):
+        super().reset(seed=seed)
+        self.price_generator.reset(seed=seed)
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_observations(), self._get_info()
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+
+        # Next-step autoreset: sub-environments that finished last step ignore their action and reset
+        resetting = self._autoreset.copy()
+        if resetting.any():
+            self._reset_envs(resetting)
+
+        valid = self.trader.is_valid_action(actions)
+        invalid = ~resetting & ~valid
+        stepping = ~resetting & valid
+
+        self.trader.action(actions, mask=stepping)
+
+        final = stepping & (self.step_count + 1 >= self.num_steps)
+        self.trader.close_all_positions(final)
+
+        self.step_count += stepping
+        new_prices = self.prices[self._env_indices, self.step_count]
+        self.trader.step(new_prices)
+        self.window.push(new_prices, mask=stepping)
+
+        rewards = np.where(final, self.trader.pnl_pct, 0.0)
+        rewards[invalid] = -100
+
+        terminations = final
+        truncations = invalid
+        self._autoreset = terminations | truncations
+
+        return self._get_observations(), rewards, terminations, truncations, self._get_info()
+
+    def _get_observations(self):
+        """
+        Writes the observations of every sub-environment into the observation buffers.
+
+        Returns:
+            np.ndarray or dict: The buffers, or copies of them if copy is enabled.
+        """
+
+        if self.state_type == 'PaddedBasic':
+            self.window.get_state(out=self._observations['ranks'])
+            self.window.get_mask(out=self._observations['mask'])
+            if self.copy:
+                return {key: buffer.copy() for key, buffer in self._observations.items()}
+            return self._observations
+
+        self.window.get_state(out=self._observations)
+        return self._observations.copy() if self.copy else self._observations
+
+    def _get_info(self):
+        """
+        Builds the info dictionary, holding the (num_envs, 5) boolean 'action_mask' of every sub-environment.
+
+        Returns:
+            dict: The info dictionary, in gymnasium's vector format.
+        """
+
+        return {'action_mask': self.trader.action_masks(), '_action_mask': self._all_envs}
+
+    def _reset_envs(self, mask):
+        """
+        Starts a new episode in the selected sub-environments.
+
+        Args:
+            mask (np.ndarray): Boolean mask of sub-environments to reset.
+        """
+
+        self.prices[mask] = self.price_generator.generate_paths(np.count_nonzero(mask), self.num_steps + 1)
+        self.trader.reset(mask)
+        self.trader.current_price[mask] = self.prices[mask, 0]
+        self.window.reset(mask)
+        self.window.push(self.trader.current_price, mask=mask)
+        self.step_count[mask] = 0
+        self._autoreset[mask] = False
@@ -0,0 +1,133 @@
+import unittest
+import numpy as np
+import gymnasium as gym
+from src.envs import gym_up_and_to_the_right
+from src.envs import (gym_down_and_to_the_right, gym_mean_reversion, gym_random, gym_parabolic_up_trend,
+                      gym_parabolic_down_trend, gym_higher_up_probability, gym_higher_down_probability,
+                      gym_up_and_to_the_right_w_structural_breaks)
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.stock.controller import Controller
+
+
+class TestUpAndToTheRightVectorEnv(unittest.TestCase):
+
+    params = {
+        'num_prev_obvs': 5,
+        'noise': 0.0,
+        'num_steps': 20,
+        'multiple_units': True,
+        'render': False,
+    }
+
+    def _make_controller(self):
+        init_params = UpAndToTheRightVectorEnv.default_params.copy()
+        init_params.update(self.params)
+        return Controller(**init_params)
+
+    def test_matches_controller(self):
+        num_envs = 8
+        env = UpAndToTheRightVectorEnv(num_envs=num_envs, **self.params)
+        controllers = [self._make_controller() for _ in range(num_envs)]
+        needs_reset = [False] * num_envs
+        rng = np.random.default_rng(0)
+
+        obs, _ = env.reset(seed=0)
+        for _ in range(100):
+            actions = rng.integers(0, 5, size=num_envs)
+            obs, rewards, terminations, truncations, _ = env.step(actions)
+
+            for i, controller in enumerate(controllers):
+                if needs_reset[i]:
+                    controllers[i] = self._make_controller()
+                    expected = (controllers[i].get_state(), 0, False, False)
+                    needs_reset[i] = False
+                else:
+                    state, reward, done, truncated, _ = controller.step(actions[i])
+                    expected = (state, reward, done, truncated)
+                    needs_reset[i] = done or truncated
+
+                state, reward, done, truncated = expected
+                np.testing.assert_array_equal(obs[i, :len(state)], state)
+                np.testing.assert_array_equal(obs[i, len(state):], 0)
+                self.assertAlmostEqual(rewards[i], reward, places=6)
+                self.assertEqual(terminations[i], done)
+                self.assertEqual(truncations[i], truncated)
+
+    def test_scaled_observations(self):
+        env = UpAndToTheRightVectorEnv(num_envs=4, scale=True, offset_scaling=True, **self.params)
+        obs, _ = env.reset(seed=0)
+        for _ in range(10):
+            obs, *_ = env.step(np.full(4, 2))
+
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertTrue(env.observation_space.contains(obs))
+
+    def test_seeded_reset_is_reproducible(self):
+        env = UpAndToTheRightVectorEnv(num_envs=4, **{**self.params, 'noise': 0.5})
+        env.reset(seed=7)
+        first = env.prices.copy()
+        env.reset(seed=7)
+        np.testing.assert_array_equal(env.prices, first)
+
+    def test_make_vec(self):
+        envs = gym.make_vec('UpAndToTheRight', num_envs=3, vectorization_mode='vector_entry_point', render=False)
+        obs, _ = envs.reset(seed=0)
+        self.assertEqual(obs.shape, (3, 5))
+        envs.close()
+
+    def test_price_process_envs(self):
+        env_ids = ['DownAndToTheRight', 'MeanReversion', 'Random', 'ParabolicUpTrend', 'ParabolicDownTrend',
+                   'HigherUpProbability', 'HigherDownProbability', 'UpAndToTheRightWStructuralBreaks']
+        for env_id in env_ids:
+            env = gym.make(env_id, render=False, num_steps=10)
+            env.reset(seed=0)
+            for _ in range(10):
+                _, _, terminated, truncated, _ = env.step(2)
+            self.assertTrue(terminated, env_id)
+            env.close()
+
+            envs = gym.make_vec(env_id, num_envs=4, vectorization_mode='vector_entry_point', num_steps=10)
+            envs.reset(seed=0)
+            self.assertEqual(envs.prices.shape, (4, 11), env_id)
+            self.assertFalse(np.allclose(envs.prices, envs.prices[:1]), env_id)
+            envs.close()
+
+    def test_observation_buffer_is_reused_without_copy(self):
+        envs = UpAndToTheRightVectorEnv(num_envs=3, copy=False, **self.params)
+        obs, _ = envs.reset(seed=0)
+        next_obs, _, _, _, _ = envs.step(np.full(3, 2))
+        self.assertIs(obs, next_obs)
+
+        envs = UpAndToTheRightVectorEnv(num_envs=3, **self.params)
+        obs, _ = envs.reset(seed=0)
+        next_obs, _, _, _, _ = envs.step(np.full(3, 2))
+        self.assertFalse(np.shares_memory(obs, next_obs))
+
+    def test_padded_basic_observations(self):
+        envs = UpAndToTheRightVectorEnv(num_envs=3, state_type='PaddedBasic', **self.params)
+        obs, _ = envs.reset(seed=0)
+        self.assertTrue(envs.observation_space.contains(obs))
+        np.testing.assert_array_equal(obs['mask'], [[1, 0, 0, 0, 0]] * 3)
+
+        next_obs, *_ = envs.step(np.full(3, 2))
+        np.testing.assert_array_equal(next_obs['mask'], [[1, 1, 0, 0, 0]] * 3)
+        np.testing.assert_array_equal(next_obs['ranks'][:, 2:], 0)
+        self.assertEqual(obs['mask'][0].sum(), 1)
+
+        envs = UpAndToTheRightVectorEnv(num_envs=3, state_type='PaddedBasic', copy=False, **self.params)
+        obs, _ = envs.reset(seed=0)
+        next_obs, *_ = envs.step(np.full(3, 2))
+        self.assertIs(obs['ranks'], next_obs['ranks'])
+
+    def test_info_holds_action_masks(self):
+        envs = UpAndToTheRightVectorEnv(num_envs=2, **self.params)
+        _, info = envs.reset(seed=0)
+        np.testing.assert_array_equal(info['action_mask'], [[True, True, True, False, False]] * 2)
+
+        _, _, _, _, info = envs.step(np.array([0, 1]))
+        np.testing.assert_array_equal(info['action_mask'], [[True, False, True, False, True],
+                                                            [False, True, True, True, False]])
+
+
+if __name__ == '__main__':
+    unittest.main()
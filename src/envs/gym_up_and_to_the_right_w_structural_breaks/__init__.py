@@ -0,0 +1,7 @@
+from gymnasium.envs.registration import register
+
+register(
+    id='UpAndToTheRightWStructuralBreaks',
+    entry_point='src.envs.gym_up_and_to_the_right_w_structural_breaks.up_and_to_the_right_w_structural_breaks_env:UpAndToTheRightWStructuralBreaksEnv',
+    vector_entry_point='src.envs.gym_up_and_to_the_right_w_structural_breaks.up_and_to_the_right_w_structural_breaks_vector_env:UpAndToTheRightWStructuralBreaksVectorEnv',
+)
@@ -0,0 +1,18 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_env import UpAndToTheRightEnv
+
+
+class UpAndToTheRightWStructuralBreaksEnv(UpAndToTheRightEnv):
+    """
+    Trading environment whose prices trend up linearly, with structural breaks that change the slope and jump the
+    price level.
+    """
+
+    default_params = {
+        **UpAndToTheRightEnv.default_params,
+        'price_movement_type': "RegimeSwitching",
+        'break_probability': 0.02,
+        'slope_spread': 1.0,
+        'jump_size': 5.0,
+    }
@@ -0,0 +1,13 @@
+# Uses OpenAI Gymnasium
+
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.gym_up_and_to_the_right_w_structural_breaks.up_and_to_the_right_w_structural_breaks_env import \
+    UpAndToTheRightWStructuralBreaksEnv
+
+
+class UpAndToTheRightWStructuralBreaksVectorEnv(UpAndToTheRightVectorEnv):
+    """
+    Natively vectorized version of UpAndToTheRightWStructuralBreaksEnv.
+    """
+
+    default_params = UpAndToTheRightWStructuralBreaksEnv.default_params
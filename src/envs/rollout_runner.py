@@ -0,0 +1,302 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+from gymnasium import spaces
+from multiprocessing import shared_memory
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+
+
+def _attach(name, shape, dtype):
+    """
+    Attaches to an existing shared memory block and wraps it in a NumPy array.
+
+    Args:
+        name (str): Name of the shared memory block.
+        shape (tuple): Shape of the array.
+        dtype (np.dtype): Data type of the array.
+
+    Returns:
+        tuple: The SharedMemory handle and the array view.
+    """
+
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _write_observations(arrays, obs):
+    """
+    Copies observations into the shared observation buffers, one buffer per key for Dict observations.
+
+    Args:
+        arrays (dict): Mapping of buffer name to array view.
+        obs (np.ndarray or dict): Observations returned by the vector environment.
+    """
+
+    if isinstance(obs, dict):
+        for key, value in obs.items():
+            arrays['observations.' + key][:] = value
+    else:
+        arrays['observations'][:] = obs
+
+
+def _worker(conn, start, stop, layout, env_params):
+    """
+    Worker loop: owns the sub-environments [start, stop) and reads/writes them through shared memory.
+
+    Args:
+        conn (multiprocessing.connection.Connection): Pipe used for small commands only.
+        start (int): First environment index owned by this worker.
+        stop (int): One past the last environment index owned by this worker.
+        layout (dict): Mapping of buffer name to (shared memory name, shape, dtype).
+        env_params (dict): Parameters passed to UpAndToTheRightVectorEnv.
+    """
+
+    handles, arrays = [], {}
+    for key, (name, shape, dtype) in layout.items():
+        shm, array = _attach(name, shape, dtype)
+        handles.append(shm)
+        arrays[key] = array[start:stop]
+
+    env = UpAndToTheRightVectorEnv(num_envs=stop - start, copy=False, **env_params)
+    try:
+        while True:
+            command, argument = conn.recv()
+            if command == 'step':
+                obs, rewards, terminations, truncations, _ = env.step(arrays['actions'])
+                _write_observations(arrays, obs)
+                arrays['rewards'][:] = rewards
+                arrays['terminations'][:] = terminations
+                arrays['truncations'][:] = truncations
+            elif command == 'reset':
+                obs, _ = env.reset(seed=argument)
+                _write_observations(arrays, obs)
+                arrays['rewards'][:] = 0
+                arrays['terminations'][:] = False
+                arrays['truncations'][:] = False
+            elif command == 'close':
+                break
+            conn.send(None)
+    finally:
+        env.close()
+        arrays.clear()
+        for shm in handles:
+            shm.close()
+
+
+class SharedMemoryRolloutRunner:
+    """
+    The SharedMemoryRolloutRunner class runs UpAndToTheRight environments across worker processes.
+    Each worker owns a contiguous shard of environments, stepped as an UpAndToTheRightVectorEnv, and writes
+    observations, rewards and done flags straight into NumPy arrays backed by multiprocessing.shared_memory.
+    The parent writes actions into a shared array as well, so the pipes only carry tiny commands.
+
+    Dict observations ('PaddedBasic' state) get one shared buffer per key, and are returned as a dict of arrays.
+
+    The arrays returned by reset and step are views of the shared buffers and are overwritten by the next step.
+    """
+
+    def __init__(self, num_workers, envs_per_worker, seed=None, start_method=None, **env_params):
+        """
+        Initializes the runner and starts the worker processes.
+
+        Args:
+            num_workers (int): Number of worker processes.
+            envs_per_worker (int): Number of environments owned by each worker.
+            seed (int, optional): Base seed; worker i is seeded with seed + i.
+            start_method (str, optional): multiprocessing start method, defaults to the platform default.
+            **env_params: Overrides of the UpAndToTheRightEnv default parameters.
+        """
+
+        self.closed = False
+        self._shared_memory = []
+        self._arrays = {}
+        self._connections = []
+        self._processes = []
+
+        env_params.setdefault('render', False)
+        self.num_workers = num_workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = num_workers * envs_per_worker
+        self.seed = seed
+
+        probe = UpAndToTheRightVectorEnv(num_envs=1, **env_params)
+        obs_space = probe.single_observation_space
+        probe.close()
+
+        if isinstance(obs_space, spaces.Dict):
+            self._observation_keys = list(obs_space.keys())
+            specs = {'observations.' + key: ((self.num_envs,) + space.shape, space.dtype)
+                     for key, space in obs_space.items()}
+        else:
+            self._observation_keys = None
+            specs = {'observations': ((self.num_envs,) + obs_space.shape, obs_space.dtype)}
+        specs.update({
+            'rewards': ((self.num_envs,), np.float64),
+            'terminations': ((self.num_envs,), np.bool_),
+            'truncations': ((self.num_envs,), np.bool_),
+            'actions': ((self.num_envs,), np.int64),
+        })
+
+        self._layout = {}
+        for key, (shape, dtype) in specs.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shared_memory.append(shm)
+            self._layout[key] = (shm.name, shape, dtype)
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            self._arrays[key].fill(0)
+
+        context = mp.get_context(start_method)
+        for i in range(num_workers):
+            parent_conn, child_conn = context.Pipe()
+            start, stop = i * envs_per_worker, (i + 1) * envs_per_worker
+            process = context.Process(target=_worker,
+                                      args=(child_conn, start, stop, self._layout, env_params),
+                                      daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    @property
+    def observations(self):
+        if self._observation_keys is not None:
+            return {key: self._arrays['observations.' + key] for key in self._observation_keys}
+        return self._arrays['observations']
+
+    @property
+    def rewards(self):
+        return self._arrays['rewards']
+
+    @property
+    def terminations(self):
+        return self._arrays['terminations']
+
+    @property
+    def truncations(self):
+        return self._arrays['truncations']
+
+    def reset(self, seed=None):
+        """
+        Resets every environment.
+
+        Args:
+            seed (int, optional): Base seed; worker i is seeded with seed + i. Defaults to the runner seed.
+
+        Returns:
+            np.ndarray or dict: Shared observation array of shape (num_envs, ...), or a dict of them for Dict
+            observations.
+        """
+
+        seed = self.seed if seed is None else seed
+        for i, conn in enumerate(self._connections):
+            conn.send(('reset', None if seed is None else seed + i))
+        self._wait()
+        return self.observations
+
+    def step(self, actions):
+        """
+        Steps every environment with the given actions.
+
+        Args:
+            actions (np.ndarray): Integer array of shape (num_envs,).
+
+        Returns:
+            tuple: Shared observation, reward, termination and truncation arrays.
+        """
+
+        self._arrays['actions'][:] = actions
+        for conn in self._connections:
+            conn.send(('step', None))
+        self._wait()
+        return self.observations, self.rewards, self.terminations, self.truncations
+
+    def measure_throughput(self, num_steps=1000, seed=0):
+        """
+        Runs random actions through every environment and measures environment steps per second.
+
+        Args:
+            num_steps (int): Number of vector steps to take.
+            seed (int): Seed for the random actions.
+
+        Returns:
+            float: Total environment steps per second across all workers.
+        """
+
+        rng = np.random.default_rng(seed)
+        actions = rng.integers(0, 5, size=(num_steps, self.num_envs))
+        self.reset(seed=seed)
+
+        start = time.perf_counter()
+        for step_actions in actions:
+            self.step(step_actions)
+        elapsed = time.perf_counter() - start
+        return num_steps * self.num_envs / elapsed
+
+    def close(self):
+        """
+        Stops the workers and releases the shared memory.
+        """
+
+        if self.closed:
+            return
+
+        for conn in self._connections:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._connections:
+            conn.close()
+
+        self._arrays.clear()
+        for shm in self._shared_memory:
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+    def _wait(self):
+        """
+        Waits until every worker has finished its current command.
+        """
+
+        for conn in self._connections:
+            conn.recv()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, 'closed'):
+            self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure rollout throughput with shared-memory worker processes")
+    parser.add_argument('--envs-per-worker', type=int, default=256, help="Environments owned by each worker")
+    parser.add_argument('--num-steps', type=int, default=1000, help="Vector steps per measurement")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help="Largest number of workers to try")
+    args = parser.parse_args()
+
+    baseline = None
+    num_workers = 1
+    while num_workers <= args.max_workers:
+        with SharedMemoryRolloutRunner(num_workers, args.envs_per_worker, num_prev_obvs=5) as runner:
+            steps_per_sec = runner.measure_throughput(args.num_steps)
+        baseline = baseline or steps_per_sec
+        print(f"workers={num_workers:>3}  steps/sec={steps_per_sec:12,.0f}  "
+              f"scaling={steps_per_sec / baseline:5.2f}x")
+        num_workers *= 2
+
+
+if __name__ == "__main__":
+    main()
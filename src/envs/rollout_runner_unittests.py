@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from src.envs.gym_up_and_to_the_right.up_and_to_the_right_vector_env import UpAndToTheRightVectorEnv
+from src.envs.rollout_runner import SharedMemoryRolloutRunner
+
+
+class TestSharedMemoryRolloutRunner(unittest.TestCase):
+
+    params = {'num_steps': 10, 'noise': 0.5, 'render': False}
+
+    def test_matches_vector_envs(self):
+        rng = np.random.default_rng(0)
+        with SharedMemoryRolloutRunner(2, 3, seed=5, **self.params) as runner:
+            envs = [UpAndToTheRightVectorEnv(num_envs=3, **self.params) for _ in range(2)]
+            obs = runner.reset()
+            expected = np.concatenate([env.reset(seed=5 + i)[0] for i, env in enumerate(envs)])
+            np.testing.assert_array_equal(obs, expected)
+
+            for _ in range(30):
+                actions = rng.integers(0, 5, size=runner.num_envs)
+                obs, rewards, terminations, truncations = runner.step(actions)
+                results = [env.step(actions[3 * i:3 * (i + 1)]) for i, env in enumerate(envs)]
+
+                np.testing.assert_array_equal(obs, np.concatenate([result[0] for result in results]))
+                np.testing.assert_allclose(rewards, np.concatenate([result[1] for result in results]))
+                np.testing.assert_array_equal(terminations, np.concatenate([result[2] for result in results]))
+                np.testing.assert_array_equal(truncations, np.concatenate([result[3] for result in results]))
+
+    def test_dict_observations(self):
+        params = dict(self.params, state_type='PaddedBasic', num_prev_obvs=4)
+        rng = np.random.default_rng(0)
+        with SharedMemoryRolloutRunner(2, 3, seed=5, **params) as runner:
+            envs = [UpAndToTheRightVectorEnv(num_envs=3, **params) for _ in range(2)]
+            obs = runner.reset()
+            results = [env.reset(seed=5 + i) for i, env in enumerate(envs)]
+
+            for _ in range(10):
+                self.assertEqual(set(obs), {'ranks', 'mask'})
+                for key in obs:
+                    np.testing.assert_array_equal(obs[key], np.concatenate([result[0][key] for result in results]))
+
+                actions = rng.integers(0, 5, size=runner.num_envs)
+                obs = runner.step(actions)[0]
+                results = [env.step(actions[3 * i:3 * (i + 1)]) for i, env in enumerate(envs)]
+
+    def test_measure_throughput(self):
+        with SharedMemoryRolloutRunner(1, 4, **self.params) as runner:
+            self.assertGreater(runner.measure_throughput(num_steps=20), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
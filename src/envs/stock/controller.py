@@ -1,10 +1,33 @@
-import pygame
+from dataclasses import dataclass
 from src.envs.stock.graph import StockGraph
-from src.envs.stock.trader import Trader
-from src.envs.stock.price_movement.linear.price_movement_linear import LinearPriceMovement
+from src.envs.stock.evaluation import EvaluationResult, evaluate_action_sequences
+from src.envs.stock.features import StreamingFeatures
+from src.envs.stock.profiler import StageProfiler
+from src.envs.stock.trader import Trader, TraderSnapshot
+from src.envs.stock.price_movement.registry import make_price_generator
+from src.envs.stock.rank_window import RankWindow
+import itertools
+import json
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-from gymnasium import spaces
+
+
+@dataclass(slots=True)
+class ControllerSnapshot:
+    """
+    State of a Controller captured by Controller.snapshot. Its size does not depend on the episode length.
+
+    Attributes:
+        scalars (tuple): Step count, current and previous price, and the running aggregates of the dense rewards.
+        trader (TraderSnapshot): State of the trader, sharing its history copy-on-write.
+        price_generator (tuple): Position in the price stream and random state of the generator.
+        rank_window (tuple): Copy of the observation window.
+        features (dict): Copy of the streaming feature statistics, or None without features.
+    """
+    scalars: tuple
+    trader: TraderSnapshot
+    price_generator: tuple
+    rank_window: tuple
+    features: dict
 
 
 class Controller:
@@ -16,7 +39,7 @@ class Controller:
 
     def __init__(self, state_type, reward_type, price_movement_type, num_prev_obvs, offset_scaling, scale, graph_width,
                  graph_height, background_color, slope, noise, starting_price, num_steps,
-                 multiple_units=False, render=False, **kwargs):
+                 multiple_units=False, render=False, seed=None, **kwargs):
         """
         Initializes the Controller object.
 
@@ -30,53 +53,171 @@ class Controller:
             graph_width (int): Width of the stock graph.
             graph_height (int): Height of the stock graph.
             background_color (tuple): Background color of the stock graph.
-            slope (float): Slope parameter for the LinearPriceMovement model.
-            noise (float): Noise parameter for the LinearPriceMovement model.
+            slope (float): Slope parameter of the price movement model.
+            noise (float): Noise parameter of the price movement model.
             starting_price (float): Starting price for the price generation.
             num_steps (int): Number of steps in an episode.
             multiple_units (bool): Whether multiple units can be traded.
-            **kwargs: Additional keyword arguments.
+            render (bool): Whether to create a stock graph for rendering. Set 'render_window' in kwargs to
+                only show the most recent points. A 'render_mode' of 'rgb_array' in kwargs draws off-screen.
+                Set 'history_window' in kwargs to only keep that many recent prices and actions in memory, and
+                'history_spill_dir' to write older ones to disk. Set 'profile' in kwargs to time every stage of
+                a step, see stats().
+            seed (int, optional): Seed for the price generator.
+            **kwargs: Additional keyword arguments, including the parameters of price movement types other
+                than 'Linear' (see price_movement.registry).
         """
 
-        self.render_graph = render
+        self.render_mode = kwargs.get('render_mode')
+        self.render_graph = render or self.render_mode in ('human', 'rgb_array')
+
+        # Streaming mode: only the last history_window prices and actions are kept in memory
+        history_window = kwargs.get('history_window')
+        render_window = kwargs.get('render_window')
+        if history_window is not None:
+            render_window = min(render_window or history_window - 1, history_window - 1)
 
         if self.render_graph:
-            self.graph = StockGraph(graph_width, graph_height, background_color)
+            self.graph = StockGraph(graph_width, graph_height, background_color, max_points=num_steps,
+                                    window_size=render_window, offscreen=self.render_mode == 'rgb_array')
 
-        self.trader = Trader(multiple_units)
-        self.trader.step(starting_price)
+        self.trader = Trader(multiple_units, num_steps=num_steps, history_window=history_window,
+                             spill_dir=kwargs.get('history_spill_dir'))
 
-        if price_movement_type == "Linear":
-            self.price_generator = LinearPriceMovement(slope, noise, starting_price)
-        else:
-            raise ValueError("This price generation is not supported yet")
+        # In streaming mode prices are drawn in fixed-size blocks instead of one path for the whole episode.
+        # The remaining kwargs are passed through, but cannot override the explicit generator parameters.
+        generator_params = dict(kwargs, slope=slope, noise=noise, starting_price=starting_price,
+                                num_steps=num_steps if history_window is None else None,
+                                precompute=kwargs.get('precompute_prices', False), seed=seed)
+        self.price_generator = make_price_generator(price_movement_type, **generator_params)
 
-        self.current_price = starting_price
         self.num_steps = num_steps
-        self.step_count = 0
         self.state_type = state_type
         self.num_prev_obvs = num_prev_obvs
         self.kwargs = kwargs
         self.scale = scale
         self.offset_scaling = offset_scaling
         self.reward_type = reward_type
+        self.sharpe_eta = kwargs.get('sharpe_eta', 0.01)
+        self.drawdown_penalty = kwargs.get('drawdown_penalty', 0.5)
+
+        self.rank_window = RankWindow(num_prev_obvs, scale=scale, offset_scaling=offset_scaling,
+                                      min_offset=kwargs.get('min_offset', 0.01), lookup=kwargs.get('state_lookup'))
+
+        # Technical features are only maintained when the state uses them
+        self.features = None
+        if state_type in ('Features', 'BasicWithFeatures'):
+            self.features = StreamingFeatures(window=kwargs.get('feature_window', 20),
+                                              ema_span=kwargs.get('ema_span', 10),
+                                              rsi_period=kwargs.get('rsi_period', 14))
+
+        # Profiling wraps the stage methods of this instance only, so a disabled profiler costs nothing
+        self.profiler = None
+        if kwargs.get('profile', False):
+            self.profiler = StageProfiler()
+            self.profiler.wrap(self, {'step': 'step', 'step_n': 'step_n', 'get_next_price': 'price_generation',
+                                      'get_state': 'state', 'get_reward': 'reward', 'render': 'render'})
+            self.profiler.wrap(self.trader, {'is_valid_action': 'validation', 'action': 'action'})
+
+        self._start_episode()
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode in place, reusing the trader, price generator, state buffers and graph.
+
+        Args:
+            seed (int, optional): Seed for the price generator. The generator keeps its current
+                random stream if no seed is given.
+        """
 
-    def step(self, action):
+        self.price_generator.reset(seed=seed)
+        self.trader.reset()
+        self.rank_window.reset()
+        if self.features is not None:
+            self.features.reset()
+        if self.render_graph:
+            self.graph.invalidate()
+        self._start_episode()
+
+    def _start_episode(self):
+        """
+        Records the starting price of the episode.
+        """
+
+        self.current_price = self.price_generator.current_price
+        self.previous_price = self.current_price
+        self.step_count = 0
+        self.trader.step(self.current_price)
+        self.rank_window.push(self.current_price)
+        if self.features is not None:
+            self.features.push(self.current_price)
+
+        # Running aggregates of the dense rewards
+        self._prev_equity_pct = 0.0
+        self._peak_equity_pct = 0.0
+        self._sharpe_mean = 0.0
+        self._sharpe_second_moment = 0.0
+
+    def snapshot(self):
+        """
+        Captures the state of the environment, for search-based agents that branch it many times. The snapshot
+        holds the step count, position aggregates, PnL, generator position and random state and the observation
+        window; the price and action history is shared copy-on-write, so taking a snapshot is O(1) in the
+        episode length.
+
+        Returns:
+            ControllerSnapshot: The captured state, to pass to restore.
+
+        Raises:
+            ValueError: If history is spilled to disk ('history_spill_dir'), which cannot be rewound.
+        """
+
+        return ControllerSnapshot(
+            scalars=(self.step_count, self.current_price, self.previous_price, self._prev_equity_pct,
+                     self._peak_equity_pct, self._sharpe_mean, self._sharpe_second_moment),
+            trader=self.trader.snapshot(),
+            price_generator=self.price_generator.snapshot(),
+            rank_window=self.rank_window.snapshot(),
+            features=self.features.snapshot() if self.features is not None else None,
+        )
+
+    def restore(self, snapshot):
+        """
+        Returns the environment to a captured state. Stepping on from it gives the same prices, states and rewards
+        as after the snapshot was taken, and a snapshot can be restored any number of times, also after reset.
+
+        Args:
+            snapshot (ControllerSnapshot): State captured by snapshot.
+        """
+
+        (self.step_count, self.current_price, self.previous_price, self._prev_equity_pct,
+         self._peak_equity_pct, self._sharpe_mean, self._sharpe_second_moment) = snapshot.scalars
+        self.trader.restore(snapshot.trader)
+        self.price_generator.restore(snapshot.price_generator)
+        self.rank_window.restore(snapshot.rank_window)
+        if self.features is not None:
+            self.features.restore(snapshot.features)
+        if self.render_graph:
+            self.graph.invalidate()
+
+    def step(self, action, out=None):
         """
         Executes a trading action, updates the environment state, and calculates the reward.
 
         Args:
             action (int): The trading action to execute.
+            out (np.ndarray, optional): Buffer to write the new state into, see get_state.
 
         Returns:
             tuple: Tuple containing the new state, reward, completion status, truncated, and additional info.
+            The info holds 'action_mask', the read-only boolean mask of actions valid in the new state.
 
         Raises:
             ValueError: If an invalid action is attempted.
         """
 
         if not self.trader.is_valid_action(action):
-            return self.get_state(), -100, False, True, {}
+            return self.get_state(out), -100, False, True, {'action_mask': self.trader.action_mask}
 
         self.trader.action(action)
 
@@ -84,35 +225,129 @@ class Controller:
         # self.get_next_price()
         if self.step_count + 1 < self.num_steps:
             self.get_next_price()
-            return self.get_state(), self.get_reward(is_complete=False), False, False, {}
+            return (self.get_state(out), self.get_reward(is_complete=False), False, False,
+                    {'action_mask': self.trader.action_mask})
         else:
             self.trader.close_all_positions()
             self.get_next_price()
-            return self.get_state(), self.get_reward(is_complete=True), True, False, {}
+            return (self.get_state(out), self.get_reward(is_complete=True), True, False,
+                    {'action_mask': self.trader.action_mask})
 
-    def get_next_price(self):
+    def step_n(self, action, k=1, out=None):
+        """
+        Executes several steps in one call: the action followed by k - 1 HOLDs, or a given sequence of actions.
+        The state is only built after the last step, and the rewards of the steps are summed, so the result
+        equals stepping one action at a time and keeping the last state.
+
+        With a single action, prices that leave the rank window before the last step are never ranked, and the
+        'FinalOnly' reward is only computed at the end of the episode.
+
+        Stops early when the episode ends or an invalid action truncates it; the -100 of the invalid action is
+        added to the rewards collected so far.
+
+        Args:
+            action (int or Sequence): The first action, or the whole sequence of actions to execute.
+            k (int): Number of steps when a single action is given.
+            out (np.ndarray, optional): Buffer to write the new state into, see get_state.
+
+        Returns:
+            tuple: Tuple containing the new state, total reward, completion status, truncated, and additional info,
+            as returned by step.
+        """
+
+        # Any scalar, including 0-d arrays and integral floats, is a single action
+        validate = np.ndim(action) != 0
+        if validate:
+            actions = action
+            skip_rank_until = self.step_count
+        else:
+            if k == 1:
+                return self.step(action, out)
+            if not self.trader.is_valid_action(action):
+                return self.get_state(out), -100, False, True, {'action_mask': self.trader.action_mask}
+            action = int(action)
+
+            # HOLD is always valid, so the number of steps is known and only the last num_prev_obvs prices
+            # need to be ranked
+            actions = itertools.chain((action,), itertools.repeat(Trader.HOLD, k - 1))
+            num_run = min(k, self.num_steps - self.step_count)
+            skip_rank_until = self.step_count + num_run - self.num_prev_obvs
+        dense_reward = self.reward_type != 'FinalOnly'
+
+        total_reward = 0
+        for next_action in actions:
+            if validate and not self.trader.is_valid_action(next_action):
+                return self.get_state(out), total_reward - 100, False, True, {'action_mask': self.trader.action_mask}
+
+            self.trader.action(next_action)
+            is_complete = self.step_count + 1 >= self.num_steps
+            if is_complete:
+                self.trader.close_all_positions()
+            self.get_next_price(push_rank=self.step_count >= skip_rank_until)
+            if dense_reward or is_complete:
+                total_reward += self.get_reward(is_complete=is_complete)
+            if is_complete:
+                return self.get_state(out), total_reward, True, False, {'action_mask': self.trader.action_mask}
+
+        return self.get_state(out), total_reward, False, False, {'action_mask': self.trader.action_mask}
+
+    def get_next_price(self, push_rank=True):
         """
         Generates the next price using the price movement model and updates the environment state.
+
+        Args:
+            push_rank (bool): Whether to add the price to the rank window. Only skipped for prices that leave
+                the window before the next state is built.
         """
 
         new_price = self.price_generator.generate_next_price()
         self.trader.step(new_price)
+        if push_rank:
+            self.rank_window.push(new_price)
+        if self.features is not None:
+            self.features.push(new_price)
+        self.previous_price = self.current_price
         self.current_price = new_price
         self.step_count += 1
 
-    def get_state(self):
+    def get_state(self, out=None):
         """
         Retrieves the current state of the environment.
 
+        With an `out` buffer the state is written in place and no arrays are allocated. For the 'Basic' state the
+        buffer needs num_prev_obvs elements, and the returned view covers only the ranks available so far.
+
+        'Basic' is the ranks of the last num_prev_obvs prices. 'PaddedBasic' is the same ranks with a fixed
+        shape: a dict of the 'ranks', zero-padded to num_prev_obvs, and a 0/1 'mask' of the entries that hold a
+        rank. 'Features' is the StreamingFeatures vector (returns, rolling mean/volatility, EMA gap, RSI, position
+        and unrealized PnL%), and 'BasicWithFeatures' is the ranks, zero-padded to num_prev_obvs, followed by the
+        features.
+
+        Args:
+            out (np.ndarray or dict, optional): Buffer to write the state into, shaped like the observation
+                space; for 'PaddedBasic' a dict of 'ranks' and 'mask' buffers.
+
         Returns:
-            np.ndarray: The current state of the environment.
+            np.ndarray or dict: The current state of the environment, `out` (or a view of it) if given.
 
         Raises:
             ValueError: If an unsupported state type is requested.
         """
 
         if self.state_type == 'Basic':
-            return self._get_basic_state()
+            return self._get_basic_state(out)
+        elif self.state_type == 'PaddedBasic':
+            return self._get_padded_basic_state(out)
+        elif self.state_type == 'Features':
+            return self._get_feature_state(out)
+        elif self.state_type == 'BasicWithFeatures':
+            if out is None:
+                out = np.zeros(self.num_prev_obvs + StreamingFeatures.NUM_FEATURES, dtype=np.float32)
+            elif self.rank_window.size < self.num_prev_obvs:
+                out[:self.num_prev_obvs] = 0
+            self.rank_window.get_state(out=out[:self.num_prev_obvs])
+            self._get_feature_state(out=out[self.num_prev_obvs:])
+            return out
         else:
             raise ValueError(f"State type ({self.state_type}) not yet implemented")
 
@@ -120,6 +355,13 @@ class Controller:
         """
         Calculates the reward based on the current state of the environment.
 
+        'FinalOnly' pays the PnL% once, at the end of the episode. The dense reward types pay every step and are
+        computed in O(1) from the trader's running sums:
+            'UnrealizedPnLDelta': change in realized plus unrealized PnL%; sums to the final PnL% over an episode.
+            'LogReturn': log-return of the price over the step times the signed number of units held, in percent.
+            'Sharpe': differential Sharpe ratio of the PnL% changes, with moving averages of rate 'sharpe_eta'.
+            'DrawdownPenalized': change in PnL% minus 'drawdown_penalty' times any increase of the drawdown.
+
         Args:
             is_complete (bool): Flag indicating if the episode is complete.
 
@@ -129,25 +371,50 @@ class Controller:
 
         if self.reward_type == 'FinalOnly':
             return self._get_final_reward_only(is_complete)
+        elif self.reward_type == 'UnrealizedPnLDelta':
+            return self._get_equity_delta()
+        elif self.reward_type == 'LogReturn':
+            return self._get_log_return_reward()
+        elif self.reward_type == 'Sharpe':
+            return self._get_differential_sharpe_reward()
+        elif self.reward_type == 'DrawdownPenalized':
+            return self._get_drawdown_penalized_reward()
         else:
             raise ValueError(f"Reward type ({self.reward_type}) not yet implemented")
 
     def render(self):
+        """
+        Draws the episode so far.
+
+        Returns:
+            np.ndarray or None: The frame as an RGB array of shape (graph_height, graph_width, 3) when rendering
+            off-screen ('rgb_array' render mode), otherwise None.
+        """
+
+        # pygame is only imported once rendering is actually used, to keep headless startup fast
+        import pygame
+
         if not self.graph.initialized:
             self.graph._initialize_window()
 
         # Basic event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.close()  # Ensure this method safely closes the environment and Pygame window
-
-        if len(self.trader.action_list) > 1:
-            self.graph.screen.fill(self.graph.background_color)
-            if len(self.trader.price_list) > len(self.trader.action_list):
-                self.graph.update_graph(self.trader.price_list[:-1], self.trader.action_list)
-            else:
-                raise ValueError("Given implementation shouldn't be here")
-            pygame.display.flip()
+        if not self.graph.offscreen:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.close()  # Ensure this method safely closes the environment and Pygame window
+
+        prices, actions = self.trader.price_list, self.trader.action_list
+        if len(actions) > 1:
+            # Pair every action with the price it was taken at; in streaming mode both are recent windows
+            num_points = min(len(actions), len(prices) - 1)
+            self.graph.update_graph_incremental(prices[-(num_points + 1):-1], actions[len(actions) - num_points:],
+                                                first_index=self.trader.num_actions - num_points)
+        else:
+            # Nothing to plot yet, so do not hand back the previous episode's drawing
+            self.graph.clear()
+
+        if self.graph.offscreen:
+            return self.graph.get_frame()
 
     def get_valid_actions(self):
         """
@@ -157,16 +424,85 @@ class Controller:
             list: A list of valid actions.
         """
 
-        return [i for i in range(5) if self.trader.is_valid_action(i)]
+        return np.flatnonzero(self.trader.action_mask).tolist()
+
+    def evaluate_actions(self, actions, prices=None):
+        """
+        Scores a full-episode action sequence in a single vectorized pass, without stepping the environment.
+        The episode is evaluated from its first step against the current price path, and the controller's
+        state is left untouched.
+
+        Args:
+            actions (np.ndarray): Integer array of shape (num_steps,).
+            prices (np.ndarray, optional): Prices seen at each step, defaults to the precomputed episode path.
+
+        Returns:
+            EvaluationResult: Validity, final PnL/PnL% and total 'FinalOnly' reward of the sequence.
+        """
+
+        result = self.evaluate_action_batch(np.asarray(actions)[np.newaxis], prices)
+        return EvaluationResult(valid=bool(result.valid[0]), num_valid_steps=int(result.num_valid_steps[0]),
+                                pnl=float(result.pnl[0]), pnl_pct=float(result.pnl_pct[0]),
+                                reward=float(result.reward[0]))
+
+    def evaluate_action_batch(self, actions, prices=None):
+        """
+        Scores many full-episode action sequences at once, against the same or different price paths.
+
+        Args:
+            actions (np.ndarray): Integer array of shape (num_sequences, num_steps).
+            prices (np.ndarray, optional): Price path of shape (num_steps + 1,) shared by every sequence, or
+                (num_sequences, num_steps + 1) paths such as those from price_generator.generate_paths.
+                Defaults to the precomputed episode path.
+
+        Returns:
+            EvaluationResult: Arrays of shape (num_sequences,).
+
+        Raises:
+            ValueError: If no prices are given and the price path is not precomputed.
+        """
+
+        if self.reward_type != 'FinalOnly':
+            raise ValueError(f"Reward type ({self.reward_type}) not supported for action evaluation")
+
+        if prices is None:
+            if getattr(self.price_generator, 'path', None) is None:
+                raise ValueError("Evaluating actions requires precomputed prices (precompute_prices=True)")
+            prices = self.price_generator.path
+
+        actions = np.asarray(actions)
+        if actions.shape[-1] != self.num_steps:
+            raise ValueError(f"Expected {self.num_steps} actions per sequence, got {actions.shape[-1]}")
+        if np.shape(prices)[-1] < self.num_steps:
+            raise ValueError(f"Expected at least {self.num_steps} prices per sequence, got {np.shape(prices)[-1]}")
+
+        return evaluate_action_sequences(actions, prices, self.trader.multiple_units)
 
     def get_observation_space(self):
         """
         Get the observation space of the environment based on the state configuration.
 
         Returns:
-            gym.spaces.Box: The observation space.
+            gym.spaces.Space: The observation space, a Box or, for 'PaddedBasic', a Dict.
         """
 
+        from gymnasium import spaces
+
+        if self.features is not None:
+            low, high = StreamingFeatures.bounds()
+            if self.state_type == 'BasicWithFeatures':
+                low = np.concatenate([np.zeros(self.num_prev_obvs, dtype=np.float32), low])
+                high = np.concatenate([np.full(self.num_prev_obvs, 1 if self.scale else self.num_prev_obvs,
+                                               dtype=np.float32), high])
+            return spaces.Box(low=low, high=high, dtype=np.float32)
+
+        if self.state_type == 'PaddedBasic':
+            return spaces.Dict({
+                'ranks': spaces.Box(low=0, high=1 if self.scale else self.num_prev_obvs,
+                                    shape=(self.num_prev_obvs,), dtype=self.rank_window.dtype),
+                'mask': spaces.MultiBinary(self.num_prev_obvs),
+            })
+
         if self.scale:
             return spaces.Box(low=0, high=1, shape=(self.num_prev_obvs,), dtype=np.float32)
         else:
@@ -174,10 +510,13 @@ class Controller:
             high = self.num_prev_obvs
             return spaces.Box(low=low, high=high, shape=(self.num_prev_obvs,), dtype=int)
 
-    def _get_basic_state(self):
+    def _get_basic_state(self, out=None):
         """
         Computes the basic state representation.
 
+        Args:
+            out (np.ndarray, optional): Buffer of num_prev_obvs elements to write the state into.
+
         Returns:
             np.ndarray: The basic state representation.
 
@@ -187,25 +526,48 @@ class Controller:
 
         allow_different_sequence_length = self.kwargs.get('allow_var_len', True)
 
-        if self.step_count + 1 >= self.num_prev_obvs or allow_different_sequence_length:
-            num_available_prices = min(self.step_count + 1, self.num_prev_obvs)
-            prev_prices = self.trader.price_list[-num_available_prices:]
-            ranks = np.argsort(np.argsort(prev_prices)) + 1
+        if self.rank_window.size == self.num_prev_obvs or allow_different_sequence_length:
+            return self.rank_window.get_state(out)
+        else:
+            raise ValueError("Insufficient data for the requested number of previous observations.")
 
-            if self.scale:
-                ranks_reshaped = np.array(ranks).reshape(-1, 1)
-                scaler = MinMaxScaler()
-                scaled_ranks = scaler.fit_transform(ranks_reshaped).flatten()
+    def _get_padded_basic_state(self, out=None):
+        """
+        Computes the basic state padded to num_prev_obvs entries, with a mask of the valid entries.
 
-                if self.offset_scaling:
-                    min_offset = self.kwargs.get('min_offset', 0.01)
-                    scaled_ranks += (min_offset * (1 - scaled_ranks))
+        Args:
+            out (dict, optional): 'ranks' and 'mask' buffers of num_prev_obvs elements to write the state into.
 
-                return scaled_ranks.astype(np.float32)
+        Returns:
+            dict: The zero-padded 'ranks' and the int8 'mask'.
+        """
 
-            return ranks.astype(int)
-        else:
-            raise ValueError("Insufficient data for the requested number of previous observations.")
+        size = self.rank_window.size
+        if out is None:
+            out = {'ranks': np.zeros(self.num_prev_obvs, dtype=self.rank_window.dtype),
+                   'mask': np.zeros(self.num_prev_obvs, dtype=np.int8)}
+        elif size < self.num_prev_obvs:
+            out['ranks'][size:] = 0
+
+        self.rank_window.get_state(out=out['ranks'])
+        mask = out['mask']
+        mask[:size] = 1
+        mask[size:] = 0
+        return out
+
+    def _get_feature_state(self, out=None):
+        """
+        Computes the technical feature state from the streaming features and the trader's position.
+
+        Args:
+            out (np.ndarray, optional): Buffer of StreamingFeatures.NUM_FEATURES elements to write the state into.
+
+        Returns:
+            np.ndarray: The feature state.
+        """
+
+        return self.features.get_state(self.trader.num_long - self.trader.num_short,
+                                        self.trader.unrealized_pnl_pct, out=out)
 
     def _get_final_reward_only(self, is_complete):
         """
@@ -224,6 +586,92 @@ class Controller:
             self.trader.close_all_positions()
             return self.trader.pnl_pct
 
+    def _get_equity_delta(self):
+        """
+        Calculates the change in realized plus unrealized PnL% since the previous step.
+
+        Returns:
+            float: The change in PnL%.
+        """
+
+        equity_pct = self.trader.equity_pct
+        delta = equity_pct - self._prev_equity_pct
+        self._prev_equity_pct = equity_pct
+        return delta
+
+    def _get_log_return_reward(self):
+        """
+        Calculates the log-return of the units held over the last price move.
+
+        Returns:
+            float: The log-return in percent, negative for short units.
+        """
+
+        position = self.trader.num_long - self.trader.num_short
+        if not position:
+            return 0.0
+        return position * np.log(self.current_price / self.previous_price) * 100
+
+    def _get_differential_sharpe_reward(self):
+        """
+        Calculates the differential Sharpe ratio (Moody & Saffell): the first-order effect of the latest PnL%
+        change on a Sharpe ratio built from exponential moving averages of the changes and their squares.
+
+        Returns:
+            float: The differential Sharpe ratio, 0 until the changes have a non-zero variance.
+        """
+
+        delta = self._get_equity_delta()
+        mean, second_moment = self._sharpe_mean, self._sharpe_second_moment
+        delta_mean = delta - mean
+        delta_second_moment = delta * delta - second_moment
+
+        variance = second_moment - mean * mean
+        reward = (second_moment * delta_mean - 0.5 * mean * delta_second_moment) / variance ** 1.5 \
+            if variance > 1e-12 else 0.0
+
+        self._sharpe_mean += self.sharpe_eta * delta_mean
+        self._sharpe_second_moment += self.sharpe_eta * delta_second_moment
+        return reward
+
+    def _get_drawdown_penalized_reward(self):
+        """
+        Calculates the change in PnL%, minus a penalty for every increase of the drawdown from the running peak.
+
+        Returns:
+            float: The penalized change in PnL%.
+        """
+
+        previous_drawdown = self._peak_equity_pct - self._prev_equity_pct
+        delta = self._get_equity_delta()
+        self._peak_equity_pct = max(self._peak_equity_pct, self._prev_equity_pct)
+        drawdown = self._peak_equity_pct - self._prev_equity_pct
+        return delta - self.drawdown_penalty * max(drawdown - previous_drawdown, 0.0)
+
+    def stats(self):
+        """
+        Summarizes the per-stage timings recorded with the 'profile' option: call counts, total, mean, min,
+        max and approximate p50/p99 times in ns, and power-of-two histograms. Stage times are inclusive, so
+        'step' also covers validation, action, price generation, state and reward.
+
+        Returns:
+            dict: Mapping of stage name to its summary, empty if profiling is disabled.
+        """
+
+        return self.profiler.stats() if self.profiler is not None else {}
+
+    def dump_stats(self, path):
+        """
+        Writes stats() as JSON.
+
+        Args:
+            path (str): Output file path.
+        """
+
+        with open(path, 'w') as f:
+            json.dump(self.stats(), f, indent=2)
+
     def close(self):
-        if self.graph and self.graph.initialized:
-            pygame.quit()
+        if self.render_graph and self.graph.initialized:
+            self.graph.close_window()
+        self.trader.close()
@@ -1,3 +1,8 @@
+import itertools
+import json
+import os
+import tempfile
+import tracemalloc
 import unittest
 import numpy as np
 from src.envs.stock.controller import Controller
@@ -24,6 +29,389 @@ class TestController(unittest.TestCase):
             render=False
         )
 
+    def test_basic_state_matches_price_ranks(self):
+        # The incremental rank window must agree with ranking the last prices directly
+        for _ in range(20):
+            self.controller.get_next_price()
+            state = self.controller.get_state()
+            prev_prices = self.controller.trader.price_list[-self.controller.num_prev_obvs:]
+            expected_state = np.argsort(np.argsort(prev_prices)) + 1
+            np.testing.assert_array_equal(state, expected_state)
+
+    def test_reset_starts_new_episode_in_place(self):
+        trader = self.controller.trader
+        self.controller.step(0)
+        self.controller.step(2)
+        self.controller.reset()
+
+        self.assertIs(self.controller.trader, trader)
+        self.assertEqual(self.controller.step_count, 0)
+        self.assertEqual(list(trader.price_list), [100])
+        self.assertEqual(len(trader.action_list), 0)
+        self.assertEqual(trader.num_long, 0)
+        np.testing.assert_array_equal(self.controller.get_state(), [1])
+
+    def test_step_accepts_integral_scalars(self):
+        for action in (np.array(2), np.int64(2)):
+            _, reward, done, truncated, _ = self.controller.step(action)
+            self.assertEqual((reward, done, truncated), (0, False, False))
+        self.assertEqual(list(self.controller.trader.action_list), [2, 2])
+
+    def test_precompute_prices_option(self):
+        for kwargs, expected in (({'precompute': True}, False), ({'precompute_prices': True}, True)):
+            controller = Controller(state_type='Basic', reward_type='FinalOnly', price_movement_type='Linear',
+                                    num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=800,
+                                    graph_height=600, background_color=(0, 0, 0), slope=1, noise=1,
+                                    starting_price=100, num_steps=10, multiple_units=True, render=False, **kwargs)
+            self.assertEqual(controller.price_generator.precompute, expected)
+
+    def test_seeded_reset_is_reproducible(self):
+        self.controller.reset(seed=3)
+        for _ in range(10):
+            self.controller.step(2)
+        first_prices = list(self.controller.trader.price_list)
+        self.controller.reset(seed=3)
+        for _ in range(10):
+            self.controller.step(2)
+
+        self.assertEqual(first_prices, list(self.controller.trader.price_list))
+
+    def _run_episode(self, reward_type, seed=0, **kwargs):
+        controller = Controller(state_type='Basic', reward_type=reward_type, price_movement_type='Linear',
+                                num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=800, graph_height=600,
+                                background_color=(0, 0, 0), slope=0, noise=5, starting_price=100, num_steps=50,
+                                multiple_units=True, render=False, seed=seed, **kwargs)
+        rng = np.random.default_rng(seed)
+        rewards = []
+        done = False
+        while not done:
+            action = rng.choice(controller.get_valid_actions())
+            _, reward, done, _, _ = controller.step(action)
+            rewards.append(reward)
+        return controller, np.array(rewards)
+
+    def test_unrealized_pnl_delta_sums_to_final_pnl(self):
+        controller, rewards = self._run_episode('UnrealizedPnLDelta')
+        self.assertEqual(len(rewards), 50)
+        self.assertAlmostEqual(rewards.sum(), controller.trader.pnl_pct)
+
+    def test_log_return_matches_held_units(self):
+        controller, rewards = self._run_episode('LogReturn')
+        prices = np.asarray(controller.trader.price_list)
+        actions = np.asarray(controller.trader.action_list)
+
+        # Recompute the units held over each price move from scratch
+        position, expected = 0, []
+        for step, action in enumerate(actions):
+            if action == 0:
+                position += 1
+            elif action == 1:
+                position -= 1
+            elif action in (3, 4):
+                position = 0
+            if step == len(actions) - 1:
+                position = 0
+            expected.append(position * np.log(prices[step + 1] / prices[step]) * 100)
+        np.testing.assert_allclose(rewards, expected, atol=1e-9)
+
+    def test_drawdown_penalty_only_lowers_rewards(self):
+        _, deltas = self._run_episode('UnrealizedPnLDelta')
+        _, penalized = self._run_episode('DrawdownPenalized', drawdown_penalty=1.0)
+        self.assertTrue(np.all(penalized <= deltas + 1e-9))
+        self.assertTrue(np.any(penalized < deltas))
+
+    def test_sharpe_rewards_are_finite(self):
+        _, rewards = self._run_episode('Sharpe', sharpe_eta=0.1)
+        self.assertTrue(np.all(np.isfinite(rewards)))
+        self.assertTrue(np.any(rewards != 0))
+
+    def test_feature_states_match_observation_space(self):
+        for state_type in ('Features', 'BasicWithFeatures'):
+            controller = Controller(state_type=state_type, reward_type='FinalOnly', price_movement_type='Linear',
+                                    num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=800,
+                                    graph_height=600, background_color=(0, 0, 0), slope=1, noise=1,
+                                    starting_price=100, num_steps=50, multiple_units=True, render=False)
+            space = controller.get_observation_space()
+            for action in [0, 0, 2, 3, 1, 2] * 5:
+                state, _, _, _, _ = controller.step(action)
+                self.assertEqual(state.shape, space.shape)
+                self.assertTrue(space.contains(state), state_type)
+
+            controller.reset()
+            self.assertTrue(space.contains(controller.get_state()), state_type)
+
+    def test_padded_basic_state_has_fixed_shape(self):
+        for scale in (False, True):
+            controller = Controller(state_type='PaddedBasic', reward_type='FinalOnly', price_movement_type='Linear',
+                                    num_prev_obvs=5, offset_scaling=False, scale=scale, graph_width=800,
+                                    graph_height=600, background_color=(0, 0, 0), slope=1, noise=1,
+                                    starting_price=100, num_steps=50, multiple_units=True, render=False)
+            space = controller.get_observation_space()
+            out = {key: np.zeros(subspace.shape, dtype=subspace.dtype) for key, subspace in space.items()}
+            out['ranks'][:] = 7
+
+            for step in range(8):
+                size = min(step + 1, 5)
+                state = controller.get_state(out=out)
+                self.assertIs(state, out)
+                self.assertTrue(space.contains(state))
+                np.testing.assert_array_equal(state['mask'], [1] * size + [0] * (5 - size))
+                np.testing.assert_array_equal(state['ranks'][size:], 0)
+                np.testing.assert_array_equal(state['ranks'][:size], controller.rank_window.get_state())
+                np.testing.assert_array_equal(controller.get_state()['ranks'], state['ranks'])
+                controller.step(0)
+
+            controller.reset()
+            state = controller.get_state(out=out)
+            np.testing.assert_array_equal(state['mask'], [1, 0, 0, 0, 0])
+            np.testing.assert_array_equal(state['ranks'][1:], 0)
+
+    def test_step_into_buffer_does_not_allocate(self):
+        for state_type, scale in (('Basic', False), ('Basic', True), ('BasicWithFeatures', False)):
+            controller = Controller(state_type=state_type, reward_type='UnrealizedPnLDelta',
+                                    price_movement_type='Linear', num_prev_obvs=10, offset_scaling=True, scale=scale,
+                                    graph_width=800, graph_height=600, background_color=(0, 0, 0), slope=1, noise=1,
+                                    starting_price=100, num_steps=5000, multiple_units=True, render=False,
+                                    precompute_prices=True)
+            out = np.zeros(controller.get_observation_space().shape, dtype=controller.get_observation_space().dtype)
+            actions = [0, 0, 2, 4, 1, 1, 2, 3] * 300
+            warmup, measured = actions[:100], actions[100:]
+
+            for action in warmup:
+                controller.step(action, out=out)
+
+            tracemalloc.start()
+            try:
+                before, _ = tracemalloc.get_traced_memory()
+                for action in measured:
+                    state, _, _, truncated, _ = controller.step(action, out=out)
+                    self.assertFalse(truncated)
+                after, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            self.assertTrue(np.shares_memory(state, out))
+            # Nothing is retained per step, and no step allocates an array-sized block
+            self.assertLess(after - before, 512, state_type)
+            self.assertLess(peak - before, 4096, state_type)
+
+    def test_streaming_mode_renders_like_a_full_history(self):
+        frames = []
+        for extra in ({'render_window': 19}, {'history_window': 20}):
+            controller = Controller(state_type='Basic', reward_type='FinalOnly', price_movement_type='Linear',
+                                    num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=200,
+                                    graph_height=150, background_color=(0, 0, 0), slope=1, noise=1,
+                                    starting_price=100, num_steps=100, multiple_units=True, seed=0,
+                                    render_mode='rgb_array', **extra)
+            for action in [0, 2, 2, 4, 1, 2, 3, 2] * 8:
+                controller.step(action)
+                frame = controller.render()
+            frames.append(frame)
+            controller.close()
+
+        self.assertEqual(len(controller.trader.price_list), 20)
+        np.testing.assert_array_equal(frames[0], frames[1])
+
+    def test_reset_redraws_the_graph(self):
+        controller = Controller(state_type='Basic', reward_type='FinalOnly', price_movement_type='Linear',
+                                num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=200,
+                                graph_height=150, background_color=(0, 0, 0), slope=1, noise=1,
+                                starting_price=100, num_steps=20, multiple_units=True, seed=0,
+                                render_mode='rgb_array')
+        frames = []
+        for actions in ([0, 2] * 10, [2, 0] * 10):
+            controller.reset(seed=0)
+            for action in actions:
+                controller.step(action)
+            frames.append(controller.render())
+        controller.close()
+
+        # Same prices and number of points, but different actions, so the second frame must be redrawn
+        self.assertEqual(controller.graph.full_redraws, 2)
+        self.assertFalse(np.array_equal(frames[0], frames[1]))
+
+    def _make_branching_controller(self, **overrides):
+        params = dict(state_type='BasicWithFeatures', reward_type='Sharpe', price_movement_type='Linear',
+                      num_prev_obvs=5, offset_scaling=True, scale=True, graph_width=800, graph_height=600,
+                      background_color=(0, 0, 0), slope=1, noise=1, starting_price=100, num_steps=200,
+                      multiple_units=True, render=False, seed=0)
+        params.update(overrides)
+        return Controller(**params)
+
+    def _run_branch(self, controller, actions):
+        outputs = [controller.step(action)[:4] for action in actions]
+        return outputs, controller.trader.price_list.copy(), controller.trader.action_list.copy()
+
+    def _assert_same_branch(self, first, second):
+        for (state, reward, done, truncated), expected in zip(first[0], second[0]):
+            np.testing.assert_array_equal(state, expected[0])
+            self.assertEqual((reward, done, truncated), expected[1:])
+        np.testing.assert_array_equal(first[1], second[1])
+        np.testing.assert_array_equal(first[2], second[2])
+
+    def test_restored_snapshot_replays_the_same_branch(self):
+        for overrides in ({'precompute_prices': True}, {'precompute_prices': False},
+                          {'price_movement_type': 'MeanReversion', 'mean': 100, 'reversion_rate': 0.1,
+                           'volatility': 2.0}):
+            controller = self._make_branching_controller(**overrides)
+            self._run_branch(controller, [0, 0, 2, 4, 1] * 4)
+            root = controller.snapshot()
+
+            branch_a = self._run_branch(controller, [0, 2, 0, 2, 4, 1, 1, 3] * 3)
+            controller.restore(root)
+            self._assert_same_branch(self._run_branch(controller, [0, 2, 0, 2, 4, 1, 1, 3] * 3), branch_a)
+
+            # A different branch from the root, with a deeper snapshot, must not disturb branch_a
+            controller.restore(root)
+            self._run_branch(controller, [1, 1, 2])
+            deep = controller.snapshot()
+            branch_b = self._run_branch(controller, [2, 3, 0, 0, 4])
+
+            controller.restore(root)
+            self._assert_same_branch(self._run_branch(controller, [0, 2, 0, 2, 4, 1, 1, 3] * 3), branch_a)
+            controller.restore(deep)
+            self._assert_same_branch(self._run_branch(controller, [2, 3, 0, 0, 4]), branch_b)
+
+    def test_snapshot_shares_history(self):
+        controller = self._make_branching_controller(num_steps=5000)
+        for action in [0, 0, 2, 4, 1, 1, 2, 3] * 500:
+            controller.step(action)
+
+        snapshot = controller.snapshot()
+        self.assertTrue(np.shares_memory(snapshot.trader.prices, controller.trader.price_list))
+        self.assertTrue(np.shares_memory(snapshot.trader.actions, controller.trader.action_list))
+
+        # A replayed price stream writes the same prices, so the history stays shared
+        controller.step(2)
+        controller.restore(snapshot)
+        controller.step(2)
+        self.assertTrue(np.shares_memory(snapshot.trader.prices, controller.trader.price_list))
+
+    def test_snapshot_survives_reset(self):
+        controller = self._make_branching_controller()
+        self._run_branch(controller, [0, 2, 1, 2] * 5)
+        snapshot = controller.snapshot()
+        expected = self._run_branch(controller, [0, 0, 4, 2])
+
+        controller.reset(seed=1)
+        self._run_branch(controller, [1, 2, 3] * 10)
+        controller.restore(snapshot)
+        self._assert_same_branch(self._run_branch(controller, [0, 0, 4, 2]), expected)
+
+    def test_snapshot_in_streaming_mode(self):
+        controller = self._make_branching_controller(history_window=8)
+        self._run_branch(controller, [0, 2, 1, 2] * 5)
+        snapshot = controller.snapshot()
+        expected = self._run_branch(controller, [0, 0, 4, 2] * 3)
+
+        controller.restore(snapshot)
+        self._assert_same_branch(self._run_branch(controller, [0, 0, 4, 2] * 3), expected)
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            controller = self._make_branching_controller(history_window=8, history_spill_dir=spill_dir)
+            with self.assertRaises(ValueError):
+                controller.snapshot()
+            controller.close()
+
+    def test_step_n_matches_single_steps(self):
+        sequences = [[0, 2, 2, 2], [1, 1, 3], [0, 4, 2], [2] * 7]
+        for reward_type in ('FinalOnly', 'UnrealizedPnLDelta', 'Sharpe'):
+            single = self._make_branching_controller(reward_type=reward_type, num_steps=30)
+            multi = self._make_branching_controller(reward_type=reward_type, num_steps=30)
+
+            done = False
+            for actions in itertools.cycle(sequences):
+                expected_reward = 0
+                for action in actions:
+                    expected_state, reward, done, truncated, _ = single.step(action)
+                    expected_reward += reward
+                    if done or truncated:
+                        break
+
+                state, reward, multi_done, multi_truncated, info = multi.step_n(actions)
+                np.testing.assert_array_equal(state, expected_state)
+                self.assertAlmostEqual(reward, expected_reward, places=9)
+                self.assertEqual((multi_done, multi_truncated), (done, truncated))
+                np.testing.assert_array_equal(info['action_mask'], single.trader.action_mask)
+                if done:
+                    break
+
+            np.testing.assert_array_equal(multi.trader.action_list, single.trader.action_list)
+
+    def test_step_n_with_frame_skip_matches_single_steps(self):
+        for num_prev_obvs, k in ((5, 3), (5, 12), (3, 7)):
+            single = self._make_branching_controller(num_prev_obvs=num_prev_obvs, num_steps=40)
+            multi = self._make_branching_controller(num_prev_obvs=num_prev_obvs, num_steps=40)
+
+            done = False
+            for action in itertools.cycle([0, 2, 4, 1, 3]):
+                expected_reward = 0
+                for step_action in [action] + [2] * (k - 1):
+                    expected_state, reward, done, truncated, _ = single.step(step_action)
+                    expected_reward += reward
+                    if done:
+                        break
+
+                state, reward, multi_done, multi_truncated, _ = multi.step_n(action, k)
+                np.testing.assert_allclose(state, expected_state)
+                self.assertAlmostEqual(reward, expected_reward, places=9)
+                self.assertEqual((multi_done, multi_truncated), (done, truncated))
+                if done:
+                    break
+
+    def test_step_n_repeats_hold(self):
+        controller = self._make_branching_controller(reward_type='FinalOnly', num_steps=10)
+        _, _, done, _, _ = controller.step_n(0, k=4)
+        np.testing.assert_array_equal(controller.trader.action_list, [0, 2, 2, 2])
+        self.assertFalse(done)
+
+        _, reward, done, _, _ = controller.step_n(2, k=100)
+        self.assertTrue(done)
+        self.assertEqual(controller.trader.num_actions, 10)
+
+        controller.reset()
+        _, reward, done, truncated, _ = controller.step_n([0, 0, 3])
+        self.assertEqual((reward, done, truncated), (-100, False, True))
+
+    def test_step_n_accepts_integral_scalars(self):
+        for action in (np.array(0), 0.0):
+            controller = self._make_branching_controller(reward_type='FinalOnly', num_steps=10)
+            _, _, done, truncated, _ = controller.step_n(action, k=4)
+            np.testing.assert_array_equal(controller.trader.action_list, [0, 2, 2, 2])
+            self.assertEqual((done, truncated), (False, False))
+
+        _, reward, _, truncated, _ = controller.step_n(1.5, k=4)
+        self.assertEqual((reward, truncated), (-100, True))
+
+    def test_profiling_records_every_stage(self):
+        controller = Controller(state_type='Basic', reward_type='FinalOnly', price_movement_type='Linear',
+                                num_prev_obvs=5, offset_scaling=False, scale=False, graph_width=800, graph_height=600,
+                                background_color=(0, 0, 0), slope=1, noise=1, starting_price=100, num_steps=10,
+                                multiple_units=True, render=False, profile=True)
+        for action in [0, 2, 4, 1, 3, 2, 2, 2, 2, 2]:
+            controller.step(action)
+
+        stats = controller.stats()
+        for stage in ('step', 'validation', 'action', 'price_generation', 'state', 'reward'):
+            self.assertEqual(stats[stage]['count'], 10, stage)
+            self.assertEqual(sum(stats[stage]['histogram'].values()), 10, stage)
+            self.assertLessEqual(stats[stage]['min_ns'], stats[stage]['p50_ns'])
+            self.assertLessEqual(stats[stage]['p50_ns'], stats[stage]['max_ns'])
+        self.assertGreaterEqual(stats['step']['total_ns'], stats['state']['total_ns'])
+        self.assertEqual(stats['render']['count'], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stats.json')
+            controller.dump_stats(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)['step']['count'], 10)
+
+    def test_profiling_disabled_leaves_methods_untouched(self):
+        self.assertIsNone(self.controller.profiler)
+        self.assertNotIn('step', vars(self.controller))
+        self.assertNotIn('is_valid_action', vars(self.controller.trader))
+        self.assertEqual(self.controller.stats(), {})
+
     # def test_basic_state_with_enough_prices(self):
     #     # Simulate 5 steps to generate prices and test state generation
     #     for _ in range(5):
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+import numpy as np
+from src.envs.stock.trader import Trader
+
+
+@dataclass(slots=True)
+class EvaluationResult:
+    """
+    Outcome of evaluating whole action sequences without stepping the environment.
+
+    Attributes:
+        valid (bool or np.ndarray): Whether every action of the sequence was valid.
+        num_valid_steps (int or np.ndarray): Number of actions executed before the first invalid one.
+        pnl (float or np.ndarray): Final PnL, including the close of all positions at the last step.
+        pnl_pct (float or np.ndarray): Final PnL%, including the close of all positions at the last step.
+        reward (float or np.ndarray): Total 'FinalOnly' reward: pnl_pct, or -100 if the episode was truncated.
+    """
+    valid: object
+    num_valid_steps: object
+    pnl: object
+    pnl_pct: object
+    reward: object
+
+
+def evaluate_action_sequences(actions, prices, multiple_units=False):
+    """
+    Evaluates many full-episode action sequences in one vectorized pass, with the same results as stepping
+    a Controller through each sequence with the 'FinalOnly' reward.
+
+    Positions are reconstructed with cumulative sums (reset on every close-all action), validity is checked
+    against the position before each step, and every opened unit is matched with the close event that ends
+    it, so no Python-level loop over steps is needed.
+
+    Args:
+        actions (np.ndarray): Integer array of shape (num_sequences, num_steps).
+        prices (np.ndarray): Prices seen at each step, of shape (num_steps,) shared by every sequence or
+            (num_sequences, num_steps). Longer price paths are truncated to num_steps.
+        multiple_units (bool): Whether multiple units can be held at a time.
+
+    Returns:
+        EvaluationResult: Arrays of shape (num_sequences,).
+    """
+
+    actions = np.asarray(actions)
+    num_sequences, num_steps = actions.shape
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64)[..., :num_steps], actions.shape)
+    steps = np.arange(num_steps)
+
+    buy = actions == Trader.BUY
+    sell = actions == Trader.SELL
+    buy_all = actions == Trader.BUY_ALL
+    sell_all = actions == Trader.SELL_ALL
+
+    # Signed number of open units after each step, assuming every action is valid
+    position = np.cumsum(buy.astype(np.int64) - sell, axis=1)
+    if multiple_units:
+        close_all = buy_all | sell_all
+        last_close = np.maximum.accumulate(np.where(close_all, steps, -1), axis=1)
+        position_at_close = np.take_along_axis(position, np.maximum(last_close, 0), axis=1)
+        position -= np.where(last_close >= 0, position_at_close, 0)
+
+    prev_position = np.zeros_like(position)
+    prev_position[:, 1:] = position[:, :-1]
+
+    if multiple_units:
+        valid_steps = ((buy & (prev_position >= 0)) | (sell & (prev_position <= 0)) | (actions == Trader.HOLD) |
+                       (buy_all & (prev_position < 0)) | (sell_all & (prev_position > 0)))
+        opens = buy | sell
+        closes = close_all
+    else:
+        valid_steps = (buy & (prev_position < 1)) | (sell & (prev_position > -1)) | (actions == Trader.HOLD)
+        opens = (buy | sell) & (prev_position == 0)
+        closes = (buy | sell) & (prev_position != 0)
+
+    # The prefix before the first invalid action is exactly what the environment executes
+    valid = valid_steps.all(axis=1)
+    num_valid_steps = np.where(valid, num_steps, np.argmin(valid_steps, axis=1))
+    executed = steps < num_valid_steps[:, None]
+
+    # Each opened unit is closed by the next close event, or by close_all_positions at the last step
+    close_steps = np.where(closes & executed, steps, num_steps)
+    next_close = np.full_like(close_steps, num_steps)
+    next_close[:, :-1] = np.minimum.accumulate(close_steps[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    closed = (next_close < num_steps) | valid[:, None]
+    exit_prices = np.take_along_axis(prices, np.minimum(next_close, num_steps - 1), axis=1)
+
+    counted = opens & executed & closed
+    is_long = buy if multiple_units else buy & (prev_position == 0)
+    entry_prices = prices
+    pnl = np.where(is_long, exit_prices - entry_prices, entry_prices - exit_prices)
+    pnl_pct = np.where(is_long, exit_prices / entry_prices - 1, entry_prices / exit_prices - 1) * 100
+
+    pnl = np.where(counted, pnl, 0.0).sum(axis=1)
+    pnl_pct = np.where(counted, pnl_pct, 0.0).sum(axis=1)
+
+    return EvaluationResult(valid=valid, num_valid_steps=num_valid_steps, pnl=pnl, pnl_pct=pnl_pct,
+                            reward=np.where(valid, pnl_pct, -100.0))
@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+from src.envs.stock.controller import Controller
+from src.envs.stock.evaluation import evaluate_action_sequences
+from src.envs.stock.trader import Trader
+
+
+class TestEvaluateActionSequences(unittest.TestCase):
+
+    def _make_controller(self, multiple_units):
+        return Controller(state_type='Basic', reward_type='FinalOnly', price_movement_type='Linear', num_prev_obvs=5,
+                          offset_scaling=False, scale=False, graph_width=800, graph_height=600,
+                          background_color=(0, 0, 0), slope=0.5, noise=3, starting_price=100, num_steps=30,
+                          multiple_units=multiple_units, render=False, seed=0, precompute_prices=True)
+
+    def _random_sequences(self, controller, num_sequences, rng):
+        # Mostly valid sequences, so that episodes are long enough to be interesting
+        sequences = []
+        for _ in range(num_sequences):
+            trader = Trader(controller.trader.multiple_units)
+            sequence = []
+            for _ in range(controller.num_steps):
+                valid = [a for a in range(5) if trader.is_valid_action(a)]
+                action = rng.integers(0, 5) if rng.random() < 0.02 else rng.choice(valid)
+                sequence.append(action)
+                if trader.is_valid_action(action):
+                    trader.step(100)
+                    trader.action(action)
+            sequences.append(sequence)
+        return np.array(sequences)
+
+    def _run_controller(self, controller, sequence):
+        controller.reset(seed=0)
+        total_reward = 0
+        for action in sequence:
+            _, reward, done, truncated, _ = controller.step(action)
+            total_reward += reward
+            if done or truncated:
+                return not truncated, controller.trader.pnl, controller.trader.pnl_pct, total_reward
+
+    def _compare_with_controller(self, multiple_units):
+        controller = self._make_controller(multiple_units)
+        sequences = self._random_sequences(controller, 200, np.random.default_rng(1))
+        controller.reset(seed=0)
+        result = controller.evaluate_action_batch(sequences)
+
+        for i, sequence in enumerate(sequences):
+            valid, pnl, pnl_pct, reward = self._run_controller(controller, sequence)
+            self.assertEqual(result.valid[i], valid)
+            self.assertAlmostEqual(result.pnl[i], pnl, places=6)
+            self.assertAlmostEqual(result.pnl_pct[i], pnl_pct, places=6)
+            self.assertAlmostEqual(result.reward[i], reward, places=6)
+
+    def test_matches_controller_single_unit(self):
+        self._compare_with_controller(multiple_units=False)
+
+    def test_matches_controller_multiple_units(self):
+        self._compare_with_controller(multiple_units=True)
+
+    def test_first_invalid_action(self):
+        actions = np.array([[Trader.BUY, Trader.BUY, Trader.SELL, Trader.HOLD]])
+        result = evaluate_action_sequences(actions, np.array([100.0, 101, 102, 103]), multiple_units=False)
+
+        self.assertFalse(result.valid[0])
+        self.assertEqual(result.num_valid_steps[0], 1)
+        self.assertEqual(result.pnl[0], 0)
+        self.assertEqual(result.reward[0], -100)
+
+    def test_different_price_paths(self):
+        actions = np.array([[Trader.BUY, Trader.HOLD, Trader.HOLD]] * 2)
+        prices = np.array([[100.0, 105, 110], [100.0, 95, 90]])
+        result = evaluate_action_sequences(actions, prices, multiple_units=True)
+
+        np.testing.assert_allclose(result.pnl, [10, -10])
+        np.testing.assert_allclose(result.pnl_pct, [10, -10])
+
+    def test_single_sequence(self):
+        controller = self._make_controller(multiple_units=True)
+        result = controller.evaluate_actions(np.full(controller.num_steps, Trader.HOLD))
+        self.assertTrue(result.valid)
+        self.assertEqual(result.reward, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
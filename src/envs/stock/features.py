@@ -0,0 +1,178 @@
+import math
+import numpy as np
+
+
+class StreamingFeatures:
+    """
+    The StreamingFeatures class maintains technical features of the price stream with O(1) updates per price,
+    independent of the window length:
+
+    - the latest log-return,
+    - the mean and standard deviation of the log-returns over the last `window` steps, kept with a sliding
+      Welford update (the oldest return is removed as the newest one is added),
+    - the gap between the price and its exponential moving average,
+    - an RSI-style oscillator in [0, 1] from Wilder-smoothed average gains and losses.
+
+    The trader's position and unrealized PnL% are appended by `get_state`, since the trader already keeps them.
+    """
+
+    FEATURE_NAMES = ('log_return', 'return_mean', 'return_std', 'ema_gap', 'rsi', 'position', 'unrealized_pnl_pct')
+    NUM_FEATURES = len(FEATURE_NAMES)
+
+    def __init__(self, window=20, ema_span=10, rsi_period=14):
+        """
+        Initializes the StreamingFeatures object.
+
+        Args:
+            window (int): Number of log-returns in the rolling mean and standard deviation.
+            ema_span (int): Span of the exponential moving average, alpha = 2 / (span + 1).
+            rsi_period (int): Smoothing period of the average gains and losses.
+        """
+
+        self.window = window
+        self.ema_alpha = 2 / (ema_span + 1)
+        self.rsi_period = rsi_period
+
+        self._returns = [0.0] * window
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the running statistics.
+        """
+
+        self.num_prices = 0
+        self.price = None
+        self.log_return = 0.0
+
+        self._head = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+        self.ema = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def snapshot(self):
+        """
+        Captures the running statistics.
+
+        Returns:
+            dict: The captured state, to pass to restore.
+        """
+
+        state = self.__dict__.copy()
+        state['_returns'] = list(self._returns)
+        return state
+
+    def restore(self, snapshot):
+        """
+        Returns the running statistics to a captured state.
+
+        Args:
+            snapshot (dict): State captured by snapshot.
+        """
+
+        self.__dict__.update(snapshot)
+        self._returns = list(snapshot['_returns'])
+
+    def push(self, price):
+        """
+        Updates every feature with a new price.
+
+        Args:
+            price (float): The new price.
+        """
+
+        self.num_prices += 1
+        if self.price is None:
+            self.price = price
+            self.ema = price
+            return
+
+        change = price - self.price
+        x = math.log(price / self.price)
+        self.log_return = x
+        self.price = price
+
+        # Sliding-window Welford update of the return mean and sum of squared deviations
+        if self._count == self.window:
+            old = self._returns[self._head]
+            new_mean = self._mean + (x - old) / self.window
+            self._m2 += (x - old) * (x - new_mean + old - self._mean)
+            self._mean = new_mean
+            if self._m2 < 0:
+                self._m2 = 0.0
+        else:
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+        self._returns[self._head] = x
+        self._head = (self._head + 1) % self.window
+
+        self.ema += self.ema_alpha * (price - self.ema)
+
+        # Simple average while warming up, Wilder smoothing afterwards
+        weight = 1 / min(self.num_prices - 1, self.rsi_period)
+        self._avg_gain += weight * (max(change, 0.0) - self._avg_gain)
+        self._avg_loss += weight * (max(-change, 0.0) - self._avg_loss)
+
+    @property
+    def return_std(self):
+        """
+        float: Population standard deviation of the log-returns in the window.
+        """
+
+        return math.sqrt(self._m2 / self._count) if self._count else 0.0
+
+    @property
+    def rsi(self):
+        """
+        float: Share of the average move that was up, i.e. RSI / 100. 0.5 until the price has moved.
+        """
+
+        total = self._avg_gain + self._avg_loss
+        return self._avg_gain / total if total > 0 else 0.5
+
+    def get_state(self, position=0, unrealized_pnl_pct=0.0, out=None):
+        """
+        Writes the features, in the order of FEATURE_NAMES.
+
+        Args:
+            position (int): Signed number of units held.
+            unrealized_pnl_pct (float): PnL% of the open units.
+            out (np.ndarray, optional): Buffer of NUM_FEATURES elements to write the state into.
+
+        Returns:
+            np.ndarray: float32 array of NUM_FEATURES features.
+        """
+
+        if out is None:
+            out = np.empty(self.NUM_FEATURES, dtype=np.float32)
+
+        out[0] = self.log_return
+        out[1] = self._mean
+        out[2] = self.return_std
+        out[3] = self.price / self.ema - 1 if self.ema else 0.0
+        out[4] = self.rsi
+        out[5] = position
+        out[6] = unrealized_pnl_pct
+        return out
+
+    @classmethod
+    def bounds(cls):
+        """
+        Lower and upper bounds of every feature, for building observation spaces.
+
+        Returns:
+            tuple: Arrays of NUM_FEATURES lower and upper bounds.
+        """
+
+        low = np.full(cls.NUM_FEATURES, -np.inf, dtype=np.float32)
+        high = np.full(cls.NUM_FEATURES, np.inf, dtype=np.float32)
+        low[cls.FEATURE_NAMES.index('return_std')] = 0
+        low[cls.FEATURE_NAMES.index('rsi')] = 0
+        high[cls.FEATURE_NAMES.index('rsi')] = 1
+        return low, high
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from src.envs.stock.features import StreamingFeatures
+
+
+class TestStreamingFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 300))
+
+    def test_rolling_return_statistics_match_recomputation(self):
+        features = StreamingFeatures(window=20)
+        for t, price in enumerate(self.prices):
+            features.push(price)
+            if t == 0:
+                continue
+
+            returns = np.diff(np.log(self.prices[:t + 1]))[-20:]
+            state = features.get_state()
+            self.assertAlmostEqual(state[0], returns[-1], places=6)
+            self.assertAlmostEqual(state[1], returns.mean(), places=6)
+            self.assertAlmostEqual(state[2], returns.std(), places=6)
+
+    def test_ema_gap_and_rsi_match_recomputation(self):
+        features = StreamingFeatures(ema_span=10, rsi_period=14)
+        for price in self.prices:
+            features.push(price)
+
+        alpha = 2 / 11
+        ema = self.prices[0]
+        for price in self.prices[1:]:
+            ema = alpha * price + (1 - alpha) * ema
+
+        changes = np.diff(self.prices)
+        avg_gain = np.maximum(changes[:14], 0).mean()
+        avg_loss = np.maximum(-changes[:14], 0).mean()
+        for change in changes[14:]:
+            avg_gain += (max(change, 0) - avg_gain) / 14
+            avg_loss += (max(-change, 0) - avg_loss) / 14
+
+        state = features.get_state(position=-2, unrealized_pnl_pct=1.5)
+        self.assertAlmostEqual(state[3], self.prices[-1] / ema - 1, places=6)
+        self.assertAlmostEqual(state[4], avg_gain / (avg_gain + avg_loss), places=6)
+        np.testing.assert_array_equal(state[5:], [-2, 1.5])
+
+    def test_reset_clears_statistics(self):
+        features = StreamingFeatures(window=5)
+        for price in self.prices[:50]:
+            features.push(price)
+        features.reset()
+        features.push(100.0)
+
+        np.testing.assert_array_equal(features.get_state(), [0, 0, 0, 0, 0.5, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-import pygame
+import math
 import sys
 
 class StockGraph:
@@ -6,8 +6,19 @@ class StockGraph:
     The StockGraph class is responsible for visualizing stock price movements and corresponding trading actions.
     It creates a graphical representation of stock prices and marks the points of buy and sell actions. Used in
     render function for gym
+
+    pygame is imported lazily when the window is initialized, so creating a StockGraph (as every Controller with
+    render=True does) costs nothing until then.
+
+    update_graph redraws everything from scratch. update_graph_incremental keeps the axes, gridlines and labels
+    in a cached background surface, caches rendered label glyphs, and only draws the newest segments and markers
+    unless the price range, the x-axis capacity or the visible window changes.
     """
-    def __init__(self, width, height, background_color):
+
+    Y_MARGIN = 0.1  # Fraction of the price span added above and below, so small moves do not rescale
+    NUM_X_LABELS = 10  # Approximate number of x-axis labels drawn by the incremental renderer
+
+    def __init__(self, width, height, background_color, max_points=None, window_size=None, offscreen=False):
         """
         Initializes the StockGraph object.
 
@@ -15,11 +26,24 @@ class StockGraph:
             width (int): The width of the graph window.
             height (int): The height of the graph window.
             background_color (tuple): The background color of the graph in RGB format.
+            max_points (int, optional): Expected number of points, used as the fixed x-axis extent by the
+                incremental renderer. The extent doubles when exceeded if not given.
+            window_size (int, optional): Only show the last window_size points in the incremental renderer.
+            offscreen (bool): Draw into an off-screen surface instead of opening a window, for rgb_array rendering.
         """
 
         self.width, self.height = width, height
         self.background_color = background_color
+        self.max_points = max_points
+        self.window_size = window_size
+        self.offscreen = offscreen
         self.initialized = False
+        self._pygame = None  # pygame module, set once the window is initialized
+        self.full_redraws = 0  # Number of full redraws done by the incremental renderer
+        self._glyphs = {}
+        self._background = None
+        self._background_key = None
+        self._reset_incremental_state()
         self.colors = {
             0: (0, 255, 0),  # Green for 'buy'
             3: (50, 255, 255),  # Green for 'buy all'
@@ -28,9 +52,9 @@ class StockGraph:
         }
 
     def process_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
+        for event in self._pygame.event.get():
+            if event.type == self._pygame.QUIT:
+                self._pygame.quit()
                 sys.exit()
 
     def update_graph(self, prices, actions):
@@ -63,7 +87,7 @@ class StockGraph:
             y1 = self.height - 50 - ((prices[i - 1] - min_price) / (max_price - min_price)) * (self.height - 100)
             x2 = 50 + i * (self.width - 100) / (len(prices) - 1)
             y2 = self.height - 50 - ((prices[i] - min_price) / (max_price - min_price)) * (self.height - 100)
-            pygame.draw.line(self.screen, (255, 255, 255), (x1, y1), (x2, y2))
+            self._pygame.draw.line(self.screen, (255, 255, 255), (x1, y1), (x2, y2))
 
         # Plot buy/sell action points
         for i, (price, action) in enumerate(zip(prices, actions)):
@@ -71,29 +95,265 @@ class StockGraph:
                 x = 50 + i * (self.width - 100) / (len(prices) - 1)
                 y = self.height - 50 - ((price - min_price) / (max_price - min_price)) * (self.height - 100)
                 color = self.colors[action]
-                pygame.draw.circle(self.screen, color, (int(x), int(y)), 5)
+                self._pygame.draw.circle(self.screen, color, (int(x), int(y)), 5)
+
+        self._present()
+
+
+    def update_graph_incremental(self, prices, actions, first_index=0):
+        """
+        Updates the stock graph, drawing only the points added since the previous call when possible.
+
+        Args:
+            prices (Sequence): Stock prices from the start of the episode, or the most recent prices if
+                first_index is given.
+            actions (Sequence): Actions taken, corresponding to each price in 'prices'.
+            first_index (int): Step number of prices[0], for callers that only keep recent history. The
+                window_size must then not exceed len(prices).
+
+        Raises:
+            ValueError: If the lengths of 'prices' and 'actions' are not equal.
+        """
+
+        if len(prices) != len(actions):
+            raise ValueError("Length of prices and actions must be the same")
+
+        if len(prices) == 0:
+            return
+        num_points = first_index + len(prices)
 
-        pygame.display.flip()
+        offset = first_index
+        if self.window_size is not None and num_points > self.window_size:
+            offset = max(num_points - self.window_size, first_index)
 
+        if num_points < self._num_drawn:
+            # Fewer points than already drawn means a new episode started
+            self._reset_incremental_state()
+
+        new_prices = prices[max(self._num_drawn, offset) - first_index:]
+        if len(new_prices) == 0:
+            self._present()
+            return
+        new_min, new_max = min(new_prices), max(new_prices)
+
+        capacity = self._capacity
+        if capacity is None or offset + capacity < num_points:
+            capacity = self._x_capacity(num_points)
+
+        needs_full_redraw = (offset != self._offset or capacity != self._capacity or self._y_range is None or
+                             new_min < self._y_range[0] or new_max > self._y_range[1])
+
+        if needs_full_redraw:
+            visible = prices[offset - first_index:]
+            self._offset = offset
+            self._capacity = capacity
+            self._y_range = self._padded_range(min(visible), max(visible))
+            self._draw_background()
+            self.screen.blit(self._background, (0, 0))
+            self._draw_x_labels()
+            self._draw_points(prices, actions, offset, num_points, first_index)
+            self.full_redraws += 1
+        else:
+            self._draw_points(prices, actions, max(self._num_drawn - 1, offset), num_points, first_index)
+
+        self._num_drawn = num_points
+        self._present()
 
     def close_window(self):
         """
         Closes the Pygame window and terminates the Pygame instance.
         """
-        pygame.display.quit()
-        pygame.quit()
+
+        if self.offscreen:
+            self._pygame.font.quit()
+        else:
+            self._pygame.display.quit()
+            self._pygame.quit()
+        self.initialized = False
 
     def _initialize_window(self):
         """
         Initializes the Pygame window and other necessary components.
         """
-        pygame.init()
-        self.screen = pygame.display.set_mode((self.width, self.height))
+
+        import pygame
+
+        self._pygame = pygame  # Imported once here, so drawing methods do not repeat the import
+        if self.offscreen:
+            # Only fonts are needed to draw into a plain surface, no display is opened
+            pygame.font.init()
+            self.screen = pygame.Surface((self.width, self.height))
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.width, self.height))
         self.screen.fill(self.background_color)
         self.font = pygame.font.Font(None, 24)  # Default font for labels
-        pygame.display.flip()
+        self._present()
         self.initialized = True
 
+    def get_frame(self, out=None):
+        """
+        Returns the current contents of the graph as an RGB image.
+
+        Args:
+            out (np.ndarray, optional): uint8 buffer of shape (height, width, 3) to copy the frame into.
+
+        Returns:
+            np.ndarray: The frame, of shape (height, width, 3).
+        """
+
+        import numpy as np
+        # pixels3d is a (width, height, 3) view of the surface; transposing it is free
+        pixels = self._pygame.surfarray.pixels3d(self.screen).transpose(1, 0, 2)
+        if out is None:
+            out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        np.copyto(out, pixels)
+        del pixels  # Releases the surface lock
+        return out
+
+    def _present(self):
+        """
+        Shows the drawn surface in the window; off-screen graphs have nothing to show.
+        """
+
+        if not self.offscreen:
+            self._pygame.display.flip()
+
+    def clear(self):
+        """
+        Fills the graph with the background color, for when there is nothing to plot yet.
+        """
+
+        self.screen.fill(self.background_color)
+        self._reset_incremental_state()
+        self._present()
+
+    def invalidate(self):
+        """
+        Forces a full redraw on the next update, for when the history being drawn was rewound.
+        """
+
+        self._reset_incremental_state()
+
+    def _reset_incremental_state(self):
+        """
+        Forgets what the incremental renderer has drawn, forcing a full redraw on its next update.
+        """
+
+        self._num_drawn = 0
+        self._offset = 0
+        self._capacity = None
+        self._y_range = None
+
+    def _x_capacity(self, num_points):
+        """
+        Returns the number of points spanned by the x-axis of the incremental renderer.
+        """
+
+        if self.window_size is not None:
+            return self.window_size
+        if self.max_points is not None and num_points <= self.max_points:
+            return self.max_points
+        return 1 << max(num_points - 1, 1).bit_length()
+
+    def _padded_range(self, min_price, max_price):
+        """
+        Returns an integer price range around [min_price, max_price] with some margin on both sides.
+        """
+
+        margin = max((max_price - min_price) * self.Y_MARGIN, 1)
+        return math.floor(min_price - margin), math.ceil(max_price + margin)
+
+    def _to_screen(self, index, price):
+        """
+        Converts a point index and price into screen coordinates for the incremental renderer.
+        """
+
+        min_price, max_price = self._y_range
+        x = 50 + (index - self._offset) * (self.width - 100) / max(self._capacity - 1, 1)
+        y = self.height - 50 - ((price - min_price) / (max_price - min_price)) * (self.height - 100)
+        return x, y
+
+    def _glyph(self, text):
+        """
+        Returns the rendered surface for a label, rendering each distinct label only once.
+        """
+
+        glyph = self._glyphs.get(text)
+        if glyph is None:
+            glyph = self.font.render(text, True, (255, 255, 255))
+            self._glyphs[text] = glyph
+        return glyph
+
+    def _draw_background(self):
+        """
+        Draws the axes, gridlines and y-axis labels into a cached surface, reusing it while they are unchanged.
+        """
+
+        key = (self._y_range, self._capacity)
+        if key == self._background_key:
+            return
+
+        background = self._pygame.Surface((self.width, self.height))
+        background.fill(self.background_color)
+        min_price, max_price = self._y_range
+
+        # Horizontal gridlines and y-axis labels
+        label_step = max(1, (max_price - min_price) // 5)
+        for i in range(min_price, max_price + 1, label_step):
+            y = self.height - 50 - ((i - min_price) / (max_price - min_price)) * (self.height - 100)
+            self._pygame.draw.line(background, (50, 50, 50), (50, y), (self.width - 50, y))
+            label = self._glyph(str(i))
+            background.blit(label, (5, y - label.get_height() // 2))
+
+        # Vertical gridlines at the x-axis label positions
+        tick_step = self._x_tick_step()
+        for i in range(0, self._capacity, tick_step):
+            x = 50 + i * (self.width - 100) / max(self._capacity - 1, 1)
+            self._pygame.draw.line(background, (50, 50, 50), (x, 50), (x, self.height - 50))
+
+        # Draw x and y axes
+        self._pygame.draw.line(background, (255, 255, 255), (50, self.height - 50), (self.width - 50, self.height - 50))
+        self._pygame.draw.line(background, (255, 255, 255), (50, 50), (50, self.height - 50))
+
+        self._background = background
+        self._background_key = key
+
+    def _x_tick_step(self):
+        """
+        Returns the number of points between x-axis labels.
+        """
+
+        return max(1, math.ceil(self._capacity / self.NUM_X_LABELS))
+
+    def _draw_x_labels(self):
+        """
+        Draws the x-axis labels (step numbers) of the visible window.
+        """
+
+        tick_step = self._x_tick_step()
+        for i in range(0, self._capacity, tick_step):
+            x = 50 + i * (self.width - 100) / max(self._capacity - 1, 1)
+            self.screen.blit(self._glyph(str(self._offset + i)), (x, self.height - 35))
+
+    def _draw_points(self, prices, actions, start, stop, first_index=0):
+        """
+        Draws the price segments ending at points [start + 1, stop) and the action markers of points [start, stop).
+        Point i is prices[i - first_index].
+        """
+
+        previous = self._to_screen(start, prices[start - first_index])
+        for i in range(start + 1, stop):
+            current = self._to_screen(i, prices[i - first_index])
+            self._pygame.draw.line(self.screen, (255, 255, 255), previous, current)
+            previous = current
+
+        for i in range(start, stop):
+            color = self.colors.get(int(actions[i - first_index]))
+            if color is not None:
+                x, y = self._to_screen(i, prices[i - first_index])
+                self._pygame.draw.circle(self.screen, color, (int(x), int(y)), 5)
+
     def _draw_axes_and_labels(self, prices, num_steps):
         """
         Draws the axes and labels for the stock graph.
@@ -109,8 +369,9 @@ class StockGraph:
             max_price = min_price + 1  # Avoid division by zero
 
         # Draw x and y axes
-        pygame.draw.line(self.screen, (255, 255, 255), (50, self.height - 50), (self.width - 50, self.height - 50))
-        pygame.draw.line(self.screen, (255, 255, 255), (50, 50), (50, self.height - 50))
+        draw = self._pygame.draw
+        draw.line(self.screen, (255, 255, 255), (50, self.height - 50), (self.width - 50, self.height - 50))
+        draw.line(self.screen, (255, 255, 255), (50, 50), (50, self.height - 50))
 
         # Draw y-axis labels (prices)
         label_step = max(1, (max_price - min_price) // 5)  # Adjust the number of steps as needed
@@ -145,9 +406,9 @@ class StockGraph:
         label_step = max(1, (max_price - min_price) // 5)
         for i in range(min_price, max_price + 1, label_step):
             y = self.height - 50 - ((i - min_price) / (max_price - min_price)) * (self.height - 100)
-            pygame.draw.line(self.screen, (50, 50, 50), (50, y), (self.width - 50, y))
+            self._pygame.draw.line(self.screen, (50, 50, 50), (50, y), (self.width - 50, y))
 
         # Draw vertical gridlines
         for i in range(num_steps):
             x = 50 + (i * (self.width - 100) / (num_steps - 1))
-            pygame.draw.line(self.screen, (50, 50, 50), (x, 50), (x, self.height - 50))
+            self._pygame.draw.line(self.screen, (50, 50, 50), (x, 50), (x, self.height - 50))
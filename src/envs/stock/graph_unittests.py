@@ -33,6 +33,41 @@ class TestStockGraph(unittest.TestCase):
         with self.assertRaises(ValueError):
             graph.update_graph(prices, actions)
 
+    def test_incremental_only_redraws_on_range_change(self):
+        graph = StockGraph(800, 600, (0, 0, 0), max_points=50)
+        graph._initialize_window()
+        prices = [100 + 0.01 * i for i in range(30)]
+        actions = [i % 5 for i in range(30)]
+
+        for n in range(1, 31):
+            graph.update_graph_incremental(prices[:n], actions[:n])
+        self.assertEqual(graph.full_redraws, 1)
+
+        # A price outside the current range forces a rescale
+        graph.update_graph_incremental(prices + [200], actions + [2])
+        self.assertEqual(graph.full_redraws, 2)
+
+        # A shorter sequence is a new episode
+        graph.update_graph_incremental(prices[:2], actions[:2])
+        self.assertEqual(graph.full_redraws, 3)
+
+    def test_incremental_sliding_window(self):
+        graph = StockGraph(800, 600, (0, 0, 0), window_size=10)
+        graph._initialize_window()
+        prices = list(range(100, 130))
+        actions = [2] * 30
+
+        for n in range(1, 31):
+            graph.update_graph_incremental(prices[:n], actions[:n])
+        self.assertEqual(graph._offset, 20)
+
+    def test_incremental_mismatched_data(self):
+        graph = StockGraph(800, 600, (0, 0, 0))
+        graph._initialize_window()
+
+        with self.assertRaises(ValueError):
+            graph.update_graph_incremental([10, 20, 30], [0, 1])
+
 
 if __name__ == '__main__':
     unittest.main()
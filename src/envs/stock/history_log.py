@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class HistoryLog:
+    """
+    The HistoryLog class is an append-only binary log of one history stream (prices or actions). Values are
+    collected in a fixed-size chunk and written to disk when it fills up, so appending is O(1) and the memory
+    used does not depend on how much history has been written.
+
+    The file holds the raw values back to back and can be read with np.fromfile or np.memmap.
+    """
+
+    def __init__(self, path, dtype, chunk_size=4096):
+        """
+        Initializes the HistoryLog object, truncating any existing file.
+
+        Args:
+            path (str): Path of the log file.
+            dtype (np.dtype): Data type of the values.
+            chunk_size (int): Number of values buffered in memory before they are written.
+        """
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self._chunk = np.zeros(chunk_size, dtype=self.dtype)
+        self._num_buffered = 0
+        self.num_written = 0
+        self._file = open(path, 'wb')
+
+    def __len__(self):
+        return self.num_written + self._num_buffered
+
+    def append(self, value):
+        """
+        Appends a value to the log.
+
+        Args:
+            value: The value to append.
+        """
+
+        self._chunk[self._num_buffered] = value
+        self._num_buffered += 1
+        if self._num_buffered == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered values to disk.
+        """
+
+        if self._num_buffered:
+            self._chunk[:self._num_buffered].tofile(self._file)
+            self.num_written += self._num_buffered
+            self._num_buffered = 0
+        self._file.flush()
+
+    def truncate(self):
+        """
+        Discards every value in the log.
+        """
+
+        self._num_buffered = 0
+        self.num_written = 0
+        self._file.seek(0)
+        self._file.truncate()
+
+    def read(self):
+        """
+        Reads the whole log.
+
+        Returns:
+            np.ndarray: Every value appended so far, oldest first.
+        """
+
+        self.flush()
+        return np.fromfile(self.path, dtype=self.dtype)
+
+    def close(self):
+        """
+        Writes the buffered values and closes the file.
+        """
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
@@ -0,0 +1,69 @@
+import functools
+import itertools
+import math
+import numpy as np
+
+# Largest window whose observations are tabulated: 8! rows of 8 values, about 1.3 MB as float32
+MAX_TABLE_WINDOW = 8
+
+
+@functools.lru_cache(maxsize=None)
+def permutation_table(size, scale=False, offset_scaling=False, min_offset=0.01):
+    """
+    Builds the 'Basic' state of every ordering of `size` prices, indexed by the Lehmer code of the ordering.
+
+    Row i holds the ranks of the i-th permutation of 1..size in lexicographic order, which is the permutation
+    whose Lehmer code (for every price, the number of later prices below it, read as a factorial-base number)
+    is i. Rows are scaled the same way as RankWindow.get_state. Tables are built once per configuration and
+    shared, so they are read-only.
+
+    Args:
+        size (int): Number of prices in the window, at most MAX_TABLE_WINDOW.
+        scale (bool): Whether to min-max scale the ranks into [0, 1].
+        offset_scaling (bool): Whether to apply offset scaling to the scaled ranks.
+        min_offset (float): Offset used when offset_scaling is enabled.
+
+    Returns:
+        np.ndarray: Read-only array of shape (size!, size), int for ranks or float32 if scaled.
+
+    Raises:
+        ValueError: If size is larger than MAX_TABLE_WINDOW.
+    """
+
+    if size > MAX_TABLE_WINDOW:
+        raise ValueError(f"Window size ({size}) too large to tabulate, the maximum is {MAX_TABLE_WINDOW}")
+
+    ranks = np.array(list(itertools.permutations(range(1, size + 1))), dtype=np.int64)
+    ranks = ranks.reshape(math.factorial(size), size)
+    if scale:
+        table = (ranks - 1).astype(np.float64)
+        if size > 1:
+            table /= (size - 1)
+        if offset_scaling:
+            table += (min_offset * (1 - table))
+        table = table.astype(np.float32)
+    else:
+        table = ranks.astype(int)
+
+    table.setflags(write=False)
+    return table
+
+
+def lehmer_weights(window):
+    """
+    Builds the factorial-base weights that turn a Lehmer code stored in a ring buffer into a table row index.
+
+    Args:
+        window (int): Capacity of the ring buffer.
+
+    Returns:
+        np.ndarray: Array of shape (window + 1, window, window) where [size, head] holds the weight of every slot
+        when `size` prices are stored and the oldest one is in slot `head`; empty slots have weight 0.
+    """
+
+    weights = np.zeros((window + 1, window, window), dtype=np.int64)
+    for size in range(window + 1):
+        for head in range(window):
+            for age in range(size):
+                weights[size, head, (head + age) % window] = math.factorial(size - 1 - age)
+    return weights
@@ -0,0 +1,48 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class BiasedRandomWalkPriceMovement(PathPriceMovement):
+    """
+    Prices that move up or down by a fixed step each step, going up with probability up_probability.
+    """
+
+    def __init__(self, up_probability, step_size, starting_price, num_steps=None, seed=None):
+        """
+        Initializes the BiasedRandomWalkPriceMovement object.
+
+        Args:
+            up_probability (float): Probability of an up step.
+            step_size (float): Absolute price change per step.
+            starting_price (float): Starting price of every path.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        if not 0 <= up_probability <= 1:
+            raise ValueError("up_probability must be between 0 and 1")
+
+        self.price_type = 'BiasedRandomWalk'
+        self.direction = 'Up' if up_probability > 0.5 else 'Down'
+        self.up_probability = up_probability
+        self.step_size = step_size
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes Bernoulli step paths into the given array.
+        """
+        self.rng.random(out=paths)
+        np.less(paths, self.up_probability, out=paths)
+        paths *= 2 * self.step_size
+        paths -= self.step_size
+        paths[:, 0] = starting_price
+        np.cumsum(paths, axis=1, out=paths)
+        return paths
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"BiasedRandomWalk(up_probability={self.up_probability}, step_size={self.step_size}, "
+                f"starting_price={self.starting_price}, num_steps={self.num_steps}, "
+                f"current_step={self.current_step}, current_price={self.current_price})")
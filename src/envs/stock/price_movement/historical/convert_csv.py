@@ -0,0 +1,73 @@
+import argparse
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+def convert_csv(csv_path, output_dir, columns=None, chunk_size=1_000_000, dtype=np.float64):
+    """
+    Converts a CSV of bars or ticks into one .npy file per column, for HistoricalPriceMovement to memory map.
+    The CSV is streamed in chunks, so files larger than memory can be converted.
+
+    Args:
+        csv_path (str): Path of the CSV file, with a header row.
+        output_dir (str): Directory the .npy files are written to, named after the lower-cased columns.
+        columns (list, optional): Columns to convert, defaults to every numeric column.
+        chunk_size (int): Number of rows read at a time.
+        dtype (np.dtype): Data type of the stored values.
+
+    Returns:
+        dict: Mapping of column name to the path of its .npy file.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    dtype = np.dtype(dtype)
+    raw_files = {}
+    num_rows = 0
+
+    try:
+        # Values are appended to raw temporary files first, because the .npy header needs the final row count
+        for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunk_size):
+            if not raw_files:
+                selected = columns if columns is not None else list(chunk.select_dtypes('number').columns)
+                if not selected:
+                    raise ValueError(f"No numeric columns found in {csv_path}")
+                raw_files = {column: tempfile.TemporaryFile(dir=output_dir) for column in selected}
+
+            for column, raw_file in raw_files.items():
+                raw_file.write(chunk[column].to_numpy(dtype=dtype).tobytes())
+            num_rows += len(chunk)
+
+        outputs = {}
+        header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (num_rows,)}
+        for column, raw_file in raw_files.items():
+            outputs[column] = os.path.join(output_dir, f"{str(column).strip().lower()}.npy")
+            with open(outputs[column], 'wb') as npy_file:
+                np.lib.format.write_array_header_1_0(npy_file, header)
+                raw_file.seek(0)
+                shutil.copyfileobj(raw_file, npy_file)
+        return outputs
+    finally:
+        for raw_file in raw_files.values():
+            raw_file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a price CSV into memory-mappable .npy columns")
+    parser.add_argument('csv_path', help="CSV file with a header row")
+    parser.add_argument('output_dir', help="Directory for the .npy files")
+    parser.add_argument('--columns', nargs='+', help="Columns to convert, defaults to every numeric column")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="Rows read at a time")
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float64', help="Stored data type")
+    args = parser.parse_args()
+
+    outputs = convert_csv(args.csv_path, args.output_dir, columns=args.columns, chunk_size=args.chunk_size,
+                          dtype=args.dtype)
+    for column, path in outputs.items():
+        print(f"{column}: {path}")
+
+
+if __name__ == "__main__":
+    main()
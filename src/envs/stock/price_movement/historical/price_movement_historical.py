@@ -0,0 +1,114 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class HistoricalPriceMovement(PathPriceMovement):
+    """
+    Replays real prices from a single-column .npy file, such as one written by convert_csv. The file is opened
+    as a read-only memory map, so only the pages of the sampled windows are read and every process that opens the
+    same file shares them through the page cache instead of holding its own copy.
+
+    Each episode is a window of num_steps + 1 consecutive prices starting at a random row. If the stream runs past
+    the end of the window, it keeps replaying the following rows.
+    """
+
+    def __init__(self, data_path, starting_price=None, normalize_prices=False, num_steps=None, seed=None):
+        """
+        Initializes the HistoricalPriceMovement object.
+
+        Args:
+            data_path (str): Path of a one-dimensional .npy file of prices.
+            starting_price (float, optional): Price every window is rescaled to start at if normalize_prices is set.
+            normalize_prices (bool): Whether to rescale every window so that it starts at starting_price.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+
+        Raises:
+            ValueError: If the file is not one-dimensional or too short for an episode.
+        """
+        if normalize_prices and starting_price is None:
+            raise ValueError("starting_price is required to normalize prices")
+
+        self.price_type = 'Historical'
+        self.data_path = data_path
+        self.normalize_prices = normalize_prices
+        self.prices = self._open(data_path)
+        self._window_starts = np.zeros(1, dtype=np.int64)
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    @staticmethod
+    def _open(data_path):
+        """
+        Memory maps the price file.
+        """
+        prices = np.load(data_path, mmap_mode='r')
+        if prices.ndim != 1:
+            raise ValueError(f"Expected a one-dimensional price file, got shape {prices.shape}")
+        return prices
+
+    def _episode_path(self, out=None):
+        """
+        Draws the window of a new episode and remembers where it starts, for the continuation blocks.
+        """
+        paths = np.empty((1, self._path_length()), dtype=np.float64) if out is None else out
+        self._window_starts = self._sample_starts(1, paths.shape[1])
+        return self._copy_windows(paths, self._window_starts, self.starting_price)[0]
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Copies price windows into the given array. New paths start at random rows, while continuation
+        blocks (start_step > 0) pick up where the current episode window left off. Only _episode_path changes
+        the episode window, so paths drawn through generate_paths leave the current episode alone.
+        """
+        num_paths, num_steps = paths.shape
+        if start_step == 0:
+            starts = self._sample_starts(num_paths, num_steps)
+        else:
+            # Wrap around to the start of the file rather than running off its end
+            starts = (self._window_starts[:1] + start_step) % self._num_starts(num_steps)
+        return self._copy_windows(paths, starts, starting_price)
+
+    def _num_starts(self, num_steps):
+        """
+        Number of rows a window of num_steps prices can start at.
+        """
+        if num_steps > len(self.prices):
+            raise ValueError(f"Price file has {len(self.prices)} rows, fewer than the {num_steps} needed per path")
+        return len(self.prices) - num_steps + 1
+
+    def _sample_starts(self, num_paths, num_steps):
+        """
+        Draws random start rows for num_paths windows of num_steps prices.
+        """
+        return self.rng.integers(0, self._num_starts(num_steps), size=num_paths)
+
+    def _copy_windows(self, paths, starts, starting_price):
+        """
+        Copies the windows beginning at the given rows into paths, rescaling them if normalize_prices is set.
+        """
+        num_steps = paths.shape[1]
+        # Fancy indexing the memory map only reads the rows of the sampled windows
+        paths[:] = self.prices[starts[:, np.newaxis] + np.arange(num_steps)]
+
+        if self.normalize_prices:
+            paths *= np.reshape(starting_price, (-1, 1)) / paths[:, :1]
+            paths[:, 0] = starting_price
+        return paths
+
+    def __getstate__(self):
+        # Pickle the file path instead of the mapped prices, so worker processes map the file themselves
+        state = self.__dict__.copy()
+        del state['prices']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.prices = self._open(self.data_path)
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"Historical(data_path={self.data_path}, num_rows={len(self.prices)}, "
+                f"normalize_prices={self.normalize_prices}, starting_price={self.starting_price}, "
+                f"num_steps={self.num_steps}, current_step={self.current_step}, current_price={self.current_price})")
@@ -1,25 +1,108 @@
 from src.envs.stock.price_movement.price_movement_base import PriceGeneratorABC
-from random import uniform
+import numpy as np
 
 
 class LinearPriceMovement(PriceGeneratorABC):
 
-    def __init__(self, slope, noise, starting_price):
+    BLOCK_SIZE = 256  # Precomputed path length when num_steps is not known
+
+    def __init__(self, slope, noise, starting_price, num_steps=None, precompute=False, seed=None):
+        """
+        Initializes the LinearPriceMovement object.
+
+        Args:
+            slope (float): Price change per step.
+            noise (float): Maximum absolute uniform noise added to each step.
+            starting_price (float): Starting price of every path.
+            num_steps (int, optional): Number of prices generated per episode, used to size precomputed paths.
+            precompute (bool): Whether to draw the whole episode path up front instead of one price per call.
+            seed (int, optional): Seed for the random number generator.
+        """
         self.price_type = 'Linear'
         self.direction = 'Up' if slope > 0 else 'Down'
         self.noise = noise
         self.slope = slope
         self.starting_price = starting_price
         self.current_price = starting_price
+        self.num_steps = num_steps
+        self.precompute = precompute
+        self.rng = np.random.default_rng(seed)
+
+        self.path = None
+        self.current_step = 0
+        if self.precompute:
+            self.path = self.generate_paths(1, self._path_length())[0]
 
     def generate_next_price(self):
         """
         Generates the next price.
         """
-        noise_factor = uniform(-self.noise, self.noise)
+        if self.precompute:
+            self.current_step += 1
+            if self.current_step >= len(self.path):
+                # Ran past the precomputed episode, continue the path with a new block
+                self.path = self.generate_paths(1, self._path_length(), self.path[-1])[0]
+                self.current_step = 1
+            self.current_price = self.path[self.current_step]
+            return self.current_price
+
+        noise_factor = self.rng.uniform(-self.noise, self.noise)
         self.current_price += self.slope + noise_factor
+        self.current_step += 1
         return self.current_price
 
+    def generate_paths(self, num_paths, num_steps, starting_price=None, out=None):
+        """
+        Draws whole price paths at once as the cumulative sum of slope plus uniform noise.
+
+        Args:
+            num_paths (int): Number of independent paths.
+            num_steps (int): Number of prices per path, including the starting price.
+            starting_price (float or np.ndarray, optional): Starting price(s), defaults to starting_price.
+            out (np.ndarray, optional): Float64 buffer of shape (num_paths, num_steps) to write the paths into.
+
+        Returns:
+            np.ndarray: Array of shape (num_paths, num_steps), where column 0 is the starting price.
+        """
+        if starting_price is None:
+            starting_price = self.starting_price
+
+        paths = np.empty((num_paths, num_steps), dtype=np.float64) if out is None else out
+
+        # Written in place so that regenerating a path does not allocate; column 0 is overwritten
+        # by the starting price so the running sum starts from it
+        self.rng.random(out=paths)
+        paths *= 2 * self.noise
+        paths += self.slope - self.noise
+        paths[:, 0] = starting_price
+        np.cumsum(paths, axis=1, out=paths)
+        return paths
+
+    def reset(self, seed=None):
+        """
+        Restarts the price stream from the starting price, re-seeding the generator if a seed is given.
+
+        Args:
+            seed (int, optional): Seed for the random number generator.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        self.current_price = self.starting_price
+        self.current_step = 0
+        if self.precompute:
+            if self.path is not None and len(self.path) == self._path_length() and not self._path_shared:
+                self.generate_paths(1, len(self.path), out=self.path[np.newaxis])
+            else:
+                self.path = self.generate_paths(1, self._path_length())[0]
+                self._path_shared = False
+
+    def _path_length(self):
+        """
+        Length of a precomputed path: the starting price plus one price per step.
+        """
+        return self.num_steps + 1 if self.num_steps is not None else self.BLOCK_SIZE
+
     def __str__(self):
         """
         String representation of the price generator.
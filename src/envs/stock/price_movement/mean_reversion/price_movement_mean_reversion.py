@@ -0,0 +1,74 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class MeanReversionPriceMovement(PathPriceMovement):
+    """
+    Ornstein-Uhlenbeck prices that are pulled back towards a fixed mean, sampled with the exact discretization
+    x[t] = mean + (x[t-1] - mean) * exp(-reversion_rate) + noise.
+    """
+
+    MAX_EXPONENT = 30  # Largest exponent of the decay factor used when unrolling the recursion
+
+    def __init__(self, mean, reversion_rate, volatility, starting_price, num_steps=None, seed=None):
+        """
+        Initializes the MeanReversionPriceMovement object.
+
+        Args:
+            mean (float): Long-run mean the price reverts to.
+            reversion_rate (float): Speed of reversion per step, 0 gives a random walk.
+            volatility (float): Standard deviation of the price per unit of time.
+            starting_price (float): Starting price of every path.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        if reversion_rate < 0:
+            raise ValueError("reversion_rate must be non-negative")
+
+        self.price_type = 'MeanReversion'
+        self.mean = mean
+        self.reversion_rate = reversion_rate
+        self.volatility = volatility
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes Ornstein-Uhlenbeck paths into the given array.
+
+        The AR(1) recursion is unrolled as y[t] = decay^t * (y[0] + cumsum(noise[s] / decay^s)), one block of
+        columns at a time so that decay^-s stays well inside the float64 range.
+        """
+        num_steps = paths.shape[1]
+        if self.reversion_rate == 0:
+            decay, noise_std, block = 1.0, self.volatility, num_steps
+        else:
+            decay = np.exp(-self.reversion_rate)
+            noise_std = self.volatility * np.sqrt((1 - decay ** 2) / (2 * self.reversion_rate))
+            block = max(1, int(self.MAX_EXPONENT / self.reversion_rate))
+
+        # Deviations from the mean, written in place
+        self.rng.standard_normal(out=paths)
+        paths *= noise_std
+        paths[:, 0] = starting_price
+        paths[:, 0] -= self.mean
+
+        for start in range(1, num_steps, block):
+            stop = min(start + block, num_steps)
+            powers = decay ** np.arange(1, stop - start + 1)
+            columns = paths[:, start:stop]
+            columns /= powers
+            np.cumsum(columns, axis=1, out=columns)
+            columns += paths[:, start - 1:start]
+            columns *= powers
+
+        paths += self.mean
+        paths[:, 0] = starting_price  # Exact despite the mean round trip
+        return paths
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"MeanReversion(mean={self.mean}, reversion_rate={self.reversion_rate}, "
+                f"volatility={self.volatility}, starting_price={self.starting_price}, num_steps={self.num_steps}, "
+                f"current_step={self.current_step}, current_price={self.current_price})")
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import numpy as np
 
 
 class PriceGeneratorABC(ABC):
@@ -6,6 +7,32 @@ class PriceGeneratorABC(ABC):
     Abstract base class for price generation.
     """
 
+    _path_shared = False  # Whether a snapshot references the current path, so it must not be rewritten in place
+
+    def snapshot(self):
+        """
+        Captures the position in the price stream and the random state. Arrays such as a precomputed path are
+        shared with the snapshot rather than copied.
+
+        Returns:
+            tuple: The captured state, to pass to restore.
+        """
+
+        self._path_shared = True
+        return self.__dict__.copy(), self.rng.bit_generator.state
+
+    def restore(self, snapshot):
+        """
+        Returns the price stream to a captured state, so it continues with the same prices as after the snapshot.
+
+        Args:
+            snapshot (tuple): State captured by snapshot.
+        """
+
+        state, rng_state = snapshot
+        self.__dict__.update(state)
+        self.rng.bit_generator.state = rng_state
+
     @abstractmethod
     def generate_next_price(self):
         """
@@ -13,9 +40,138 @@ class PriceGeneratorABC(ABC):
         """
         pass
 
+    @abstractmethod
+    def generate_paths(self, num_paths, num_steps, starting_price=None, out=None):
+        """
+        Generates num_paths independent price paths of num_steps prices each in one call.
+        """
+        pass
+
+    @abstractmethod
+    def reset(self, seed=None):
+        """
+        Restarts the price stream, re-seeding the generator if a seed is given.
+        """
+        pass
+
     @abstractmethod
     def __str__(self):
         """
         String representation of the price generator.
         """
         pass
+
+
+class PathPriceMovement(PriceGeneratorABC):
+    """
+    Base class for price processes that are sampled as whole paths. The episode path is drawn in one vectorized
+    call when the generator is created or reset, and generate_next_price only indexes it. If the stream runs past
+    the end of the path, it is continued with another block starting from the last price.
+
+    Subclasses implement `_fill_paths`, which writes num_paths paths into a preallocated array at once.
+    """
+
+    BLOCK_SIZE = 256  # Path length used when num_steps is not known
+
+    def __init__(self, starting_price, num_steps=None, seed=None):
+        """
+        Initializes the PathPriceMovement object.
+
+        Args:
+            starting_price (float): Starting price of every path.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.starting_price = starting_price
+        self.num_steps = num_steps
+        self.rng = np.random.default_rng(seed)
+
+        self.current_step = 0
+        self._block_start = 0  # Episode step of path[0]
+        self.path = self._episode_path()
+        self.current_price = self.path[0]
+
+    def generate_next_price(self):
+        """
+        Returns the next price of the current path.
+        """
+        self.current_step += 1
+        index = self.current_step - self._block_start
+        if index >= len(self.path):
+            # Ran past the episode path, continue it with a new block
+            self._block_start += len(self.path) - 1
+            self.path = self._fill_paths(np.empty((1, len(self.path))), self.path[-1], self._block_start)[0]
+            index = 1
+        self.current_price = self.path[index]
+        return self.current_price
+
+    def generate_paths(self, num_paths, num_steps, starting_price=None, out=None):
+        """
+        Draws whole price paths at once.
+
+        Args:
+            num_paths (int): Number of independent paths.
+            num_steps (int): Number of prices per path, including the starting price.
+            starting_price (float or np.ndarray, optional): Starting price(s), defaults to starting_price.
+            out (np.ndarray, optional): Float64 buffer of shape (num_paths, num_steps) to write the paths into.
+
+        Returns:
+            np.ndarray: Array of shape (num_paths, num_steps), where column 0 is the starting price.
+        """
+        if starting_price is None:
+            starting_price = self.starting_price
+
+        paths = np.empty((num_paths, num_steps), dtype=np.float64) if out is None else out
+        return self._fill_paths(paths, starting_price, 0)
+
+    def reset(self, seed=None):
+        """
+        Restarts the price stream with a new episode path, re-seeding the generator if a seed is given.
+
+        Args:
+            seed (int, optional): Seed for the random number generator.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        self.current_step = 0
+        self._block_start = 0
+        if len(self.path) == self._path_length() and not self._path_shared:
+            self._episode_path(out=self.path[np.newaxis])
+        else:
+            self.path = self._episode_path()
+            self._path_shared = False
+        self.current_price = self.path[0]
+
+    def _episode_path(self, out=None):
+        """
+        Draws the path of a new episode.
+
+        Args:
+            out (np.ndarray, optional): Float64 buffer of shape (1, path length) to write the path into.
+
+        Returns:
+            np.ndarray: The episode path, of shape (path length,).
+        """
+        return self.generate_paths(1, self._path_length(), out=out)[0]
+
+    @abstractmethod
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes price paths into the given array.
+
+        Args:
+            paths (np.ndarray): Float64 array of shape (num_paths, num_steps) to fill.
+            starting_price (float or np.ndarray): Price(s) at column 0.
+            start_step (int): Episode step of column 0, for processes whose drift depends on time.
+
+        Returns:
+            np.ndarray: The filled paths array.
+        """
+        pass
+
+    def _path_length(self):
+        """
+        Length of an episode path: the starting price plus one price per step.
+        """
+        return self.num_steps + 1 if self.num_steps is not None else self.BLOCK_SIZE
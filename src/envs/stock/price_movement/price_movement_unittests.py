@@ -0,0 +1,184 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from src.envs.stock.price_movement.linear.price_movement_linear import LinearPriceMovement
+from src.envs.stock.price_movement.mean_reversion.price_movement_mean_reversion import MeanReversionPriceMovement
+from src.envs.stock.price_movement.quadratic.price_movement_quadratic import QuadraticPriceMovement
+from src.envs.stock.price_movement.biased_random_walk.price_movement_biased_random_walk import \
+    BiasedRandomWalkPriceMovement
+from src.envs.stock.price_movement.regime_switching.price_movement_regime_switching import \
+    RegimeSwitchingPriceMovement
+from src.envs.stock.price_movement.historical.price_movement_historical import HistoricalPriceMovement
+from src.envs.stock.price_movement.historical.convert_csv import convert_csv
+from src.envs.stock.price_movement.registry import make_price_generator, PRICE_MOVEMENTS
+
+
+class TestLinearPriceMovement(unittest.TestCase):
+
+    def test_generate_paths_shape_and_start(self):
+        generator = LinearPriceMovement(slope=1, noise=0.5, starting_price=100, seed=0)
+        paths = generator.generate_paths(4, 10)
+
+        self.assertEqual(paths.shape, (4, 10))
+        np.testing.assert_array_equal(paths[:, 0], 100)
+        steps = np.diff(paths, axis=1)
+        self.assertTrue(np.all((steps >= 0.5) & (steps <= 1.5)))
+
+    def test_precomputed_path_is_indexed(self):
+        generator = LinearPriceMovement(slope=1, noise=0.5, starting_price=100, num_steps=20, precompute=True, seed=0)
+        prices = [generator.generate_next_price() for _ in range(20)]
+        np.testing.assert_array_equal(prices, generator.path[1:])
+
+    def test_precomputed_path_continues_past_num_steps(self):
+        generator = LinearPriceMovement(slope=1, noise=0, starting_price=100, num_steps=5, precompute=True, seed=0)
+        prices = [generator.generate_next_price() for _ in range(12)]
+        np.testing.assert_allclose(prices, np.arange(101, 113))
+
+    def test_seeded_reset_is_reproducible(self):
+        for precompute in (False, True):
+            generator = LinearPriceMovement(slope=1, noise=0.5, starting_price=100, num_steps=10, precompute=precompute)
+            generator.reset(seed=42)
+            first = [generator.generate_next_price() for _ in range(10)]
+            generator.reset(seed=42)
+            second = [generator.generate_next_price() for _ in range(10)]
+            self.assertEqual(first, second)
+
+
+class TestPathPriceMovements(unittest.TestCase):
+
+    def make_all(self, num_steps=50, seed=0):
+        return [make_price_generator(name, slope=1, noise=0.5, starting_price=100, num_steps=num_steps, seed=seed,
+                                     mean=100, reversion_rate=0.1, volatility=0.01, curvature=0.01,
+                                     up_probability=0.6, step_size=0.5)
+                for name in PRICE_MOVEMENTS if name != 'Historical']
+
+    def test_generate_paths_shape_and_start(self):
+        for generator in self.make_all():
+            paths = generator.generate_paths(8, 30, starting_price=np.arange(8) + 50.0)
+            self.assertEqual(paths.shape, (8, 30), str(generator))
+            np.testing.assert_array_equal(paths[:, 0], np.arange(8) + 50.0)
+            self.assertTrue(np.all(np.isfinite(paths)), str(generator))
+
+    def test_next_price_follows_path_and_continues(self):
+        for generator in self.make_all(num_steps=5):
+            if isinstance(generator, LinearPriceMovement):
+                continue
+            path = generator.path.copy()
+            prices = [generator.generate_next_price() for _ in range(12)]
+            np.testing.assert_array_equal(prices[:5], path[1:])
+            self.assertEqual(generator.current_step, 12)
+
+    def test_seeded_reset_is_reproducible(self):
+        for generator in self.make_all():
+            generator.reset(seed=7)
+            first = [generator.generate_next_price() for _ in range(60)]
+            generator.reset(seed=7)
+            second = [generator.generate_next_price() for _ in range(60)]
+            self.assertEqual(first, second, str(generator))
+
+    def test_mean_reversion_matches_recursion(self):
+        generator = MeanReversionPriceMovement(mean=100, reversion_rate=2.0, volatility=1.0, starting_price=130,
+                                               seed=0)
+        # A high reversion rate forces the recursion to be unrolled over several blocks
+        paths = generator.generate_paths(3, 200)
+
+        generator.reset(seed=0)
+        decay = np.exp(-2.0)
+        noise = generator.rng.standard_normal((3, 200)) * np.sqrt((1 - decay ** 2) / 4.0)
+        expected = np.empty((3, 200))
+        expected[:, 0] = 130
+        for t in range(1, 200):
+            expected[:, t] = 100 + (expected[:, t - 1] - 100) * decay + noise[:, t]
+        np.testing.assert_allclose(paths, expected)
+
+    def test_quadratic_without_noise_is_a_parabola(self):
+        generator = QuadraticPriceMovement(curvature=0.5, noise=0, starting_price=10, slope=1, num_steps=4)
+        np.testing.assert_allclose(generator.path, 10 + np.arange(5) + 0.5 * np.arange(5) ** 2)
+        prices = [generator.generate_next_price() for _ in range(8)]
+        np.testing.assert_allclose(prices, 10 + np.arange(1, 9) + 0.5 * np.arange(1, 9) ** 2)
+
+    def test_biased_random_walk_steps(self):
+        generator = BiasedRandomWalkPriceMovement(up_probability=0.7, step_size=2, starting_price=100, seed=0)
+        steps = np.diff(generator.generate_paths(100, 200), axis=1)
+        self.assertTrue(np.all(np.abs(steps) == 2))
+        self.assertAlmostEqual(np.mean(steps > 0), 0.7, delta=0.01)
+
+    def test_regime_switching_without_breaks_is_linear(self):
+        generator = RegimeSwitchingPriceMovement(slope=1, noise=0, starting_price=100, break_probability=0,
+                                                 slope_spread=0, seed=0)
+        np.testing.assert_allclose(generator.generate_paths(2, 10), np.tile(100 + np.arange(10.0), (2, 1)))
+
+    def test_unknown_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            make_price_generator('Sideways', starting_price=100)
+
+
+class TestHistoricalPriceMovement(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.directory.name, 'close.npy')
+        np.save(self.data_path, np.arange(1000, dtype=np.float64) + 1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_windows_are_consecutive_rows(self):
+        generator = HistoricalPriceMovement(self.data_path, num_steps=20, seed=0)
+        self.assertIsInstance(generator.prices, np.memmap)
+        self.assertEqual(generator.current_price, generator.path[0])
+
+        paths = generator.generate_paths(50, 21)
+        np.testing.assert_array_equal(np.diff(paths, axis=1), 1)
+        self.assertTrue(np.all((paths >= 1) & (paths <= 1000)))
+        self.assertGreater(len(np.unique(paths[:, 0])), 1)
+
+    def test_replay_continues_past_num_steps(self):
+        generator = HistoricalPriceMovement(self.data_path, num_steps=5, seed=0)
+        start = generator.current_price
+        prices = [generator.generate_next_price() for _ in range(12)]
+        np.testing.assert_array_equal(prices, start + np.arange(1, 13))
+
+    def test_generate_paths_keeps_the_episode_window(self):
+        generator = HistoricalPriceMovement(self.data_path, num_steps=5, seed=0)
+        start = generator.current_price
+        prices = [generator.generate_next_price() for _ in range(3)]
+        generator.generate_paths(10, 6)
+        prices += [generator.generate_next_price() for _ in range(9)]
+        np.testing.assert_array_equal(prices, start + np.arange(1, 13))
+
+    def test_normalized_windows_start_at_starting_price(self):
+        generator = HistoricalPriceMovement(self.data_path, starting_price=100, normalize_prices=True,
+                                            num_steps=10, seed=0)
+        paths = generator.generate_paths(5, 11)
+        np.testing.assert_array_equal(paths[:, 0], 100)
+        generator.reset(seed=1)
+        self.assertEqual(generator.current_price, 100)
+
+    def test_pickle_maps_the_file_again(self):
+        generator = HistoricalPriceMovement(self.data_path, num_steps=10, seed=0)
+        restored = pickle.loads(pickle.dumps(generator))
+        self.assertIsInstance(restored.prices, np.memmap)
+        np.testing.assert_array_equal(restored.path, generator.path)
+
+    def test_short_file_is_rejected(self):
+        with self.assertRaises(ValueError):
+            HistoricalPriceMovement(self.data_path, num_steps=1000)
+
+    def test_convert_csv_in_chunks(self):
+        csv_path = os.path.join(self.directory.name, 'bars.csv')
+        with open(csv_path, 'w') as csv_file:
+            csv_file.write("Date,Open,Close\n")
+            for i in range(10):
+                csv_file.write(f"2024-01-{i + 1:02d},{i}.5,{i + 1}.25\n")
+
+        outputs = convert_csv(csv_path, os.path.join(self.directory.name, 'npy'), chunk_size=3)
+        self.assertEqual(sorted(outputs), ['Close', 'Open'])
+        np.testing.assert_array_equal(np.load(outputs['Close']), np.arange(10) + 1.25)
+        np.testing.assert_array_equal(np.load(outputs['Open'], mmap_mode='r'), np.arange(10) + 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
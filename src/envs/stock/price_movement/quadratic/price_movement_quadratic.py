@@ -0,0 +1,51 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class QuadraticPriceMovement(PathPriceMovement):
+    """
+    Prices that follow starting_price + slope * t + curvature * t^2 plus uniform noise on every step.
+    A positive curvature gives a parabolic up trend and a negative one a parabolic down trend.
+    """
+
+    def __init__(self, curvature, noise, starting_price, slope=0.0, num_steps=None, seed=None):
+        """
+        Initializes the QuadraticPriceMovement object.
+
+        Args:
+            curvature (float): Coefficient of the squared step.
+            noise (float): Maximum absolute uniform noise added to each step.
+            starting_price (float): Starting price of every path.
+            slope (float): Price change per step at the start of the episode.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.price_type = 'Quadratic'
+        self.direction = 'Up' if curvature > 0 else 'Down'
+        self.curvature = curvature
+        self.noise = noise
+        self.slope = slope
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes quadratic paths into the given array. The drift of the step into episode step t is
+        slope + curvature * (2t - 1), so the running sum reproduces the parabola.
+        """
+        steps = np.arange(start_step, start_step + paths.shape[1])
+
+        self.rng.random(out=paths)
+        paths *= 2 * self.noise
+        paths += self.slope - self.noise
+        paths += self.curvature * (2 * steps - 1)
+        paths[:, 0] = starting_price
+        np.cumsum(paths, axis=1, out=paths)
+        return paths
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"Quadratic(curvature={self.curvature}, slope={self.slope}, noise={self.noise}, "
+                f"starting_price={self.starting_price}, num_steps={self.num_steps}, "
+                f"current_step={self.current_step}, current_price={self.current_price})")
@@ -0,0 +1,45 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class RandomWalkPriceMovement(PathPriceMovement):
+    """
+    Geometric random walk: log prices move by drift plus Gaussian noise each step, so prices stay positive.
+    """
+
+    def __init__(self, volatility, starting_price, drift=0.0, num_steps=None, seed=None):
+        """
+        Initializes the RandomWalkPriceMovement object.
+
+        Args:
+            volatility (float): Standard deviation of the log return per step.
+            starting_price (float): Starting price of every path.
+            drift (float): Mean log return per step.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.price_type = 'RandomWalk'
+        self.volatility = volatility
+        self.drift = drift
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes geometric random walk paths into the given array.
+        """
+        self.rng.standard_normal(out=paths)
+        paths *= self.volatility
+        paths += self.drift
+        paths[:, 0] = np.log(starting_price)
+        np.cumsum(paths, axis=1, out=paths)
+        np.exp(paths, out=paths)
+        paths[:, 0] = starting_price  # Exact despite the log/exp round trip
+        return paths
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"RandomWalk(volatility={self.volatility}, drift={self.drift}, "
+                f"starting_price={self.starting_price}, num_steps={self.num_steps}, "
+                f"current_step={self.current_step}, current_price={self.current_price})")
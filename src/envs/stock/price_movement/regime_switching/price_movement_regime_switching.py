@@ -0,0 +1,67 @@
+from src.envs.stock.price_movement.price_movement_base import PathPriceMovement
+import numpy as np
+
+
+class RegimeSwitchingPriceMovement(PathPriceMovement):
+    """
+    Linear prices with structural breaks. Each step a break happens with probability break_probability;
+    a break draws a new slope uniformly from [slope - slope_spread, slope + slope_spread] and shifts the
+    price level by a Gaussian jump. Every path (and every continuation block) starts in a freshly drawn regime.
+    """
+
+    def __init__(self, slope, noise, starting_price, break_probability=0.02, slope_spread=1.0, jump_size=5.0,
+                 num_steps=None, seed=None):
+        """
+        Initializes the RegimeSwitchingPriceMovement object.
+
+        Args:
+            slope (float): Mean price change per step across regimes.
+            noise (float): Maximum absolute uniform noise added to each step.
+            starting_price (float): Starting price of every path.
+            break_probability (float): Probability of a structural break on each step.
+            slope_spread (float): Half-width of the range regime slopes are drawn from.
+            jump_size (float): Standard deviation of the price jump at a break.
+            num_steps (int, optional): Number of prices generated per episode, used to size the episode path.
+            seed (int, optional): Seed for the random number generator.
+        """
+        self.price_type = 'RegimeSwitching'
+        self.slope = slope
+        self.noise = noise
+        self.break_probability = break_probability
+        self.slope_spread = slope_spread
+        self.jump_size = jump_size
+        super().__init__(starting_price, num_steps=num_steps, seed=seed)
+
+    def _fill_paths(self, paths, starting_price, start_step):
+        """
+        Writes regime switching paths into the given array. The slope of every step is looked up from the
+        slope drawn at the most recent break, found with a running maximum over break positions.
+        """
+        num_paths, num_steps = paths.shape
+        columns = np.arange(num_steps)
+
+        breaks = self.rng.random((num_paths, num_steps)) < self.break_probability
+        breaks[:, 0] = True
+        last_break = np.maximum.accumulate(np.where(breaks, columns, 0), axis=1)
+        slopes = self.rng.uniform(self.slope - self.slope_spread, self.slope + self.slope_spread,
+                                  size=(num_paths, num_steps))
+        slopes = np.take_along_axis(slopes, last_break, axis=1)
+        jumps = self.rng.normal(0, self.jump_size, size=(num_paths, num_steps))
+
+        self.rng.random(out=paths)
+        paths *= 2 * self.noise
+        paths -= self.noise
+        paths += slopes
+        paths += np.where(breaks, jumps, 0.0)
+        paths[:, 0] = starting_price
+        np.cumsum(paths, axis=1, out=paths)
+        return paths
+
+    def __str__(self):
+        """
+        String representation of the price generator.
+        """
+        return (f"RegimeSwitching(slope={self.slope}, noise={self.noise}, "
+                f"break_probability={self.break_probability}, slope_spread={self.slope_spread}, "
+                f"jump_size={self.jump_size}, starting_price={self.starting_price}, num_steps={self.num_steps}, "
+                f"current_step={self.current_step}, current_price={self.current_price})")
@@ -0,0 +1,57 @@
+import inspect
+from src.envs.stock.price_movement.linear.price_movement_linear import LinearPriceMovement
+from src.envs.stock.price_movement.mean_reversion.price_movement_mean_reversion import MeanReversionPriceMovement
+from src.envs.stock.price_movement.random_walk.price_movement_random_walk import RandomWalkPriceMovement
+from src.envs.stock.price_movement.quadratic.price_movement_quadratic import QuadraticPriceMovement
+from src.envs.stock.price_movement.biased_random_walk.price_movement_biased_random_walk import \
+    BiasedRandomWalkPriceMovement
+from src.envs.stock.price_movement.historical.price_movement_historical import HistoricalPriceMovement
+from src.envs.stock.price_movement.regime_switching.price_movement_regime_switching import \
+    RegimeSwitchingPriceMovement
+
+# Maps the price_movement_type environment parameter to its generator class
+PRICE_MOVEMENTS = {
+    'Linear': LinearPriceMovement,
+    'MeanReversion': MeanReversionPriceMovement,
+    'RandomWalk': RandomWalkPriceMovement,
+    'Quadratic': QuadraticPriceMovement,
+    'BiasedRandomWalk': BiasedRandomWalkPriceMovement,
+    'RegimeSwitching': RegimeSwitchingPriceMovement,
+    'Historical': HistoricalPriceMovement,
+}
+
+
+def register_price_movement(price_movement_type, generator_class):
+    """
+    Makes a PriceGeneratorABC subclass available under the given price_movement_type.
+
+    Args:
+        price_movement_type (str): Name used in the environment parameters.
+        generator_class (type): The generator class.
+    """
+
+    PRICE_MOVEMENTS[price_movement_type] = generator_class
+
+
+def make_price_generator(price_movement_type, **params):
+    """
+    Creates the price generator for the given type. Parameters the generator does not accept are ignored,
+    so the full set of environment parameters can be passed through.
+
+    Args:
+        price_movement_type (str): Type of price movement model.
+        **params: Generator parameters, such as slope, noise, starting_price, num_steps and seed.
+
+    Returns:
+        PriceGeneratorABC: The price generator.
+
+    Raises:
+        ValueError: If the price movement type is not registered.
+    """
+
+    if price_movement_type not in PRICE_MOVEMENTS:
+        raise ValueError(f"Price movement type ({price_movement_type}) not supported")
+
+    generator_class = PRICE_MOVEMENTS[price_movement_type]
+    accepted = inspect.signature(generator_class).parameters
+    return generator_class(**{key: value for key, value in params.items() if key in accepted})
@@ -0,0 +1,128 @@
+import functools
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class StageStats:
+    """
+    Timing counters of one profiled stage.
+
+    Attributes:
+        count (int): Number of calls.
+        total_ns (int): Total time spent in the stage.
+        min_ns (int): Fastest call.
+        max_ns (int): Slowest call.
+        histogram (list): Call counts per power-of-two bucket; bucket b holds calls of [2^(b-1), 2^b) ns.
+    """
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+    histogram: list = field(default_factory=lambda: [0] * 64)
+
+    def percentile_ns(self, q):
+        """
+        Estimates a percentile from the histogram, as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): Percentile in [0, 100].
+
+        Returns:
+            int: Upper bound in ns, or 0 if nothing was recorded.
+        """
+
+        target = self.count * q / 100
+        seen = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                return min(1 << bucket, self.max_ns)
+        return 0
+
+    def to_dict(self):
+        """
+        Summarizes the stage as a JSON-serializable dictionary.
+        """
+
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns / self.count if self.count else 0.0,
+            'min_ns': self.min_ns,
+            'max_ns': self.max_ns,
+            'p50_ns': self.percentile_ns(50),
+            'p99_ns': self.percentile_ns(99),
+            'histogram': {f"<{1 << bucket}ns": bucket_count
+                          for bucket, bucket_count in enumerate(self.histogram) if bucket_count},
+        }
+
+
+class StageProfiler:
+    """
+    The StageProfiler class times methods of existing objects by replacing them, on the instance only, with
+    wrappers that record time.perf_counter_ns deltas per stage. Objects that are never wrapped are untouched,
+    so profiling costs nothing unless it is enabled.
+
+    Stage times are inclusive: a stage that calls another profiled method also counts that method's time.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    def wrap(self, obj, stages):
+        """
+        Profiles methods of an object.
+
+        Args:
+            obj (object): The object whose methods are profiled.
+            stages (dict): Mapping of method name to stage name.
+        """
+
+        for method_name, stage in stages.items():
+            self.stages.setdefault(stage, StageStats())
+            setattr(obj, method_name, self._timed(stage, getattr(obj, method_name)))
+
+    def _timed(self, stage, method):
+        """
+        Returns a wrapper of a bound method that records its run time under the given stage.
+        """
+
+        stats = self.stages[stage]
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                if not stats.count or elapsed < stats.min_ns:
+                    stats.min_ns = elapsed
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+                stats.count += 1
+                stats.total_ns += elapsed
+                stats.histogram[min(elapsed.bit_length(), 63)] += 1
+
+        return timed
+
+    def reset(self):
+        """
+        Clears the counters of every stage.
+        """
+
+        for stats in self.stages.values():
+            stats.count = stats.total_ns = stats.min_ns = stats.max_ns = 0
+            stats.histogram[:] = [0] * len(stats.histogram)
+
+    def stats(self):
+        """
+        Summarizes every stage.
+
+        Returns:
+            dict: Mapping of stage name to its summary dictionary.
+        """
+
+        return {stage: stats.to_dict() for stage, stats in self.stages.items()}
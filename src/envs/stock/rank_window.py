@@ -0,0 +1,185 @@
+import numpy as np
+from src.envs.stock.permutation_table import MAX_TABLE_WINDOW, lehmer_weights, permutation_table
+
+
+class RankWindow:
+    """
+    The RankWindow class keeps the last `window` prices in a ring buffer and maintains the rank of each
+    price within the window incrementally, so the 'Basic' state can be produced in O(window) per step
+    without sorting, and without scikit-learn for the min-max scaling.
+
+    Ranks start at 1 for the lowest price. Equal prices are ranked in order of arrival, matching
+    np.argsort(np.argsort(prices)) on the chronological window.
+
+    Small windows can only be in window! orderings, so with `lookup` enabled the Lehmer code of the window is
+    kept alongside the ranks, and get_state returns a row of a prebuilt permutation_table instead of copying
+    and scaling the ranks.
+    """
+
+    def __init__(self, window, scale=False, offset_scaling=False, min_offset=0.01, lookup=None):
+        """
+        Initializes the RankWindow object.
+
+        Args:
+            window (int): Number of previous prices kept in the window.
+            scale (bool): Whether to min-max scale the ranks into [0, 1].
+            offset_scaling (bool): Whether to apply offset scaling to the scaled ranks.
+            min_offset (float): Offset used when offset_scaling is enabled.
+            lookup (bool, optional): Whether to read states from a permutation table. Defaults to doing so
+                when the state is scaled and the window is at most MAX_TABLE_WINDOW, the only case where the
+                table is faster than copying the ranks.
+
+        Raises:
+            ValueError: If lookup is requested for a window larger than MAX_TABLE_WINDOW.
+        """
+
+        if lookup is None:
+            lookup = scale and window <= MAX_TABLE_WINDOW
+        if lookup and window > MAX_TABLE_WINDOW:
+            raise ValueError(f"Window size ({window}) too large to tabulate, the maximum is {MAX_TABLE_WINDOW}")
+
+        self.window = window
+        self.scale = scale
+        self.offset_scaling = offset_scaling
+        self.min_offset = min_offset
+        self.dtype = np.float32 if scale else int
+
+        self._prices = np.full(window, np.inf, dtype=np.float64)
+        self._ranks = np.zeros(window, dtype=np.int64)
+        self._mask = np.zeros(window, dtype=bool)
+        self._scratch = np.zeros(window, dtype=np.float64)
+        self._head = 0  # Index of the oldest price once the window is full
+        self.size = 0
+
+        self.lookup = lookup
+        if lookup:
+            # For every price, the number of later prices below it
+            self._codes = np.zeros(window, dtype=np.int64)
+            self._lehmer_weights = lehmer_weights(window)
+            self._tables = [permutation_table(size, scale, offset_scaling, min_offset) for size in range(window + 1)]
+
+    def reset(self):
+        """
+        Clears the window.
+        """
+
+        self._prices.fill(np.inf)
+        self._ranks.fill(0)
+        self._head = 0
+        self.size = 0
+        if self.lookup:
+            self._codes.fill(0)
+
+    def snapshot(self):
+        """
+        Captures the window, in arrays of `window` elements.
+
+        Returns:
+            tuple: The captured state, to pass to restore.
+        """
+
+        codes = self._codes.copy() if self.lookup else None
+        return self._prices.copy(), self._ranks.copy(), codes, self._head, self.size
+
+    def restore(self, snapshot):
+        """
+        Returns the window to a captured state, copying it into the window's own buffers.
+
+        Args:
+            snapshot (tuple): State captured by snapshot.
+        """
+
+        prices, ranks, codes, self._head, self.size = snapshot
+        np.copyto(self._prices, prices)
+        np.copyto(self._ranks, ranks)
+        if self.lookup:
+            np.copyto(self._codes, codes)
+
+    def push(self, price):
+        """
+        Appends a new price, dropping the oldest price if the window is full, and updates the ranks.
+
+        Args:
+            price (float): The new price.
+        """
+
+        prices, ranks, mask = self._prices, self._ranks, self._mask
+
+        if self.size == self.window:
+            slot = self._head
+            self._head = (slot + 1) % self.window
+
+            # Remove the oldest price; every price ranked above it moves down by one
+            np.greater(ranks, ranks[slot], out=mask)
+            np.subtract(ranks, mask, out=ranks)
+        else:
+            slot = self.size
+            self.size += 1
+
+        # Empty slots hold +inf, so they count as higher prices than every real price
+        prices[slot] = price
+        np.greater(prices, price, out=mask)
+        np.add(ranks, mask, out=ranks)
+        ranks[slot] = self.window - np.count_nonzero(mask)
+
+        if self.lookup:
+            # Dropping the oldest price leaves the other codes unchanged; the new price adds one to the code
+            # of every earlier price above it
+            np.add(self._codes, mask, out=self._codes)
+            self._codes[slot] = 0
+
+    def get_state(self, out=None):
+        """
+        Writes the ranks of the window, oldest price first, optionally scaled.
+
+        Args:
+            out (np.ndarray, optional): Buffer of at least `size` elements to write the state into.
+
+        Returns:
+            np.ndarray: The state, of length `size`. With lookup and no `out`, a read-only row of the
+            permutation table.
+        """
+
+        n = self.size
+        if self.lookup:
+            state = self._tables[n][int(self._codes @ self._lehmer_weights[n, self._head])]
+            if out is None:
+                return state
+            out = out[:n]
+            out[:] = state
+            return out
+
+        if out is None:
+            out = np.empty(n, dtype=self.dtype)
+        else:
+            out = out[:n]
+
+        if not self.scale:
+            self._copy_ranks(out)
+            return out
+
+        scaled_ranks = self._scratch[:n]
+        self._copy_ranks(scaled_ranks)
+
+        # Ranks always span 1..n, so min-max scaling reduces to (rank - 1) / (n - 1)
+        scaled_ranks -= 1
+        if n > 1:
+            scaled_ranks /= (n - 1)
+
+        if self.offset_scaling:
+            scaled_ranks += (self.min_offset * (1 - scaled_ranks))
+
+        out[:] = scaled_ranks
+        return out
+
+    def _copy_ranks(self, out):
+        """
+        Copies the ranks into `out` in chronological order.
+        """
+
+        if self.size < self.window:
+            out[:] = self._ranks[:self.size]
+        else:
+            split = self.window - self._head
+            out[:split] = self._ranks[self._head:]
+            out[split:] = self._ranks[:self._head]
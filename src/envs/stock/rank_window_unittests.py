@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+from src.envs.stock.permutation_table import MAX_TABLE_WINDOW, permutation_table
+from src.envs.stock.rank_window import RankWindow
+
+
+def reference_state(prices, scale, offset_scaling, min_offset=0.01):
+    ranks = np.argsort(np.argsort(prices)) + 1
+    if not scale:
+        return ranks.astype(int)
+
+    span = ranks.max() - ranks.min()
+    scaled_ranks = (ranks - ranks.min()) / (span if span else 1)
+    if offset_scaling:
+        scaled_ranks += (min_offset * (1 - scaled_ranks))
+    return scaled_ranks.astype(np.float32)
+
+
+class TestRankWindow(unittest.TestCase):
+
+    def _compare_with_reference(self, window, scale, offset_scaling, prices, lookup=None):
+        rank_window = RankWindow(window, scale=scale, offset_scaling=offset_scaling, lookup=lookup)
+        history = []
+        for price in prices:
+            rank_window.push(price)
+            history.append(price)
+            expected = reference_state(history[-window:], scale, offset_scaling)
+            state = rank_window.get_state()
+            self.assertEqual(state.dtype, expected.dtype)
+            np.testing.assert_allclose(state, expected, rtol=1e-6)
+
+    def test_ranks_match_argsort(self):
+        prices = np.random.default_rng(0).normal(100, 5, size=200)
+        for window in (1, 2, 5, 10):
+            self._compare_with_reference(window, scale=False, offset_scaling=False, prices=prices)
+
+    def test_scaled_ranks_match_min_max_scaling(self):
+        prices = np.random.default_rng(1).normal(100, 5, size=200)
+        for window in (1, 3, 5):
+            self._compare_with_reference(window, scale=True, offset_scaling=False, prices=prices)
+            self._compare_with_reference(window, scale=True, offset_scaling=True, prices=prices)
+
+    def test_equal_prices_ranked_by_arrival(self):
+        prices = [100, 101, 100, 100, 99, 101, 100]
+        self._compare_with_reference(4, scale=False, offset_scaling=False, prices=prices)
+
+    def test_lookup_matches_argsort(self):
+        prices = np.random.default_rng(2).normal(100, 5, size=200)
+        for window in (1, 2, 5, MAX_TABLE_WINDOW):
+            for scale, offset_scaling in ((False, False), (True, False), (True, True)):
+                self._compare_with_reference(window, scale, offset_scaling, prices, lookup=True)
+
+    def test_lookup_equal_prices_ranked_by_arrival(self):
+        prices = [100, 101, 100, 100, 99, 101, 100]
+        self._compare_with_reference(4, scale=True, offset_scaling=True, prices=prices, lookup=True)
+
+    def test_lookup_defaults(self):
+        self.assertTrue(RankWindow(5, scale=True).lookup)
+        self.assertFalse(RankWindow(5).lookup)
+        self.assertFalse(RankWindow(MAX_TABLE_WINDOW + 1, scale=True).lookup)
+        with self.assertRaises(ValueError):
+            RankWindow(MAX_TABLE_WINDOW + 1, lookup=True)
+
+    def test_lookup_state_is_read_only(self):
+        rank_window = RankWindow(5, scale=True)
+        for price in (1, 3, 2):
+            rank_window.push(price)
+        state = rank_window.get_state()
+        self.assertFalse(state.flags.writeable)
+        np.testing.assert_allclose(state, [0, 1, 0.5])
+
+    def test_permutation_table_rows_follow_lehmer_code(self):
+        table = permutation_table(4)
+        self.assertEqual(table.shape, (24, 4))
+        np.testing.assert_array_equal(table[0], [1, 2, 3, 4])
+        np.testing.assert_array_equal(table[1], [1, 2, 4, 3])
+        np.testing.assert_array_equal(table[-1], [4, 3, 2, 1])
+
+    def test_reset(self):
+        for lookup in (False, True):
+            rank_window = RankWindow(3, lookup=lookup)
+            for price in (3, 2, 1, 0):
+                rank_window.push(price)
+            rank_window.reset()
+            rank_window.push(10)
+            rank_window.push(5)
+            np.testing.assert_array_equal(rank_window.get_state(), [2, 1])
+
+    def test_out_buffer(self):
+        rank_window = RankWindow(5, scale=True)
+        out = np.zeros(5, dtype=np.float32)
+        for price in (1, 3, 2):
+            rank_window.push(price)
+        state = rank_window.get_state(out=out)
+        self.assertTrue(np.shares_memory(state, out))
+        np.testing.assert_allclose(out[:3], [0, 1, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,53 @@
+import os
+from dataclasses import dataclass
 import numpy as np
+from src.envs.stock.history_log import HistoryLog
 from src.envs.stock.unit import Unit
 
 
+@dataclass(slots=True)
+class TraderSnapshot:
+    """
+    State of a Trader captured by Trader.snapshot. History buffers are shared with the trader, not copied.
+
+    Attributes:
+        scalars (tuple): Step counters, current price, PnL and the position aggregates.
+        prices (np.ndarray): Price buffer; shared in full-history mode, a copy of the ring buffer in streaming mode.
+        actions (np.ndarray): Action buffer, shared or copied like prices.
+        unit_prices (np.ndarray): Shared entry prices of the unit stack.
+        unit_steps (np.ndarray): Shared entry steps of the unit stack.
+        marks (tuple): Shared high-water marks of the price, action and unit buffers.
+    """
+    scalars: tuple
+    prices: np.ndarray
+    actions: np.ndarray
+    unit_prices: np.ndarray
+    unit_steps: np.ndarray
+    marks: tuple
+
+
 class Trader:
     """
     The Trader class keeps track of trading actions and the corresponding prices.
     It maintains a list of actions (buy, sell, hold) and a list of prices,
     and tracks PnL and open positions.
+
+    Prices and actions are stored in preallocated NumPy buffers, and open positions are tracked as
+    aggregate unit counts with running sums of entry prices and reciprocal entry prices, so closing
+    every unit at once is O(1). Per-unit detail is kept in a compact stack for `open_positions`.
+
+    In streaming mode (`history_window` set) only the last `history_window` prices and actions are kept, in
+    ring buffers of twice that size where every value is written twice, so that the window is always one
+    contiguous view. Older values can optionally be spilled to append-only logs in `spill_dir`. The unit stack is
+    bounded by `history_window` too: when it fills up, its older half is folded into running sums and those units
+    are closed at their average entry price. Memory therefore stays constant however long the episode is, but once
+    single SELL or BUY actions close folded units, `pnl` and `pnl_pct` can differ from full-history mode, which
+    closes units at their own entry prices. Unrealized PnL, batch closes and the final `pnl` are not affected.
+
+    `snapshot` and `restore` branch the trader in O(1) of the episode length. Full-history buffers are shared
+    copy-on-write: each buffer has a high-water mark, shared with every snapshot of it, of how many leading entries
+    snapshots reference. Writing below the mark copies the buffer first, unless the value is already there, as is
+    the case for the prices of a replayed price stream.
     """
 
     BUY = 0  # Action to buy a single unit (Invalid in certain conditions).
@@ -15,22 +56,251 @@ class Trader:
     BUY_ALL = 3  # Action to buy multiple units (only valid if multiple_units is True).
     SELL_ALL = 4  # Action to sell multiple units (only valid if multiple_units is True).
 
-    def __init__(self, multiple_units=False):
+    DEFAULT_CAPACITY = 128  # Initial buffer size when num_steps is not known
+
+    # Valid actions indexed by [multiple_units, has_long, has_short, action]. Holding both sides at once
+    # cannot happen; that row only allows HOLD.
+    ACTION_MASK_TABLE = np.array([
+        [  # Single unit mode: BUY/SELL open a unit or close the open one, no batch closes
+            [[True, True, True, False, False],     # Flat
+             [True, False, True, False, False]],   # Short
+            [[False, True, True, False, False],    # Long
+             [False, False, True, False, False]],
+        ],
+        [  # Multiple unit mode: BUY/SELL only add to their own side, batch closes end the open side
+            [[True, True, True, False, False],     # Flat
+             [False, True, True, True, False]],    # Short
+            [[True, False, True, False, True],     # Long
+             [False, False, True, False, False]],
+        ],
+    ], dtype=bool)
+    ACTION_MASK_TABLE.flags.writeable = False
+
+    def __init__(self, multiple_units=False, num_steps=None, history_window=None, spill_dir=None):
         """
         Initializes the Trader object.
 
         Args:
             multiple_units (bool): Determines if multiple units can be held a time
+            num_steps (int, optional): Expected number of steps, used to size the price and action buffers.
+            history_window (int, optional): Number of recent prices and actions to keep. Keeps the whole
+                episode if None.
+            spill_dir (str, optional): Directory to write prices and actions that leave the history window to,
+                as 'prices.bin' (float64) and 'actions.bin' (int8).
+
+        Raises:
+            ValueError: If spill_dir is given without history_window.
         """
 
-        self.action_list = []
-        self.price_list = []
+        capacity = num_steps + 1 if num_steps is not None else self.DEFAULT_CAPACITY
+        self.history_window = history_window
+        self._price_log = None
+        self._action_log = None
+
+        if history_window is not None:
+            unit_capacity = history_window
+            self._prices = np.zeros(2 * history_window, dtype=np.float64)
+            self._actions = np.zeros(2 * history_window, dtype=np.int8)
+            if spill_dir is not None:
+                os.makedirs(spill_dir, exist_ok=True)
+                self._price_log = HistoryLog(os.path.join(spill_dir, 'prices.bin'), np.float64)
+                self._action_log = HistoryLog(os.path.join(spill_dir, 'actions.bin'), np.int8)
+        elif spill_dir is not None:
+            raise ValueError("spill_dir requires a history_window")
+        else:
+            unit_capacity = capacity
+            self._prices = np.zeros(capacity, dtype=np.float64)
+            self._actions = np.zeros(capacity, dtype=np.int8)
+        self._num_actions = 0
         self.current_step = -1  # Adding first price will make step 0
+        self.current_price = None
         self.pnl = 0
         self.pnl_pct = 0
-        self.open_positions = {'long': [], 'short': []}
         self.multiple_units = multiple_units
 
+        # Only one side can be open at a time, so the running sums always belong to the open side
+        self.num_long = 0
+        self.num_short = 0
+        self.entry_sum = 0.0
+        self.inv_entry_sum = 0.0
+
+        self._unit_prices = np.zeros(unit_capacity, dtype=np.float64)
+        self._unit_steps = np.zeros(unit_capacity, dtype=np.int64)
+
+        # Oldest open units folded out of the unit stack in streaming mode, as a count and running sums
+        self._num_folded = 0
+        self._folded_entry_sum = 0.0
+        self._folded_inv_entry_sum = 0.0
+
+        # Number of leading buffer entries that snapshots reference, in lists shared with the snapshots
+        self._prices_mark = [0]
+        self._actions_mark = [0]
+        self._units_mark = [0]
+
+    def reset(self):
+        """
+        Clears prices, actions, positions and PnL in place, keeping the allocated buffers.
+        """
+
+        self._num_actions = 0
+        self.current_step = -1
+        self.current_price = None
+        self.pnl = 0
+        self.pnl_pct = 0
+        self.num_long = 0
+        self.num_short = 0
+        self._clear_units()
+        if self._price_log is not None:
+            self._price_log.truncate()
+            self._action_log.truncate()
+
+    @property
+    def price_list(self):
+        """
+        np.ndarray: View of every price seen so far, or of the last history_window prices in streaming mode.
+        """
+
+        return self._history_view(self._prices, self.current_step + 1)
+
+    @property
+    def action_list(self):
+        """
+        np.ndarray: View of every action taken so far, or of the last history_window actions in streaming mode.
+        """
+
+        return self._history_view(self._actions, self._num_actions)
+
+    @property
+    def num_actions(self):
+        """
+        int: Number of actions taken in the episode, including any no longer in the history window.
+        """
+
+        return self._num_actions
+
+    def load_history(self):
+        """
+        Returns the whole price and action history of the episode, reading spilled values back from disk.
+
+        Returns:
+            tuple: Arrays of every price and every action, oldest first.
+
+        Raises:
+            ValueError: If older history was dropped because streaming mode has no spill_dir.
+        """
+
+        prices, actions = np.array(self.price_list), np.array(self.action_list)
+        if self._price_log is not None:
+            prices = np.concatenate([self._price_log.read(), prices])
+            actions = np.concatenate([self._action_log.read(), actions])
+        if len(prices) < self.current_step + 1:
+            raise ValueError("History outside the history window was not kept (no spill_dir)")
+        return prices, actions
+
+    def close(self):
+        """
+        Flushes and closes the spill logs, if any.
+        """
+
+        if self._price_log is not None:
+            self._price_log.close()
+            self._action_log.close()
+
+    def snapshot(self):
+        """
+        Captures the state of the trader without copying the price and action history.
+
+        Returns:
+            TraderSnapshot: The captured state, to pass to restore.
+
+        Raises:
+            ValueError: If history is spilled to disk, which cannot be rewound.
+        """
+
+        if self._price_log is not None:
+            raise ValueError("Snapshots are not supported when history is spilled to disk")
+
+        scalars = (self.current_step, self._num_actions, self.current_price, self.pnl, self.pnl_pct,
+                   self.num_long, self.num_short, self.entry_sum, self.inv_entry_sum, self._num_folded,
+                   self._folded_entry_sum, self._folded_inv_entry_sum)
+        self._units_mark[0] = max(self._units_mark[0], self.num_long + self.num_short - self._num_folded)
+        if self.history_window is not None:
+            # Ring buffers are overwritten in place, but they have a fixed size
+            prices, actions = self._prices.copy(), self._actions.copy()
+        else:
+            prices, actions = self._prices, self._actions
+            self._prices_mark[0] = max(self._prices_mark[0], self.current_step + 1)
+            self._actions_mark[0] = max(self._actions_mark[0], self._num_actions)
+
+        return TraderSnapshot(scalars=scalars, prices=prices, actions=actions, unit_prices=self._unit_prices,
+                              unit_steps=self._unit_steps,
+                              marks=(self._prices_mark, self._actions_mark, self._units_mark))
+
+    def restore(self, snapshot):
+        """
+        Returns the trader to a captured state. A snapshot can be restored any number of times.
+
+        Args:
+            snapshot (TraderSnapshot): State captured by snapshot.
+        """
+
+        (self.current_step, self._num_actions, self.current_price, self.pnl, self.pnl_pct,
+         self.num_long, self.num_short, self.entry_sum, self.inv_entry_sum, self._num_folded,
+         self._folded_entry_sum, self._folded_inv_entry_sum) = snapshot.scalars
+        self._prices_mark, self._actions_mark, self._units_mark = snapshot.marks
+        if self.history_window is not None:
+            np.copyto(self._prices, snapshot.prices)
+            np.copyto(self._actions, snapshot.actions)
+        else:
+            self._prices, self._actions = snapshot.prices, snapshot.actions
+        self._unit_prices, self._unit_steps = snapshot.unit_prices, snapshot.unit_steps
+
+    @property
+    def open_positions(self):
+        """
+        dict: Open units by position type, built on demand from the unit stack. In streaming mode, units folded
+        out of the stack are not listed.
+        """
+
+        num_units = self.num_long + self.num_short - self._num_folded
+        pos_type = 'long' if self.num_long else 'short'
+        units = [Unit(pos_type=pos_type, enter_price=float(price), start_step=int(step))
+                 for price, step in zip(self._unit_prices[:num_units], self._unit_steps[:num_units])]
+
+        return {'long': units if self.num_long else [], 'short': units if self.num_short else []}
+
+    @property
+    def unrealized_pnl(self):
+        """
+        float: PnL of the open units marked at the current price, from the running sums.
+        """
+
+        if self.num_long:
+            return self.num_long * self.current_price - self.entry_sum
+        if self.num_short:
+            return self.entry_sum - self.num_short * self.current_price
+        return 0.0
+
+    @property
+    def unrealized_pnl_pct(self):
+        """
+        float: PnL% of the open units marked at the current price, from the running sums.
+        """
+
+        if self.num_long:
+            return (self.current_price * self.inv_entry_sum - self.num_long) * 100
+        if self.num_short:
+            return (self.entry_sum / self.current_price - self.num_short) * 100
+        return 0.0
+
+    @property
+    def equity_pct(self):
+        """
+        float: Realized plus unrealized PnL%, i.e. the PnL% if every unit were closed at the current price.
+        """
+
+        return self.pnl_pct + self.unrealized_pnl_pct
+
     def step(self, price):
         """
         Updates the trader state for a new time step with the given price.
@@ -39,8 +309,17 @@ class Trader:
             price (float): The current price of the stock.
         """
 
-        self.price_list.append(price)
         self.current_step += 1
+        if self.history_window is not None:
+            self._ring_write(self._prices, self.current_step, price, self._price_log)
+        else:
+            step = self.current_step
+            if step == len(self._prices):
+                self._prices, self._prices_mark = self._grow(self._prices), [0]
+            elif step < self._prices_mark[0] and self._prices[step] != price:
+                self._prices, self._prices_mark = self._prices.copy(), [0]
+            self._prices[step] = price
+        self.current_price = price
 
     def is_valid_action(self, action):
         """
@@ -53,26 +332,24 @@ class Trader:
             bool: True if the action is valid, False otherwise.
         """
 
-        # Check for invalid action under single unit mode
-        invalid_buy = (action == self.BUY and not self.multiple_units and len(self.open_positions['long']) > 0)
-        invalid_sell = (action == self.SELL and not self.multiple_units and len(self.open_positions['short']) > 0)
+        # Accept any integral scalar, such as 0-d arrays returned by policies or 1.0, like the equality checks did
+        if np.ndim(action) != 0:
+            return False
+        try:
+            index = int(action)
+        except (TypeError, ValueError, OverflowError):
+            return False
+        if index != action or not 0 <= index < 5:
+            return False
+        return bool(self.action_mask[index])
 
-        # Only allowing for batch close in multiple unit mode
-        invalid_single_buy = (action == self.BUY and self.multiple_units and len(self.open_positions['short']) > 0)
-        invalid_single_sell = (action == self.SELL and self.multiple_units and len(self.open_positions['long']) > 0)
-
-        invalid_all_buy = (action == self.BUY_ALL and self.multiple_units and (
-                    len(self.open_positions['short']) == 0 or len(self.open_positions['long']) > 0))
-        invalid_all_sell = (action == self.SELL_ALL and self.multiple_units and (
-                    len(self.open_positions['long']) == 0 or len(self.open_positions['short']) > 0))
-
-        # Check if the action is one of the allowed actions
-        is_allowed_action = (action in [self.BUY, self.SELL, self.HOLD]) or \
-                            ((action in [self.SELL_ALL, self.BUY_ALL]) and self.multiple_units)
+    @property
+    def action_mask(self):
+        """
+        np.ndarray: Read-only boolean array of shape (5,), True for every action that is currently valid.
+        """
 
-        # Return True if the action is valid, False otherwise
-        return is_allowed_action and not (
-                    invalid_buy or invalid_sell or invalid_single_sell or invalid_single_buy or invalid_all_buy or invalid_all_sell)
+        return self.ACTION_MASK_TABLE[int(self.multiple_units), int(self.num_long > 0), int(self.num_short > 0)]
 
     def action(self, action):
         """
@@ -83,57 +360,198 @@ class Trader:
             action (int): The trading action to execute.
         """
 
-        current_price = self.price_list[-1]
+        current_price = self.current_price
 
         if action == self.BUY:
-            if self.open_positions['short']:
+            if self.num_short:
                 # Close short position
-                short_entry_price = self.open_positions['short'].pop().enter_price
+                short_entry_price, _ = self._pop_unit()
+                self.num_short -= 1
                 self.pnl += (short_entry_price - current_price)
                 self.pnl_pct += (short_entry_price / current_price - 1) * 100
             else:
                 # Open long position
-                self.open_positions['long'].append(
-                    Unit(pos_type='long', enter_price=current_price, start_step=self.current_step))
+                self._push_unit(current_price)
+                self.num_long += 1
         elif action == self.SELL:
-            if self.open_positions['long']:
+            if self.num_long:
                 # Close long position
-                long_entry_price = self.open_positions['long'].pop().enter_price
+                long_entry_price, long_inv_entry_price = self._pop_unit()
+                self.num_long -= 1
                 self.pnl += (current_price - long_entry_price)
-                self.pnl_pct += (current_price / long_entry_price - 1) * 100
+                if long_inv_entry_price is None:
+                    self.pnl_pct += (current_price / long_entry_price - 1) * 100
+                else:
+                    # Folded units: the average of current_price / entry_price over them
+                    self.pnl_pct += (current_price * long_inv_entry_price - 1) * 100
             else:
                 # Open short position
-                self.open_positions['short'].append(
-                    Unit(pos_type='short', enter_price=current_price, start_step=self.current_step))
+                self._push_unit(current_price)
+                self.num_short += 1
         elif action == self.SELL_ALL:
-            while self.open_positions['long']:
-                long_entry_price = self.open_positions['long'].pop().enter_price
-                self.pnl += (current_price - long_entry_price)
-                self.pnl_pct += (current_price / long_entry_price - 1) * 100
-
+            self._close_long_positions(current_price)
         elif action == self.BUY_ALL:
-            while self.open_positions['short']:
-                short_entry_price = self.open_positions['short'].pop().enter_price
-                self.pnl += (short_entry_price - current_price)
-                self.pnl_pct += (short_entry_price / current_price - 1) * 100
+            self._close_short_positions(current_price)
 
-        self.action_list.append(action)
+        if self.history_window is not None:
+            self._ring_write(self._actions, self._num_actions, action, self._action_log)
+        else:
+            if self._num_actions == len(self._actions):
+                self._actions, self._actions_mark = self._grow(self._actions), [0]
+            elif self._num_actions < self._actions_mark[0] and self._actions[self._num_actions] != action:
+                self._actions, self._actions_mark = self._actions.copy(), [0]
+            self._actions[self._num_actions] = action
+        self._num_actions += 1
 
     def close_all_positions(self):
         """
         Closes all open trading positions, both long and short, and updates PnL and PnL% accordingly.
         """
 
-        current_price = self.price_list[-1]
+        current_price = self.current_price
 
         # Close all long positions
-        while self.open_positions['long']:
-            long_entry_price = self.open_positions['long'].pop().enter_price
-            self.pnl += (current_price - long_entry_price)
-            self.pnl_pct += (current_price / long_entry_price - 1) * 100
+        self._close_long_positions(current_price)
 
         # Close all short positions
-        while self.open_positions['short']:
-            short_entry_price = self.open_positions['short'].pop().enter_price
-            self.pnl += (short_entry_price - current_price)
-            self.pnl_pct += (short_entry_price / current_price - 1) * 100
+        self._close_short_positions(current_price)
+
+    def _close_long_positions(self, current_price):
+        """
+        Closes every open long unit at the given price using the running sums.
+        """
+
+        if self.num_long:
+            self.pnl += (self.num_long * current_price - self.entry_sum)
+            self.pnl_pct += (current_price * self.inv_entry_sum - self.num_long) * 100
+            self.num_long = 0
+            self._clear_units()
+
+    def _close_short_positions(self, current_price):
+        """
+        Closes every open short unit at the given price using the running sums.
+        """
+
+        if self.num_short:
+            self.pnl += (self.entry_sum - self.num_short * current_price)
+            self.pnl_pct += (self.entry_sum / current_price - self.num_short) * 100
+            self.num_short = 0
+            self._clear_units()
+
+    def _push_unit(self, enter_price):
+        """
+        Records a newly opened unit on the unit stack and in the running sums.
+        """
+
+        num_units = self.num_long + self.num_short - self._num_folded
+        if num_units == len(self._unit_prices):
+            if self.history_window is not None:
+                num_units -= self._fold_units()
+            else:
+                self._unit_prices = self._grow(self._unit_prices)
+                self._unit_steps = self._grow(self._unit_steps)
+                self._units_mark = [0]
+        if num_units < self._units_mark[0]:
+            self._unit_prices, self._unit_steps = self._unit_prices.copy(), self._unit_steps.copy()
+            self._units_mark = [0]
+        self._unit_prices[num_units] = enter_price
+        self._unit_steps[num_units] = self.current_step
+
+        self.entry_sum += enter_price
+        self.inv_entry_sum += 1 / enter_price
+
+    def _pop_unit(self):
+        """
+        Removes the most recently opened unit.
+
+        Returns:
+            tuple: The entry price of the unit and None, or, for a unit folded out of the stack, the average entry
+            price and the average reciprocal entry price of the folded units.
+        """
+
+        num_units = self.num_long + self.num_short
+        if num_units > self._num_folded:
+            enter_price = float(self._unit_prices[num_units - self._num_folded - 1])
+            inv_enter_price = 1 / enter_price
+            result = enter_price, None
+        else:
+            enter_price = self._folded_entry_sum / self._num_folded
+            inv_enter_price = self._folded_inv_entry_sum / self._num_folded
+            self._num_folded -= 1
+            self._folded_entry_sum -= enter_price
+            self._folded_inv_entry_sum -= inv_enter_price
+            result = enter_price, inv_enter_price
+
+        if num_units == 1:
+            self._clear_units()
+        else:
+            self.entry_sum -= enter_price
+            self.inv_entry_sum -= inv_enter_price
+        return result
+
+    def _fold_units(self):
+        """
+        Folds the older half of a full unit stack into the folded-unit sums, in streaming mode.
+
+        Returns:
+            int: Number of units folded.
+        """
+
+        num_folded = max(len(self._unit_prices) // 2, 1)
+        folded = self._unit_prices[:num_folded]
+        self._num_folded += num_folded
+        self._folded_entry_sum += float(folded.sum())
+        self._folded_inv_entry_sum += float((1 / folded).sum())
+
+        if self._units_mark[0]:
+            self._unit_prices, self._unit_steps = self._unit_prices.copy(), self._unit_steps.copy()
+            self._units_mark = [0]
+        self._unit_prices[:-num_folded] = self._unit_prices[num_folded:]
+        self._unit_steps[:-num_folded] = self._unit_steps[num_folded:]
+        return num_folded
+
+    def _clear_units(self):
+        """
+        Resets the running sums once no units are open, so rounding errors do not accumulate.
+        """
+
+        self.entry_sum = 0.0
+        self.inv_entry_sum = 0.0
+        self._num_folded = 0
+        self._folded_entry_sum = 0.0
+        self._folded_inv_entry_sum = 0.0
+
+    def _ring_write(self, buffer, index, value, log):
+        """
+        Writes the value at position `index` of a history ring buffer, spilling the value it replaces.
+        Each value is stored at slot and slot + history_window, so any window of history_window consecutive
+        values is a contiguous slice.
+        """
+
+        window = self.history_window
+        slot = index % window
+        if log is not None and index >= window:
+            log.append(buffer[slot])
+        buffer[slot] = value
+        buffer[slot + window] = value
+
+    def _history_view(self, buffer, count):
+        """
+        Returns a view of the last values of a history buffer holding `count` values in total.
+        """
+
+        window = self.history_window
+        if window is None or count <= window:
+            return buffer[:count]
+        start = count % window
+        return buffer[start:start + window]
+
+    @staticmethod
+    def _grow(buffer):
+        """
+        Returns a copy of the buffer with double the capacity.
+        """
+
+        grown = np.zeros(max(2 * len(buffer), 1), dtype=buffer.dtype)
+        grown[:len(buffer)] = buffer
+        return grown
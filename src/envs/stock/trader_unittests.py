@@ -1,4 +1,6 @@
+import tempfile
 import unittest
+import numpy as np
 from src.envs.stock.trader import Trader
 
 class TestTrader(unittest.TestCase):
@@ -9,13 +11,13 @@ class TestTrader(unittest.TestCase):
         self.assertEqual(trader.pnl_pct, 0)
         self.assertEqual(trader.open_positions['long'], [])
         self.assertEqual(trader.open_positions['short'], [])
-        self.assertEqual(trader.price_list, [])
-        self.assertEqual(trader.action_list, [])
+        self.assertEqual(list(trader.price_list), [])
+        self.assertEqual(list(trader.action_list), [])
 
     def test_step_method(self):
         trader = Trader()
         trader.step(100)
-        self.assertEqual(trader.price_list, [100])
+        self.assertEqual(list(trader.price_list), [100])
 
     def test_buy_sell_actions(self):
         trader = Trader()
@@ -149,6 +151,181 @@ class TestTrader(unittest.TestCase):
         expected_pnl = (100 - 80) + (90 - 80)  # Expected PnL after closing all short positions
         self.assertEqual(trader.pnl, expected_pnl)
 
+    def test_open_positions_detail(self):
+        trader = Trader(multiple_units=True, num_steps=2)
+        trader.step(100)
+        trader.action(Trader.BUY)
+        trader.step(110)
+        trader.action(Trader.BUY)
+
+        long_units = trader.open_positions['long']
+        self.assertEqual([unit.enter_price for unit in long_units], [100, 110])
+        self.assertEqual([unit.start_step for unit in long_units], [0, 1])
+        self.assertEqual(trader.open_positions['short'], [])
+
+    def test_buffers_grow_past_num_steps(self):
+        trader = Trader(multiple_units=True, num_steps=2)
+        for price in range(100, 110):
+            trader.step(price)
+            trader.action(Trader.BUY)
+
+        self.assertEqual(list(trader.price_list), list(range(100, 110)))
+        self.assertEqual(len(trader.action_list), 10)
+        self.assertEqual(len(trader.open_positions['long']), 10)
+
+        trader.step(120)
+        trader.close_all_positions()
+        self.assertEqual(trader.pnl, 10 * 120 - sum(range(100, 110)))
+
+    def test_unrealized_pnl_matches_open_units(self):
+        for first_action in (Trader.BUY, Trader.SELL):
+            trader = Trader(multiple_units=True)
+            for price in (100, 104, 98):
+                trader.step(price)
+                trader.action(first_action)
+            trader.step(110)
+
+            units = trader.open_positions['long'] + trader.open_positions['short']
+            sign = 1 if first_action == Trader.BUY else -1
+            self.assertAlmostEqual(trader.unrealized_pnl, sum(sign * (110 - unit.enter_price) for unit in units))
+
+            equity_pct = trader.equity_pct
+            trader.close_all_positions()
+            self.assertAlmostEqual(trader.unrealized_pnl, 0)
+            self.assertAlmostEqual(trader.pnl_pct, equity_pct)
+
+    def test_history_window_keeps_recent_values(self):
+        full = Trader(multiple_units=True)
+        streaming = Trader(multiple_units=True, history_window=7)
+        rng = np.random.default_rng(0)
+        for price in rng.uniform(90, 110, 40):
+            for trader in (full, streaming):
+                trader.step(price)
+                trader.action(Trader.HOLD if price < 100 else Trader.BUY)
+
+            self.assertEqual(list(streaming.price_list), list(full.price_list[-7:]))
+            self.assertEqual(list(streaming.action_list), list(full.action_list[-7:]))
+
+        self.assertEqual(len(streaming._prices), 14)
+        self.assertEqual(streaming.num_actions, 40)
+        self.assertAlmostEqual(streaming.unrealized_pnl, full.unrealized_pnl)
+
+    def test_history_window_bounds_open_units(self):
+        full = Trader(multiple_units=True)
+        streaming = Trader(multiple_units=True, history_window=16)
+        rng = np.random.default_rng(0)
+        for price in rng.uniform(90, 110, 5000):
+            for trader in (full, streaming):
+                trader.step(price)
+                trader.action(Trader.BUY)
+
+        # Buffers keep their size while thousands of units stay open
+        self.assertEqual(len(streaming._unit_prices), 16)
+        self.assertEqual(len(streaming._unit_steps), 16)
+        self.assertEqual(len(streaming._prices), 32)
+        self.assertEqual(streaming.num_long, 5000)
+        np.testing.assert_allclose(streaming.unrealized_pnl, full.unrealized_pnl)
+        np.testing.assert_allclose(streaming.unrealized_pnl_pct, full.unrealized_pnl_pct)
+
+        # Units still on the stack close exactly, folded ones at their average entry price
+        for price in rng.uniform(90, 110, 5000):
+            for trader in (full, streaming):
+                trader.step(price)
+                trader.action(Trader.SELL)
+            if streaming.num_long >= 4992:
+                self.assertEqual(streaming.pnl, full.pnl)
+
+        self.assertEqual(streaming.num_long, 0)
+        np.testing.assert_allclose(streaming.pnl, full.pnl)
+
+    def test_folded_units_close_at_average_entry_price(self):
+        full = Trader(multiple_units=True)
+        streaming = Trader(multiple_units=True, history_window=4)
+        for price in (100, 200, 300, 400, 500):
+            for trader in (full, streaming):
+                trader.step(price)
+                trader.action(Trader.BUY)
+        # The fifth unit folds the 100 and 200 units out of the stack
+        self.assertEqual(streaming._num_folded, 2)
+
+        for price in (250, 250, 250, 250):
+            for trader in (full, streaming):
+                trader.step(price)
+                trader.action(Trader.SELL)
+        # The fourth SELL closes the 200 unit in full-history mode, a unit at the average of 150 when streaming
+        self.assertAlmostEqual(full.pnl, -250 - 150 - 50 + 50)
+        self.assertAlmostEqual(streaming.pnl, -250 - 150 - 50 + 100)
+
+        for trader in (full, streaming):
+            trader.step(300)
+            trader.action(Trader.SELL)
+        self.assertAlmostEqual(streaming.pnl, full.pnl)
+        self.assertAlmostEqual(full.pnl_pct - streaming.pnl_pct, (250 / 200 + 300 / 100 - 550 * 0.0075) * 100)
+
+    def test_spilled_history_is_restored(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            trader = Trader(history_window=5, spill_dir=spill_dir)
+            trader._price_log._chunk = np.zeros(3)  # Force several chunk writes
+            for price in range(100, 130):
+                trader.step(price)
+                trader.action(Trader.HOLD)
+
+            prices, actions = trader.load_history()
+            self.assertEqual(list(prices), list(range(100, 130)))
+            self.assertEqual(len(actions), 30)
+
+            trader.reset()
+            trader.step(50)
+            prices, _ = trader.load_history()
+            self.assertEqual(list(prices), [50])
+            trader.close()
+
+    def test_history_without_spill_cannot_be_loaded(self):
+        trader = Trader(history_window=3)
+        for price in range(10):
+            trader.step(price)
+        with self.assertRaises(ValueError):
+            trader.load_history()
+
+    def test_invalid_action_inputs(self):
+        trader = Trader(multiple_units=True)
+        trader.step(100)
+
+        for action in (-1, 5, 1.5, None, '0', float('nan'), float('inf'), np.array([2])):
+            self.assertFalse(trader.is_valid_action(action), action)
+        for action in (np.int64(Trader.HOLD), np.array(Trader.HOLD), float(Trader.HOLD)):
+            self.assertTrue(trader.is_valid_action(action), action)
+
+    def test_action_mask_table_matches_rules(self):
+        def is_valid(action, multiple_units, has_long, has_short):
+            # The validation rules as originally written out
+            if action == Trader.BUY:
+                return not has_short if multiple_units else not has_long
+            if action == Trader.SELL:
+                return not has_long if multiple_units else not has_short
+            if action == Trader.HOLD:
+                return True
+            if action == Trader.BUY_ALL:
+                return multiple_units and has_short and not has_long
+            return multiple_units and has_long and not has_short
+
+        for multiple_units in (0, 1):
+            for has_long in (0, 1):
+                for has_short in (0, 1):
+                    expected = [is_valid(action, multiple_units, has_long, has_short) for action in range(5)]
+                    self.assertEqual(list(Trader.ACTION_MASK_TABLE[multiple_units, has_long, has_short]), expected)
+
+    def test_action_mask_follows_positions(self):
+        trader = Trader(multiple_units=True)
+        trader.step(100)
+        self.assertEqual(list(trader.action_mask), [True, True, True, False, False])
+        trader.action(Trader.SELL)
+        self.assertEqual(list(trader.action_mask), [False, True, True, True, False])
+        self.assertFalse(trader.is_valid_action(Trader.BUY))
+        self.assertFalse(trader.is_valid_action(7))
+        with self.assertRaises(ValueError):
+            trader.action_mask[0] = True
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     """
     Represents a trading unit(used in turtle terminology) with specific attributes related to a trading operation.
 
     This class is a data structure used to store information about a single trading unit, including its position type,
-    entry price, start date and time, and optionally a list of previous prices.
+    entry price, start date and time, and optionally a list of previous prices. Uses __slots__ to keep instances
+    small when per-unit detail is requested from a Trader.
 
     Attributes:
         pos_type (str): The position type of the trade ('long' or 'short').
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class VectorRankWindow:
+    """
+    The VectorRankWindow class keeps the last `window` prices of many independent price streams
+    and turns them into the 'Basic' rank state of Controller, one row per stream.
+
+    Rows that have seen fewer than `window` prices are left aligned and padded with zeros after
+    the available ranks, so the output always has shape (num_streams, window).
+    """
+
+    def __init__(self, num_streams, window, scale=False, offset_scaling=False, min_offset=0.01):
+        """
+        Initializes the VectorRankWindow object.
+
+        Args:
+            num_streams (int): Number of independent price streams.
+            window (int): Number of previous prices used for each state.
+            scale (bool): Whether to min-max scale the ranks into [0, 1].
+            offset_scaling (bool): Whether to apply offset scaling to the scaled ranks.
+            min_offset (float): Offset used when offset_scaling is enabled.
+        """
+
+        self.num_streams = num_streams
+        self.window = window
+        self.scale = scale
+        self.offset_scaling = offset_scaling
+        self.min_offset = min_offset
+
+        self.prices = np.full((num_streams, window), np.inf, dtype=np.float64)
+        self.lengths = np.zeros(num_streams, dtype=np.int64)
+        self._positions = np.arange(window)
+        self._rank_values = np.arange(1, window + 1)
+        self._ranks = np.zeros((num_streams, window), dtype=np.int64)
+        self._scaled = np.zeros((num_streams, window), dtype=np.float64)
+        self._valid = np.zeros((num_streams, window), dtype=bool)
+
+    def reset(self, mask=None):
+        """
+        Clears the stored prices of the selected streams.
+
+        Args:
+            mask (np.ndarray, optional): Boolean mask of streams to reset. Resets all streams if None.
+        """
+
+        if mask is None:
+            mask = slice(None)
+
+        self.prices[mask] = np.inf
+        self.lengths[mask] = 0
+
+    def push(self, prices, mask=None):
+        """
+        Appends a new price to the selected streams, dropping the oldest price of full windows.
+
+        Args:
+            prices (np.ndarray): Array of shape (num_streams,) with the new prices.
+            mask (np.ndarray, optional): Boolean mask of streams that receive the new price.
+        """
+
+        if mask is None:
+            mask = np.ones(self.num_streams, dtype=bool)
+
+        full = mask & (self.lengths == self.window)
+        if full.any():
+            self.prices[full, :-1] = self.prices[full, 1:]
+            self.prices[full, -1] = prices[full]
+
+        filling = mask & (self.lengths < self.window)
+        if filling.any():
+            rows = np.flatnonzero(filling)
+            self.prices[rows, self.lengths[rows]] = prices[rows]
+            self.lengths[rows] += 1
+
+    def get_mask(self, out=None):
+        """
+        Marks the entries of every row that hold a rank, as opposed to padding.
+
+        Args:
+            out (np.ndarray, optional): Buffer of shape (num_streams, window) to write the mask into.
+
+        Returns:
+            np.ndarray: Array of shape (num_streams, window), 1 for ranks and 0 for padding; int8 unless `out`
+            has another dtype.
+        """
+
+        if out is None:
+            out = np.empty((self.num_streams, self.window), dtype=np.int8)
+        return np.less(self._positions, self.lengths[:, None], out=out)
+
+    def get_state(self, out=None):
+        """
+        Computes the rank state of every stream.
+
+        Args:
+            out (np.ndarray, optional): Buffer of shape (num_streams, window) to write the state into.
+
+        Returns:
+            np.ndarray: Array of shape (num_streams, window); int ranks, or float32 if scale is enabled.
+        """
+
+        if out is None:
+            out = np.empty((self.num_streams, self.window), dtype=np.float32 if self.scale else int)
+
+        # A single stable sort, scattered back into rank order, matches the arrival-order tie breaking of
+        # RankWindow. Padding slots hold +inf, so they rank after every real price and are masked out below.
+        order = np.argsort(self.prices, axis=1, kind='stable')
+        ranks = self._ranks
+        np.put_along_axis(ranks, order, self._rank_values, axis=1)
+        valid = np.less(self._positions, self.lengths[:, None], out=self._valid)
+
+        if self.scale:
+            scaled_ranks = np.subtract(ranks, 1, out=self._scaled)
+            scaled_ranks /= np.maximum(self.lengths - 1, 1)[:, None]
+
+            if self.offset_scaling:
+                # Same as scaled + min_offset * (1 - scaled), without temporaries
+                scaled_ranks *= (1 - self.min_offset)
+                scaled_ranks += self.min_offset
+
+            return np.multiply(scaled_ranks, valid, out=out)
+
+        return np.multiply(ranks, valid, out=out)
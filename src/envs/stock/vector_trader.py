@@ -0,0 +1,197 @@
+import numpy as np
+from src.envs.stock.trader import Trader
+
+
+class VectorTrader:
+    """
+    The VectorTrader class tracks the positions and PnL of many independent traders at once.
+    Each lane follows the same rules as a single Trader, but positions are stored as aggregate
+    counts and running sums of entry prices in NumPy arrays of shape (num_traders,), so that a
+    whole batch of actions is validated and executed with array operations.
+    """
+
+    BUY = Trader.BUY
+    SELL = Trader.SELL
+    HOLD = Trader.HOLD
+    BUY_ALL = Trader.BUY_ALL
+    SELL_ALL = Trader.SELL_ALL
+
+    def __init__(self, num_traders, multiple_units=False):
+        """
+        Initializes the VectorTrader object.
+
+        Args:
+            num_traders (int): Number of independent traders (lanes).
+            multiple_units (bool): Determines if multiple units can be held a time
+        """
+
+        self.num_traders = num_traders
+        self.multiple_units = multiple_units
+        self._lanes = np.arange(num_traders)
+
+        self.current_price = np.zeros(num_traders, dtype=np.float64)
+        self.pnl = np.zeros(num_traders, dtype=np.float64)
+        self.pnl_pct = np.zeros(num_traders, dtype=np.float64)
+
+        # Open positions are only ever on one side, but both sides are kept for clarity
+        self.num_long = np.zeros(num_traders, dtype=np.int64)
+        self.num_short = np.zeros(num_traders, dtype=np.int64)
+        self.long_entry_sum = np.zeros(num_traders, dtype=np.float64)
+        self.long_inv_entry_sum = np.zeros(num_traders, dtype=np.float64)
+        self.short_entry_sum = np.zeros(num_traders, dtype=np.float64)
+        self.short_inv_entry_sum = np.zeros(num_traders, dtype=np.float64)
+
+    def reset(self, mask=None):
+        """
+        Clears positions and PnL for the selected lanes.
+
+        Args:
+            mask (np.ndarray, optional): Boolean mask of lanes to reset. Resets all lanes if None.
+        """
+
+        if mask is None:
+            mask = slice(None)
+
+        for array in (self.current_price, self.pnl, self.pnl_pct, self.num_long, self.num_short,
+                      self.long_entry_sum, self.long_inv_entry_sum, self.short_entry_sum,
+                      self.short_inv_entry_sum):
+            array[mask] = 0
+
+    def step(self, prices):
+        """
+        Updates every lane with its new price.
+
+        Args:
+            prices (np.ndarray): Array of shape (num_traders,) with the current prices.
+        """
+
+        self.current_price[:] = prices
+
+    def equity_pct(self):
+        """
+        Computes the realized plus unrealized PnL% of every lane, as Trader.equity_pct does for one trader.
+
+        Returns:
+            np.ndarray: Array of shape (num_traders,).
+        """
+
+        price = self.current_price
+        short_value = np.divide(self.short_entry_sum, price, out=np.zeros_like(price), where=self.num_short > 0)
+        unrealized = (price * self.long_inv_entry_sum - self.num_long) + (short_value - self.num_short)
+        return self.pnl_pct + unrealized * 100
+
+    def is_valid_action(self, actions):
+        """
+        Determines which of the specified actions are valid, following the rules of Trader.is_valid_action.
+
+        Args:
+            actions (np.ndarray): Array of shape (num_traders,) with one action per lane. Float lanes are only
+                valid if they hold an integral value.
+
+        Returns:
+            np.ndarray: Boolean array of shape (num_traders,), True where the action is valid.
+        """
+
+        actions = np.asarray(actions)
+        if actions.dtype.kind in 'iub':
+            in_range = (actions >= 0) & (actions < 5)
+        elif actions.dtype.kind == 'f':
+            # NaN fails every comparison, so it is invalid as well
+            in_range = (actions >= 0) & (actions < 5) & (np.floor(actions) == actions)
+        else:
+            return np.zeros(actions.shape, dtype=bool)
+        indices = np.where(in_range, actions, 0).astype(np.intp)
+        return self.action_masks()[self._lanes, indices] & in_range
+
+    def action_masks(self):
+        """
+        Looks up the valid actions of every lane in Trader.ACTION_MASK_TABLE.
+
+        Returns:
+            np.ndarray: Boolean array of shape (num_traders, 5), True for every valid action.
+        """
+
+        return Trader.ACTION_MASK_TABLE[int(self.multiple_units), np.minimum(self.num_long, 1),
+                                        np.minimum(self.num_short, 1)]
+
+    def action(self, actions, mask=None):
+        """
+        Executes the given actions at the current prices. Actions are assumed to be valid.
+
+        Args:
+            actions (np.ndarray): Integer array of shape (num_traders,) with one action per lane.
+            mask (np.ndarray, optional): Boolean mask of lanes that should execute their action.
+        """
+
+        has_long = self.num_long > 0
+        has_short = self.num_short > 0
+
+        buy = actions == self.BUY
+        sell = actions == self.SELL
+        if mask is not None:
+            buy &= mask
+            sell &= mask
+
+        # Closing a single unit only happens in single unit mode, where it is the only open unit
+        close_long = (sell & has_long) | (actions == self.SELL_ALL)
+        close_short = (buy & has_short) | (actions == self.BUY_ALL)
+        if mask is not None:
+            close_long &= mask
+            close_short &= mask
+
+        self._close_long(close_long)
+        self._close_short(close_short)
+
+        open_long = buy & ~has_short
+        open_short = sell & ~has_long
+        price = self.current_price
+
+        self.num_long += open_long
+        self.long_entry_sum += np.where(open_long, price, 0.0)
+        self.long_inv_entry_sum += np.where(open_long, 1.0 / price, 0.0)
+
+        self.num_short += open_short
+        self.short_entry_sum += np.where(open_short, price, 0.0)
+        self.short_inv_entry_sum += np.where(open_short, 1.0 / price, 0.0)
+
+    def close_all_positions(self, mask=None):
+        """
+        Closes all open trading positions, both long and short, for the selected lanes.
+
+        Args:
+            mask (np.ndarray, optional): Boolean mask of lanes to close. Closes all lanes if None.
+        """
+
+        if mask is None:
+            mask = np.ones(self.num_traders, dtype=bool)
+
+        self._close_long(mask)
+        self._close_short(mask)
+
+    def _close_long(self, mask):
+        """
+        Closes every long unit in the selected lanes at the current price.
+        """
+
+        mask = mask & (self.num_long > 0)
+        price = self.current_price
+        self.pnl += np.where(mask, self.num_long * price - self.long_entry_sum, 0.0)
+        self.pnl_pct += np.where(mask, (price * self.long_inv_entry_sum - self.num_long) * 100, 0.0)
+
+        self.num_long[mask] = 0
+        self.long_entry_sum[mask] = 0
+        self.long_inv_entry_sum[mask] = 0
+
+    def _close_short(self, mask):
+        """
+        Closes every short unit in the selected lanes at the current price.
+        """
+
+        mask = mask & (self.num_short > 0)
+        price = self.current_price
+        self.pnl += np.where(mask, self.short_entry_sum - self.num_short * price, 0.0)
+        self.pnl_pct += np.where(mask, (self.short_entry_sum / price - self.num_short) * 100, 0.0)
+
+        self.num_short[mask] = 0
+        self.short_entry_sum[mask] = 0
+        self.short_inv_entry_sum[mask] = 0
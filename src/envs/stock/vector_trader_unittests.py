@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from src.envs.stock.trader import Trader
+from src.envs.stock.vector_trader import VectorTrader
+
+
+class TestVectorTrader(unittest.TestCase):
+
+    def _compare_with_trader(self, multiple_units):
+        rng = np.random.default_rng(0)
+        num_traders = 16
+        vector_trader = VectorTrader(num_traders, multiple_units)
+        traders = [Trader(multiple_units) for _ in range(num_traders)]
+
+        for _ in range(200):
+            prices = rng.uniform(50, 150, size=num_traders)
+            vector_trader.step(prices)
+            for trader, price in zip(traders, prices):
+                trader.step(price)
+
+            actions = rng.integers(0, 5, size=num_traders)
+            valid = vector_trader.is_valid_action(actions)
+            expected_valid = [trader.is_valid_action(a) for trader, a in zip(traders, actions)]
+            np.testing.assert_array_equal(valid, expected_valid)
+            np.testing.assert_array_equal(vector_trader.action_masks(), [trader.action_mask for trader in traders])
+            np.testing.assert_allclose(vector_trader.equity_pct(), [trader.equity_pct for trader in traders])
+
+            vector_trader.action(actions, mask=valid)
+            for trader, a, is_valid in zip(traders, actions, valid):
+                if is_valid:
+                    trader.action(a)
+
+        vector_trader.close_all_positions()
+        for trader in traders:
+            trader.close_all_positions()
+
+        np.testing.assert_allclose(vector_trader.pnl, [trader.pnl for trader in traders])
+        np.testing.assert_allclose(vector_trader.pnl_pct, [trader.pnl_pct for trader in traders])
+
+    def test_matches_trader_single_unit(self):
+        self._compare_with_trader(multiple_units=False)
+
+    def test_matches_trader_multiple_units(self):
+        self._compare_with_trader(multiple_units=True)
+
+    def test_invalid_all_actions_in_single_unit_mode(self):
+        vector_trader = VectorTrader(2, multiple_units=False)
+        actions = np.array([Trader.BUY_ALL, Trader.SELL_ALL])
+        np.testing.assert_array_equal(vector_trader.is_valid_action(actions), [False, False])
+
+    def test_float_actions(self):
+        vector_trader = VectorTrader(5, multiple_units=True)
+        vector_trader.step(np.full(5, 100.0))
+        actions = np.array([Trader.BUY, Trader.HOLD, 1.5, np.nan, -1.0])
+
+        trader = Trader(multiple_units=True)
+        trader.step(100.0)
+        np.testing.assert_array_equal(vector_trader.is_valid_action(actions),
+                                      [trader.is_valid_action(action) for action in actions])
+        np.testing.assert_array_equal(vector_trader.is_valid_action(actions), [True, True, False, False, False])
+
+    def test_reset_selected_lanes(self):
+        vector_trader = VectorTrader(2, multiple_units=True)
+        vector_trader.step(np.array([100.0, 100.0]))
+        vector_trader.action(np.array([Trader.BUY, Trader.BUY]))
+        vector_trader.reset(np.array([True, False]))
+
+        np.testing.assert_array_equal(vector_trader.num_long, [0, 1])
+        np.testing.assert_array_equal(vector_trader.long_entry_sum, [0, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()